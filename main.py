@@ -19,8 +19,9 @@ from src.config.logging_config import logger
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.agent.nodes import warmup
 from src.agent.stream import stream_query_response
-from src.config.settings import validate_env_for_app
+from src.config.settings import config, validate_env_for_app
 
 
 def run_streamlit():
@@ -34,6 +35,9 @@ async def run_cli_async():
     validate_env_for_app()
     logger.info("🇫🇮 AI Legal Reasoning System - CLI Mode")
     logger.info("Type your legal questions. Type 'exit' to quit.\n")
+    if config.AGENT_WARMUP:
+        # The CLI keeps one event loop, so the Supabase client opened here is reused.
+        await warmup(connect=True)
 
     while True:
         try:
@@ -51,7 +55,9 @@ async def run_cli_async():
                 continue
             sys.stdout.write("\nAssistant: ")
             async for chunk in stream_query_response(query):
+                # Flush per chunk: stdout is line-buffered, and tokens rarely end a line.
                 sys.stdout.write(chunk)
+                sys.stdout.flush()
             sys.stdout.write("\n")
             sys.stdout.flush()
         except KeyboardInterrupt:
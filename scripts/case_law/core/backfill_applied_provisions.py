@@ -53,9 +53,9 @@ class ProvisionsBackfiller:
             )
             cases = response.data if response.data else []
             self.total_cases = len(cases)
-            logger.info(f"📊 Found {self.total_cases} KKO cases in database")
+            logger.info("📊 Found %s KKO cases in database", self.total_cases)
         except Exception as e:
-            logger.error(f"Failed to fetch KKO cases: {e}")
+            logger.error("Failed to fetch KKO cases: %s", e)
             return
 
         if self.total_cases == 0:
@@ -74,7 +74,11 @@ class ProvisionsBackfiller:
         """Process a batch of cases."""
         batch_num = (batch[0] if batch else {}).get("case_year", "unknown")
         logger.info(
-            f"Processing batch [{len(batch)} cases, year={batch_num}] ({self.updated_cases + self.skipped_cases}/{self.total_cases})"
+            "Processing batch [%s cases, year=%s] (%s/%s)",
+            len(batch),
+            batch_num,
+            self.updated_cases + self.skipped_cases,
+            self.total_cases,
         )
 
         updates = []
@@ -87,12 +91,12 @@ class ProvisionsBackfiller:
             # Skip if already populated (unless empty)
             if existing_provisions and existing_provisions.strip():
                 self.skipped_cases += 1
-                logger.debug(f"⏭  SKIP {case_id} (already populated with {len(existing_provisions)} chars)")
+                logger.debug("⏭  SKIP %s (already populated with %s chars)", case_id, len(existing_provisions))
                 continue
 
             if not full_text or not full_text.strip():
                 self.skipped_cases += 1
-                logger.warning(f"⏭  SKIP {case_id} (empty full_text)")
+                logger.warning("⏭  SKIP %s (empty full_text)", case_id)
                 continue
 
             try:
@@ -100,7 +104,7 @@ class ProvisionsBackfiller:
                 extracted = _extract_applied_provisions_from_text(full_text)
 
                 if extracted:
-                    logger.info(f"✅ {case_id} | Extracted {len(extracted)} chars | {extracted[:100]}...")
+                    logger.info("✅ %s | Extracted %s chars | %s...", case_id, len(extracted), extracted[:100])
                     updates.append(
                         {
                             "id": case.get("id"),
@@ -110,18 +114,18 @@ class ProvisionsBackfiller:
                     )
                     self.updated_cases += 1
                 else:
-                    logger.debug(f"⚠️  {case_id} | No provisions extracted from {len(full_text)} chars of full_text")
+                    logger.debug("⚠️  %s | No provisions extracted from %s chars of full_text", case_id, len(full_text))
                     self.skipped_cases += 1
 
             except Exception as e:
-                logger.error(f"❌ {case_id} | Extraction failed: {e}")
+                logger.error("❌ %s | Extraction failed: %s", case_id, e)
                 self.failed_cases += 1
 
         # Write batch to database (if not dry run)
         if updates and not dry_run:
             await self._write_batch(updates)
         elif updates and dry_run:
-            logger.info(f"[DRY RUN] Would update {len(updates)} cases (not writing to DB)")
+            logger.info("[DRY RUN] Would update %s cases (not writing to DB)", len(updates))
 
     async def _write_batch(self, updates: list[dict]) -> None:
         """Write batch of updates to database."""
@@ -132,24 +136,24 @@ class ProvisionsBackfiller:
                     self.sb.table("case_law").update({"applied_provisions": update.get("applied_provisions")}).eq(
                         "id", update.get("id")
                     ).execute()
-                    logger.debug(f"✅ Stored applied_provisions for {case_id}")
+                    logger.debug("✅ Stored applied_provisions for %s", case_id)
                 except Exception as e:
-                    logger.error(f"Failed to update {case_id} in database: {e}")
+                    logger.error("Failed to update %s in database: %s", case_id, e)
                     self.failed_cases += 1
                     self.updated_cases -= 1
         except Exception as e:
-            logger.error(f"Batch write failed: {e}")
+            logger.error("Batch write failed: %s", e)
 
     def _print_summary(self, dry_run: bool) -> None:
         """Print summary statistics."""
         logger.info("=" * 60)
-        logger.info(f"{'[DRY RUN] ' if dry_run else ''}BACKFILL SUMMARY")
+        logger.info("%sBACKFILL SUMMARY", "[DRY RUN] " if dry_run else "")
         logger.info("=" * 60)
-        logger.info(f"Total cases processed:   {self.total_cases}")
-        logger.info(f"Successfully updated:    {self.updated_cases}")
-        logger.info(f"Skipped (already filled): {self.skipped_cases}")
-        logger.info(f"Failed extractions:      {self.failed_cases}")
-        logger.info(f"Success rate:            {(self.updated_cases / max(1, self.total_cases)) * 100:.1f}%")
+        logger.info("Total cases processed:   %s", self.total_cases)
+        logger.info("Successfully updated:    %s", self.updated_cases)
+        logger.info("Skipped (already filled): %s", self.skipped_cases)
+        logger.info("Failed extractions:      %s", self.failed_cases)
+        logger.info("Success rate:            %.1f%%", (self.updated_cases / max(1, self.total_cases)) * 100)
         logger.info("=" * 60)
 
 
@@ -165,7 +169,7 @@ async def main() -> None:
     await backfiller.backfill_all(batch_size=args.batch_size, dry_run=args.dry_run)
     elapsed = time.time() - start
 
-    logger.info(f"⏱  Completed in {elapsed:.2f} seconds")
+    logger.info("⏱  Completed in %.2f seconds", elapsed)
 
 
 if __name__ == "__main__":
@@ -175,5 +179,5 @@ if __name__ == "__main__":
         logger.info("Interrupted by user")
         sys.exit(1)
     except Exception as e:
-        logger.exception(f"Fatal error: {e}")
+        logger.exception("Fatal error: %s", e)
         sys.exit(1)
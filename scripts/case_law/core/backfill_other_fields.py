@@ -19,7 +19,7 @@ logger = setup_logger(__name__)
 async def backfill_other_fields(court_code: str = "KKO", dry_run: bool = False) -> None:
     """Backfill distinctive_facts, weighted_factors, exceptions for cases."""
     sb = get_supabase_client()
-    logger.info(f"🔄 Backfilling other fields for {court_code} (dry_run={dry_run})")
+    logger.info("🔄 Backfilling other fields for %s (dry_run=%s)", court_code, dry_run)
 
     stats = {
         "total": 0,
@@ -36,7 +36,7 @@ async def backfill_other_fields(court_code: str = "KKO", dry_run: bool = False)
 
     while True:
         page_num += 1
-        logger.info(f"Page {page_num}: Fetching offset {offset}...")
+        logger.info("Page %s: Fetching offset %s...", page_num, offset)
 
         try:
             response = (
@@ -48,14 +48,14 @@ async def backfill_other_fields(court_code: str = "KKO", dry_run: bool = False)
             )
             cases = response.data if response.data else []
         except Exception as e:
-            logger.error(f"Failed to fetch page {page_num}: {e}")
+            logger.error("Failed to fetch page %s: %s", page_num, e)
             break
 
         if not cases:
-            logger.info(f"Page {page_num}: No more cases")
+            logger.info("Page %s: No more cases", page_num)
             break
 
-        logger.info(f"Page {page_num}: Processing {len(cases)} cases")
+        logger.info("Page %s: Processing %s cases", page_num, len(cases))
 
         for case in cases:
             case_id = case.get("case_id", "")
@@ -86,14 +86,19 @@ async def backfill_other_fields(court_code: str = "KKO", dry_run: bool = False)
                 if updates and not dry_run:
                     sb.table("case_law").update(updates).eq("id", case_uuid).execute()
             except Exception as e:
-                logger.error(f"{case_id}: {e}")
+                logger.error("%s: %s", case_id, e)
                 stats["failed"] += 1
 
         offset += page_size
 
     logger.info("=" * 70)
     logger.info(
-        f"Total: {stats['total']} | RULING: {stats['ruling_instruction_updated']} | DF: {stats['distinctive_facts_updated']} | WF: {stats['weighted_factors_updated']} | EX: {stats['exceptions_updated']}"
+        "Total: %s | RULING: %s | DF: %s | WF: %s | EX: %s",
+        stats["total"],
+        stats["ruling_instruction_updated"],
+        stats["distinctive_facts_updated"],
+        stats["weighted_factors_updated"],
+        stats["exceptions_updated"],
     )
     logger.info("=" * 70)
 
@@ -113,5 +118,5 @@ if __name__ == "__main__":
         logger.info("Interrupted")
         sys.exit(1)
     except Exception as e:
-        logger.exception(f"Error: {e}")
+        logger.exception("Error: %s", e)
         sys.exit(1)
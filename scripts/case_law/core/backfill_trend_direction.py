@@ -14,7 +14,7 @@ logger = setup_logger(__name__)
 async def backfill_trend(court_code: str = "KKO", dry_run: bool = False) -> None:
     """Backfill trend_direction for cases."""
     sb = get_supabase_client()
-    logger.info(f"🔄 Backfilling trend_direction for {court_code} (dry_run={dry_run})")
+    logger.info("🔄 Backfilling trend_direction for %s (dry_run=%s)", court_code, dry_run)
 
     stats = {"total": 0, "updated": 0, "failed": 0}
 
@@ -24,7 +24,7 @@ async def backfill_trend(court_code: str = "KKO", dry_run: bool = False) -> None
 
     while True:
         page_num += 1
-        logger.info(f"Page {page_num}: Offset {offset}...")
+        logger.info("Page %s: Offset %s...", page_num, offset)
 
         try:
             response = (
@@ -36,14 +36,14 @@ async def backfill_trend(court_code: str = "KKO", dry_run: bool = False) -> None
             )
             cases = response.data if response.data else []
         except Exception as e:
-            logger.error(f"Fetch error page {page_num}: {e}")
+            logger.error("Fetch error page %s: %s", page_num, e)
             break
 
         if not cases:
-            logger.info(f"Page {page_num}: Done")
+            logger.info("Page %s: Done", page_num)
             break
 
-        logger.info(f"Page {page_num}: Processing {len(cases)} cases")
+        logger.info("Page %s: Processing %s cases", page_num, len(cases))
 
         for case in cases:
             case_id = case.get("case_id", "")
@@ -59,13 +59,13 @@ async def backfill_trend(court_code: str = "KKO", dry_run: bool = False) -> None
                     sb.table("case_law").update({"trend_direction": trend}).eq("id", case_uuid).execute()
                     stats["updated"] += 1
             except Exception as e:
-                logger.error(f"{case_id}: {e}")
+                logger.error("%s: %s", case_id, e)
                 stats["failed"] += 1
 
         offset += page_size
 
     logger.info("=" * 70)
-    logger.info(f"Total: {stats['total']} | Updated: {stats['updated']} | Failed: {stats['failed']}")
+    logger.info("Total: %s | Updated: %s | Failed: %s", stats["total"], stats["updated"], stats["failed"])
     logger.info("=" * 70)
 
 
@@ -84,5 +84,5 @@ if __name__ == "__main__":
         logger.info("Interrupted")
         sys.exit(1)
     except Exception as e:
-        logger.exception(f"Error: {e}")
+        logger.exception("Error: %s", e)
         sys.exit(1)
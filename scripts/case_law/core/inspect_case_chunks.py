@@ -0,0 +1,71 @@
+"""
+Inspect the stored sections of one case, optionally filtered by keywords.
+
+Useful for checking why a case is (or is not) retrieved for a query: shows each
+section's type and which of the given keywords it contains. Keyword filtering
+runs in Postgres (Finnish FTS on the GIN-indexed fts_vector), so only matching
+sections are downloaded.
+
+Usage:
+    python3 scripts/case_law/core/inspect_case_chunks.py KKO:1995:213
+    python3 scripts/case_law/core/inspect_case_chunks.py KKO:1995:213 --keywords petos kavallus vahingonkorvaus
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("LOG_FORMAT", "simple")
+
+from src.config.logging_config import setup_logger
+from src.services.retrieval.search import HybridRetrieval
+
+logger = setup_logger(__name__)
+
+
+async def inspect_case_chunks(case_id: str, keywords: list[str] | None = None) -> int:
+    """Log every (matching) section of *case_id*. Returns the number of sections shown."""
+    retrieval = HybridRetrieval()
+    chunks = await retrieval.fetch_case_chunk_views(case_id, keywords=keywords)
+    if not chunks:
+        logger.info("No sections found for %s%s", case_id, " matching keywords" if keywords else "")
+        return 0
+
+    if not logger.isEnabledFor(logging.INFO):
+        return len(chunks)
+
+    lowered_keywords = [kw.lower() for kw in keywords or []]
+    separator = "=" * 60
+    for i, chunk in enumerate(chunks, 1):
+        # One record per section: the logging lock and handlers run once, not 4x.
+        lines = [separator, f"[{i}] section={chunk.section_type} chars={len(chunk.text)}"]
+        if lowered_keywords:
+            matches = [kw for kw in lowered_keywords if kw in chunk.text_lower]
+            lines.append(f"keywords: {', '.join(matches) if matches else '(stemmed match only)'}")
+        lines.append(chunk.text)
+        logger.info("%s", "\n".join(lines))
+
+    logger.info("%s\n%s: %s section(s)", separator, case_id, len(chunks))
+    return len(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect stored sections of one case (optionally keyword-filtered).")
+    parser.add_argument("case_id", help="Case ID, e.g. KKO:1995:213")
+    parser.add_argument(
+        "--keywords",
+        nargs="+",
+        default=None,
+        help="Only show sections matching any of these words (Finnish stemming, server-side).",
+    )
+    args = parser.parse_args()
+    asyncio.run(inspect_case_chunks(args.case_id, args.keywords))
+
+
+if __name__ == "__main__":
+    main()
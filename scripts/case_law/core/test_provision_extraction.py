@@ -32,7 +32,7 @@ class ProvisionExtractionTester:
             sample_size: Number of random cases to test.
             min_text_length: Minimum full_text length to consider.
         """
-        logger.info(f"🧪 Testing extraction on {sample_size} random KKO cases (min_text_length={min_text_length})")
+        logger.info("🧪 Testing extraction on %s random KKO cases (min_text_length=%s)", sample_size, min_text_length)
 
         try:
             response = (
@@ -48,9 +48,9 @@ class ProvisionExtractionTester:
             import random
 
             cases = random.sample(all_cases, min(sample_size, len(all_cases)))
-            logger.info(f"Fetched {len(cases)} random KKO cases")
+            logger.info("Fetched %s random KKO cases", len(cases))
         except Exception as e:
-            logger.error(f"Failed to fetch cases: {e}")
+            logger.error("Failed to fetch cases: %s", e)
             return
 
         if not cases:
@@ -78,14 +78,21 @@ class ProvisionExtractionTester:
             # Check if already populated
             if existing_provisions and existing_provisions.strip():
                 logger.info(
-                    f"[{i}/{len(cases)}] {case_id} ({year}) | ✅ Already populated: {existing_provisions[:80]}..."
+                    "[%s/%s] %s (%s) | ✅ Already populated: %s...",
+                    i,
+                    len(cases),
+                    case_id,
+                    year,
+                    existing_provisions[:80],
                 )
                 stats["already_populated"] += 1
                 continue
 
             # Check text length
             if not full_text or len(full_text) < min_text_length:
-                logger.warning(f"[{i}/{len(cases)}] {case_id} ({year}) | ⏭  Empty/short text ({len(full_text)} chars)")
+                logger.warning(
+                    "[%s/%s] %s (%s) | ⏭  Empty/short text (%s chars)", i, len(cases), case_id, year, len(full_text)
+                )
                 stats["empty_fulltext"] += 1
                 continue
 
@@ -97,14 +104,25 @@ class ProvisionExtractionTester:
                     stats["extracted"] += 1
                     stats["extraction_lengths"].append(len(extracted))
                     logger.info(
-                        f"[{i}/{len(cases)}] {case_id} ({year}) | ✅ Extracted ({len(extracted)} chars): {extracted[:100]}..."
+                        "[%s/%s] %s (%s) | ✅ Extracted (%s chars): %s...",
+                        i,
+                        len(cases),
+                        case_id,
+                        year,
+                        len(extracted),
+                        extracted[:100],
                     )
                 else:
                     logger.warning(
-                        f"[{i}/{len(cases)}] {case_id} ({year}) | ⚠️  No provisions found in {len(full_text)} chars"
+                        "[%s/%s] %s (%s) | ⚠️  No provisions found in %s chars",
+                        i,
+                        len(cases),
+                        case_id,
+                        year,
+                        len(full_text),
                     )
             except Exception as e:
-                logger.error(f"[{i}/{len(cases)}] {case_id} ({year}) | ❌ Extraction failed: {e}")
+                logger.error("[%s/%s] %s (%s) | ❌ Extraction failed: %s", i, len(cases), case_id, year, e)
                 stats["failed"] += 1
 
         # Print summary
@@ -116,7 +134,7 @@ class ProvisionExtractionTester:
         Args:
             case_id: Case ID to test (e.g., 'KKO:2024:76').
         """
-        logger.info(f"🧪 Testing extraction for case: {case_id}")
+        logger.info("🧪 Testing extraction for case: %s", case_id)
 
         try:
             response = (
@@ -127,11 +145,11 @@ class ProvisionExtractionTester:
             )
             cases = response.data if response.data else []
         except Exception as e:
-            logger.error(f"Failed to fetch case: {e}")
+            logger.error("Failed to fetch case: %s", e)
             return
 
         if not cases:
-            logger.error(f"Case not found: {case_id}")
+            logger.error("Case not found: %s", case_id)
             return
 
         case = cases[0]
@@ -139,9 +157,9 @@ class ProvisionExtractionTester:
         existing_provisions = case.get("applied_provisions", "") or ""
         year = case.get("case_year", "")
 
-        logger.info(f"Case: {case_id} ({year})")
-        logger.info(f"Full text length: {len(full_text)} chars")
-        logger.info(f"Already in DB: {existing_provisions if existing_provisions else '(empty)'}")
+        logger.info("Case: %s (%s)", case_id, year)
+        logger.info("Full text length: %s chars", len(full_text))
+        logger.info("Already in DB: %s", existing_provisions if existing_provisions else "(empty)")
         logger.info("")
 
         if not full_text:
@@ -151,15 +169,15 @@ class ProvisionExtractionTester:
         # Extract
         try:
             extracted = _extract_applied_provisions_from_text(full_text)
-            logger.info(f"Extracted ({len(extracted)} chars):")
-            logger.info(f"  {extracted}")
+            logger.info("Extracted (%s chars):", len(extracted))
+            logger.info("  %s", extracted)
 
             if not extracted:
                 logger.warning("No provisions extracted - checking full_text structure...")
                 self._debug_text_structure(full_text, case_id)
 
         except Exception as e:
-            logger.error(f"Extraction failed: {e}")
+            logger.error("Extraction failed: %s", e)
 
     @staticmethod
     def _debug_text_structure(full_text: str, case_id: str) -> None:
@@ -167,7 +185,7 @@ class ProvisionExtractionTester:
         import re
 
         lines = full_text.split("\n")
-        logger.info(f"First 50 lines of {case_id}:")
+        logger.info("First 50 lines of %s:", case_id)
 
         # Find section headers
         section_patterns = [
@@ -181,27 +199,27 @@ class ProvisionExtractionTester:
             # Highlight section headers
             is_header = any(re.search(p, line, re.IGNORECASE) for p in section_patterns)
             marker = ">>> " if is_header else "    "
-            logger.info(f"{marker}[{i}] {line[:100]}")
+            logger.info("%s[%s] %s", marker, i, line[:100])
 
     def _print_test_summary(self, stats: dict) -> None:
         """Print test summary."""
         logger.info("=" * 70)
         logger.info("EXTRACTION TEST SUMMARY")
         logger.info("=" * 70)
-        logger.info(f"Total cases tested:        {stats['total']}")
-        logger.info(f"Already populated in DB:   {stats['already_populated']}")
-        logger.info(f"Empty/short text:          {stats['empty_fulltext']}")
-        logger.info(f"Successfully extracted:    {stats['extracted']}")
-        logger.info(f"Failed extractions:        {stats['failed']}")
+        logger.info("Total cases tested:        %s", stats["total"])
+        logger.info("Already populated in DB:   %s", stats["already_populated"])
+        logger.info("Empty/short text:          %s", stats["empty_fulltext"])
+        logger.info("Successfully extracted:    %s", stats["extracted"])
+        logger.info("Failed extractions:        %s", stats["failed"])
 
         if stats["extraction_lengths"]:
             avg_len = sum(stats["extraction_lengths"]) / len(stats["extraction_lengths"])
-            logger.info(f"Avg extraction length:     {avg_len:.0f} chars")
-            logger.info(f"Min extraction length:     {min(stats['extraction_lengths'])} chars")
-            logger.info(f"Max extraction length:     {max(stats['extraction_lengths'])} chars")
+            logger.info("Avg extraction length:     %.0f chars", avg_len)
+            logger.info("Min extraction length:     %s chars", min(stats["extraction_lengths"]))
+            logger.info("Max extraction length:     %s chars", max(stats["extraction_lengths"]))
 
         extraction_rate = (stats["extracted"] / max(1, stats["total"])) * 100 if stats["total"] > 0 else 0
-        logger.info(f"Extraction success rate:   {extraction_rate:.1f}%")
+        logger.info("Extraction success rate:   %.1f%%", extraction_rate)
         logger.info("=" * 70)
 
         if extraction_rate < 50:
@@ -247,5 +265,5 @@ if __name__ == "__main__":
         logger.info("Interrupted by user")
         sys.exit(1)
     except Exception as e:
-        logger.exception(f"Fatal error: {e}")
+        logger.exception("Fatal error: %s", e)
         sys.exit(1)
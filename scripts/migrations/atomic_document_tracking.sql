@@ -0,0 +1,46 @@
+-- =============================================================================
+-- Migration: Single-call per-document ingestion bookkeeping
+--
+-- Problem: After storing a Finlex document's chunks, FinlexIngestionService made
+-- three sequential PostgREST round trips: SELECT the ingestion_tracking row,
+-- then UPDATE (documents_processed + 1) or INSERT it, then DELETE the document's
+-- failed_documents row. The read-modify-write also lost increments when bulk
+-- workers finished documents of the same category/type/year concurrently.
+--
+-- Fix: finish_document_ingestion() does all of it in one statement-level
+-- transaction: an INSERT ... ON CONFLICT on ingestion_tracking_unique that
+-- increments atomically, plus the failed_documents cleanup.
+--
+-- Run ONCE against your Supabase project:
+--   psql $DATABASE_URL -f scripts/migrations/atomic_document_tracking.sql
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION finish_document_ingestion(
+  p_document_uri      text,
+  p_document_category text,
+  p_document_type     text,
+  p_year              int
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO ingestion_tracking (
+    document_category, document_type, year,
+    status, started_at, last_updated,
+    documents_processed, documents_failed, last_processed_page
+  )
+  VALUES (
+    p_document_category, p_document_type, p_year,
+    'in_progress', now(), now(),
+    1, 0, 1
+  )
+  ON CONFLICT ON CONSTRAINT ingestion_tracking_unique DO UPDATE
+  SET
+    documents_processed = COALESCE(ingestion_tracking.documents_processed, 0) + 1,
+    status              = 'completed',
+    last_updated        = now();
+
+  DELETE FROM failed_documents WHERE document_uri = p_document_uri;
+END;
+$$;
@@ -0,0 +1,111 @@
+"""
+Offline batch execution of the agent graph (evaluation / regression suites).
+
+Intent classification for every query is submitted as one OpenAI Batch API
+job (half the per-token price, no rate-limit pressure) instead of one chat
+completion per query. The labels are written into the intent cache, so the
+normal graph then runs without its intent LLM round trip. Retrieval and
+answer generation still run per query: generation needs each query's search
+results, which only exist once the graph is running. The interactive path
+(stream.py) is unchanged.
+
+Usage:
+    states = [new_agent_state(query=q, original_query=q, response_lang="fi") for q in queries]
+    results = asyncio.run(run_graph_batch(states))
+"""
+
+import asyncio
+import io
+
+import orjson
+from openai import AsyncOpenAI
+
+from src.config.logging_config import setup_logger
+from src.config.settings import config
+
+from .graph import agent_graph
+from .nodes import _INTENT_SYSTEM_PROMPT, _intent_cache, _intent_cache_key, _parse_intent_from_llm
+from .state import AgentState
+
+logger = setup_logger(__name__)
+
+_TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def _intent_batch_line(custom_id: str, query: str) -> dict:
+    """One /v1/chat/completions request in Batch API JSONL form."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": config.OPENAI_SUPPORT_MODEL,
+            "temperature": 0,
+            "messages": [
+                {"role": "system", "content": _INTENT_SYSTEM_PROMPT},
+                {"role": "user", "content": query},
+            ],
+        },
+    }
+
+
+def _parse_batch_output(text: str) -> dict[str, str]:
+    """Map custom_id -> parsed intent from a Batch API output file. Failed requests are omitted."""
+    intents: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        if choices:
+            intents[record["custom_id"]] = _parse_intent_from_llm(choices[0]["message"].get("content") or "")
+    return intents
+
+
+async def classify_intents_batch(queries: list[str], poll_seconds: float = 30.0) -> dict[str, str]:
+    """Classify *queries* in one Batch API job. Returns query -> intent for every request that succeeded."""
+    unique = list(dict.fromkeys(queries))
+    if not unique:
+        return {}
+    payload = b"\n".join(orjson.dumps(_intent_batch_line(str(i), q)) for i, q in enumerate(unique))
+
+    client = AsyncOpenAI()
+    batch_file = await client.files.create(file=("intents.jsonl", io.BytesIO(payload)), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info("Submitted intent batch %s (%s queries)", batch.id, len(unique))
+    while batch.status not in _TERMINAL_BATCH_STATUSES:
+        await asyncio.sleep(poll_seconds)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning("Intent batch %s ended with status %s", batch.id, batch.status)
+        return {}
+
+    output = await client.files.content(batch.output_file_id)
+    by_id = _parse_batch_output(output.text)
+    logger.info("Intent batch %s: %s/%s classified", batch.id, len(by_id), len(unique))
+    return {unique[int(custom_id)]: intent for custom_id, intent in by_id.items()}
+
+
+async def run_graph_batch(states: list[AgentState], concurrency: int = 4) -> list[AgentState]:
+    """Run the graph for every state, with intents pre-classified through the Batch API.
+
+    Queries whose batch request failed fall back to the normal per-query intent call.
+    """
+    intents = await classify_intents_batch([state["query"] for state in states])
+    for query, intent in intents.items():
+        _intent_cache.set(_intent_cache_key(query), intent)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(state: AgentState) -> AgentState:
+        async with semaphore:
+            return await agent_graph.ainvoke(state)
+
+    return await asyncio.gather(*(run_one(state) for state in states))
@@ -7,9 +7,11 @@ from typing import Literal
 
 from langgraph.graph import END, StateGraph
 
+from src.config.logging_config import setup_logger
 from src.config.settings import config
 
 from .nodes import (
+    _is_literal_lookup,
     analyze_intent,
     ask_clarification,
     ask_year_clarification,
@@ -22,17 +24,26 @@ from .nodes import (
 )
 from .state import AgentState
 
+logger = setup_logger(__name__)
+
+
+# Fixed at import time: intent label -> graph node
+_INTENT_MAP: dict[str, str] = {
+    "legal_search": "search",
+    "general_chat": "chat",
+    "clarification": "clarify",
+    "year_clarification": "clarify_year",
+}
+# Search attempts (original + reformulations) before answering with what we have
+_MAX_ATTEMPTS = 2
+
 
 def route_intent(state: AgentState) -> Literal["search", "chat", "clarify", "clarify_year"]:
     """Route based on analysis intent"""
     intent = state.get("intent", "search")
-    intent_map = {
-        "legal_search": "search",
-        "general_chat": "chat",
-        "clarification": "clarify",
-        "year_clarification": "clarify_year",
-    }
-    return intent_map.get(intent, "search")
+    route = _INTENT_MAP.get(intent, "search")
+    logger.debug("Routing intent %s → %s", intent, route)
+    return route
 
 
 def route_search_result(state: AgentState) -> Literal["reason", "reformulate"]:
@@ -50,7 +61,11 @@ def route_search_result(state: AgentState) -> Literal["reason", "reformulate"]:
     if not config.REFORMULATE_ENABLED:
         return "reason"
 
-    if attempts >= 2:
+    if attempts >= _MAX_ATTEMPTS:
+        return "reason"
+
+    if _is_literal_lookup(state.get("original_query") or state.get("query") or ""):
+        logger.info("No results for a literal lookup; skipping reformulation")
         return "reason"
 
     return "reformulate"
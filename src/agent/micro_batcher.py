@@ -0,0 +1,112 @@
+"""
+Coalesce concurrent short support-LLM calls into one request.
+
+When several graph runs share an event loop (CLI evaluations, API workers),
+each needs a short answer from the same model for the same prompt (intent
+label, reformulated query). Queries arriving within a short window are sent
+as one numbered prompt; a batch of one uses the normal single-query call.
+Streamlit runs each question on its own loop, so there a batch is always a
+single query and the window is pure latency: batching is off unless
+INTENT_BATCH_WINDOW_MS / REFORMULATE_BATCH_WINDOW_MS > 0.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from src.config.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class MicroBatcher:
+    """Batch ``submit(query)`` calls made on the same event loop.
+
+    Args:
+        call_one: Answers a single query.
+        call_many: Answers several queries in one call; must return one result per query.
+        max_batch: Largest number of queries sent in one call.
+        wait_seconds: How long the first query waits for others to join its batch.
+    """
+
+    def __init__(
+        self,
+        call_one: Callable[[str], Awaitable[str]],
+        call_many: Callable[[list[str]], Awaitable[list[str]]],
+        max_batch: int = 16,
+        wait_seconds: float = 0.015,
+    ) -> None:
+        self._call_one = call_one
+        self._call_many = call_many
+        self.max_batch = max_batch
+        self.wait_seconds = wait_seconds
+        # One queue per running loop; removed by its flusher once drained, so loops
+        # that finish (one per Streamlit question) leave nothing behind.
+        self._queues: dict[asyncio.AbstractEventLoop, asyncio.Queue[tuple[str, asyncio.Future[str]]]] = {}
+        self._flushers: set[asyncio.Task] = set()  # loops hold tasks weakly
+
+    async def submit(self, query: str) -> str:
+        """Return the result for *query*, possibly computed together with concurrent queries."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = asyncio.Queue()
+            # Enqueue before starting the flusher: under an eager task factory it runs
+            # immediately and would retire on an empty queue.
+            queue.put_nowait((query, future))
+            flusher = loop.create_task(self._flush(loop, queue))
+            self._flushers.add(flusher)
+            flusher.add_done_callback(self._flushers.discard)
+        else:
+            queue.put_nowait((query, future))
+        return await future
+
+    async def _flush(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        """Send queued queries in batches until the queue is empty, then retire."""
+        try:
+            while not queue.empty():
+                batch = [queue.get_nowait()]
+                deadline = loop.time() + self.wait_seconds
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._dispatch(batch)
+        finally:
+            del self._queues[loop]
+            # Only non-empty if the flusher was cancelled (loop shutting down).
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                future.cancel()
+
+    async def _dispatch(self, batch: list[tuple[str, asyncio.Future[str]]]) -> None:
+        if len(batch) == 1:
+            await self._resolve_single(*batch[0])
+            return
+        queries = [query for query, _ in batch]
+        try:
+            results = await self._call_many(queries)
+            if len(results) != len(batch):
+                raise ValueError(f"expected {len(batch)} results, got {len(results)}")
+        except Exception as e:
+            logger.warning("Batched call failed (%s), sending %s queries singly", e, len(batch))
+            await asyncio.gather(*(self._resolve_single(query, future) for query, future in batch))
+            return
+        logger.info("Answered %s queries in one call", len(batch))
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def _resolve_single(self, query: str, future: asyncio.Future[str]) -> None:
+        try:
+            result = await self._call_one(query)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
@@ -3,8 +3,14 @@ LangGraph Node Functions (Abstraction Layer)
 Each node represents a processing stage in the workflow
 """
 
+import asyncio
+import logging
+import re
 import time
+from functools import lru_cache
+from hashlib import blake2b
 
+import orjson
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
@@ -13,22 +19,55 @@ from src.config.settings import config
 from src.config.translations import t
 from src.services.retrieval import HybridRetrieval
 from src.services.retrieval.generator import LLMGenerator
-from src.services.retrieval.relevancy import check_relevancy
-from src.utils.legal_keywords import LEGAL_TOPIC_KEYWORDS
+from src.services.retrieval.relevancy import check_relevancy, check_relevancy_with_reranker
+from src.utils.concurrency import CrossLoopSemaphore, hedged
+from src.utils.http_clients import openai_async_http_client
+from src.utils.legal_keywords import LEGAL_TOPIC_KEYWORDS, compile_legal_topic_re
+from src.utils.legal_morphology import expand_legal_terms
 from src.utils.query_context import get_recent_context_for_llm
 from src.utils.retry import retry_async
+from src.utils.ttl_cache import TTLCache, normalize_query_key
 from src.utils.year_filter import extract_year_range
 from src.utils.year_llm import interpret_year_scope_from_query_async
 
+from .micro_batcher import MicroBatcher
 from .state import AgentState
 
 logger = setup_logger(__name__)
 
 # Reusable singletons to prevent excessive background task creation,
 # avoid re-creating clients/connections on every search, and reduce latency.
-_llm_mini = ChatOpenAI(model=config.OPENAI_SUPPORT_MODEL, temperature=0, request_timeout=config.LLM_REQUEST_TIMEOUT)
+_llm_mini = ChatOpenAI(
+    model=config.OPENAI_SUPPORT_MODEL,
+    temperature=0,
+    request_timeout=config.LLM_REQUEST_TIMEOUT,
+    http_async_client=openai_async_http_client(),
+)
 _generator = LLMGenerator()  # model from config.OPENAI_CHAT_MODEL (e.g. gpt-4o for deeper legal analysis)
+# Process-wide cap on in-flight answer generations (all Streamlit sessions share it).
+_generation_slots = CrossLoopSemaphore(config.MAX_CONCURRENT_LLM_CALLS)
+# Relevancy scoring runs after the answer has streamed; cap it so a burst cannot flood the rate limit.
+_relevancy_slots = CrossLoopSemaphore(config.MAX_CONCURRENT_RELEVANCY_CHECKS)
 _retrieval = HybridRetrieval()  # singleton: reuses Supabase client, embedder, reranker across searches
+_search_cache = TTLCache(maxsize=config.RETRIEVAL_CACHE_SIZE, ttl=config.RETRIEVAL_CACHE_TTL_SECONDS)
+# Final answers for first-turn questions, keyed like _search_cache.
+_response_cache = TTLCache(maxsize=config.RETRIEVAL_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL_SECONDS)
+# blake2b(normalized query) -> intent label; 16-byte keys keep 4096 entries small.
+_intent_cache = TTLCache(maxsize=4096, ttl=3600)
+
+
+async def warmup(connect: bool = False) -> None:
+    """Pay client construction and TLS setup at startup instead of in the first question.
+
+    Failures are logged and ignored: a cold first query is still correct.
+    """
+    start = time.time()
+    try:
+        await _retrieval.warmup(connect=connect)
+    except Exception as e:
+        logger.warning("Warmup failed (continuing cold): %s", e)
+        return
+    logger.info("Warmup done in %.1fs", time.time() - start)
 
 
 # Single source: imported from src.utils.legal_keywords (EN, FI, SV) + EU law markers from LexAI.
@@ -50,6 +89,8 @@ _EU_LEGAL_MARKERS = (
     "perusoikeuskirja",
 )
 _LEGAL_TOPIC_MARKERS = LEGAL_TOPIC_KEYWORDS + _EU_LEGAL_MARKERS
+# One alternation scanned in C instead of a Python-level `m in q` per marker (~70 markers).
+_LEGAL_MARKER_RE = compile_legal_topic_re(_LEGAL_TOPIC_MARKERS)
 
 
 _GREETING_PATTERNS = frozenset(
@@ -79,6 +120,49 @@ _GREETING_PATTERNS = frozenset(
 )
 
 
+# Structural legal references: section sign, pykälä, KKO/KHO case IDs, statute numbers (123/2000)
+_STRUCTURAL_LEGAL_RE = re.compile(
+    r"§|\bpykäl|\b(?:KKO|KHO)\s*:\s*\d{4}\s*:\s*\d+|\b\d{1,4}/(?:19|20)\d{2}\b", re.IGNORECASE
+)
+
+# Regex fast paths checked before any LLM call: (pattern, intent).
+_FAST_INTENT_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
+    # Greetings / thanks with a courtesy tail ("kiitos paljon!", "thanks a lot", "hei hei")
+    (
+        re.compile(
+            r"^(?:hei|moi|moro|terve|hello|hi|hey|hej|tack|kiitos|thanks|thank you)"
+            r"(?:\s+(?:paljon|kovasti|so much|a lot|så mycket|hei|moi|hej))?[\s!.,]*$",
+            re.IGNORECASE,
+        ),
+        "general_chat",
+    ),
+    (_STRUCTURAL_LEGAL_RE, "legal_search"),
+)
+# Topic markers and structural references in one alternation, so the obvious-legal check is a
+# single C-level scan. Markers are Finnish stems matched inside inflected and compound words
+# ("rikokse-", "sopimusrikkomus"), which is why this is not a per-token set lookup.
+_OBVIOUS_LEGAL_RE = re.compile(f"{_LEGAL_MARKER_RE.pattern}|{_STRUCTURAL_LEGAL_RE.pattern}", re.IGNORECASE)
+
+
+def _fast_intent(query: str) -> str | None:
+    """Return an intent when a fast-path regex matches, else None (fall through to heuristics/LLM)."""
+    q = (query or "").strip()
+    for pattern, intent in _FAST_INTENT_PATTERNS:
+        if pattern.search(q):
+            return intent
+    return None
+
+
+# Literal lookups: a case ID, a quoted phrase, or a section reference. Exact matching
+# already failed for these; an LLM rewrite only loosens the terms the user chose.
+_LITERAL_RE = re.compile(r'\b(?:KKO|KHO):\d{4}:\d+|"[^"]+"|§\s*\d+', re.IGNORECASE)
+
+
+def _is_literal_lookup(query: str) -> bool:
+    """True when *query* cites a case ID, quotes a phrase, or references a section (§)."""
+    return bool(query) and _LITERAL_RE.search(query) is not None
+
+
 def _is_greeting_or_thanks(query: str) -> bool:
     """True for short greetings/thanks that should never trigger legal search."""
     q = query.strip().lower().rstrip("!?.,")
@@ -87,18 +171,30 @@ def _is_greeting_or_thanks(query: str) -> bool:
 
 def _is_obvious_legal_query(query: str) -> bool:
     """Fast path: skip LLM when query is clearly a legal question."""
-    if not query or len(query.strip()) < 3:
+    q = (query or "").strip()
+    if len(q) < 3:
         return False
-    q = query.strip().lower()
-    return any(m in q for m in _LEGAL_TOPIC_MARKERS) or len(q) > 40
+    return _is_obvious_legal_normalized(q.lower())
+
+
+@lru_cache(maxsize=1024)
+def _is_obvious_legal_normalized(q: str) -> bool:
+    """Decision for an already stripped, lowercased query; cached since users repeat and retry queries."""
+    # A greeting (the other fast-path pattern) can never match a structural reference, so
+    # _fast_intent's answer for legal_search reduces to the structural part of this scan.
+    return len(q) > 40 or _OBVIOUS_LEGAL_RE.search(q) is not None
 
 
 def _has_legal_topic_keyword(query: str) -> bool:
     """True if query mentions a legal topic (used to override over-strict clarification)."""
     if not query or len(query.strip()) < 2:
         return False
-    q = query.strip().lower()
-    return any(m in q for m in _LEGAL_TOPIC_MARKERS)
+    return _LEGAL_MARKER_RE.search(query) is not None
+
+
+# Ordered for the partial-match scan (a set would make ties depend on hash order).
+_INTENT_LABELS = ("legal_search", "general_chat", "clarification")
+_VALID_INTENTS = frozenset(_INTENT_LABELS)
 
 
 def _parse_intent_from_llm(raw: str) -> str:
@@ -110,11 +206,10 @@ def _parse_intent_from_llm(raw: str) -> str:
     first_line = raw.strip().split("\n")[0].strip().lower()
     first_line = first_line.strip("'\"` ")
 
-    valid_intents = {"legal_search", "general_chat", "clarification"}
-    if first_line in valid_intents:
+    if first_line in _VALID_INTENTS:
         return first_line
 
-    for intent in valid_intents:
+    for intent in _INTENT_LABELS:
         if intent in first_line:
             return intent
 
@@ -135,6 +230,11 @@ def _query_may_be_follow_up(query: str, messages: list) -> bool:
     return not _has_legal_topic_keyword(query)
 
 
+async def _ainvoke_capped(messages: list, timeout: float, **kwargs):
+    """Support-LLM call with retries, bounded to *timeout* seconds in total (raises TimeoutError)."""
+    return await asyncio.wait_for(retry_async(_llm_mini.ainvoke, messages, **kwargs), timeout=timeout)
+
+
 async def _resolve_ambiguous_query_with_llm(query: str, messages: list[dict]) -> str:
     """Use LLM to interpret short/ambiguous follow-ups in context. Returns effective search query."""
     conv = get_recent_context_for_llm(messages, max_turns=3)
@@ -145,7 +245,7 @@ The user may be asking a follow-up, wanting more on the same topic, or switching
 What legal search query should we use to find relevant KKO/KHO Finnish Supreme Court cases?
 Reply with ONLY the search query in one line, nothing else. Use Finnish or English legal terms."""
     try:
-        response = await retry_async(lambda: _llm_mini.ainvoke([HumanMessage(content=prompt)]))
+        response = await _ainvoke_capped([HumanMessage(content=prompt)], config.REFORMULATE_LLM_TIMEOUT_SECONDS)
         resolved = (response.content or "").strip()
         if resolved and len(resolved) > 2:
             logger.info("Resolved ambiguous query: '%s' -> '%s'", query[:40], resolved[:60])
@@ -189,7 +289,8 @@ async def _handle_obvious_legal_query(state: AgentState, query: str) -> AgentSta
     mentioned_ids = HybridRetrieval.extract_case_ids(query)
     year_start, year_end = extract_year_range(query)
 
-    if config.YEAR_CLARIFICATION_ENABLED and not mentioned_ids:
+    # An explicit year/range in the query already answers the year question: no LLM needed.
+    if config.YEAR_CLARIFICATION_ENABLED and not mentioned_ids and year_start is None:
         # Use LLM to understand: specific year, all years, or ask
         scope, ys, ye = await interpret_year_scope_from_query_async(query)
 
@@ -235,27 +336,106 @@ async def _handle_obvious_legal_query(state: AgentState, query: str) -> AgentSta
     }
 
 
+def _search_params(state: AgentState, query: str, year_start: int | None, year_end: int | None) -> dict:
+    """Filters for one hybrid search: the query, the year range, and the UI/tenant filters from state."""
+    return {
+        "query": query,
+        "response_lang": state.get("response_lang"),
+        "year_start": year_start,
+        "year_end": year_end,
+        "court_types": state.get("court_types"),
+        "legal_domains": state.get("legal_domains"),
+        "tenant_id": state.get("tenant_id"),
+    }
+
+
+def _search_cache_key(params: dict) -> tuple:
+    return (
+        normalize_query_key(params["query"]),
+        params["response_lang"],
+        params["year_start"],
+        params["year_end"],
+        tuple(params["court_types"] or ()),
+        tuple(params["legal_domains"] or ()),
+        params["tenant_id"],
+    )
+
+
+async def _cached_search(params: dict) -> list[dict]:
+    """Hybrid search + rerank through the in-process result cache."""
+    cache_key = _search_cache_key(params)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Hybrid search → cache hit (%s chunks)", len(cached))
+        return list(cached)
+    results = await _retrieval.hybrid_search_with_rerank(
+        params["query"],
+        initial_limit=config.SEARCH_CANDIDATES_FOR_RERANK,
+        final_limit=config.CHUNKS_TO_LLM,
+        response_lang=params["response_lang"],
+        year_start=params["year_start"],
+        year_end=params["year_end"],
+        court_types=params["court_types"],
+        legal_domains=params["legal_domains"],
+        tenant_id=params["tenant_id"],
+    )
+    if results:
+        _search_cache.set(cache_key, tuple(results))
+    return results
+
+
+async def _speculative_search(params: dict) -> None:
+    """Warm the result cache while intent is still being classified. Errors are left to search_knowledge."""
+    try:
+        await _cached_search(params)
+    except Exception as e:
+        logger.warning("Speculative search failed: %s", e)
+
+
+def _start_speculative_search(state: AgentState, query: str) -> asyncio.Task | None:
+    """Start retrieval for *query* in the background, or None when speculation is off or cannot be reused.
+
+    Results reach search_knowledge through the result cache, so nothing is gained when it is disabled.
+    """
+    if not config.SPECULATIVE_SEARCH_ENABLED or not _search_cache.enabled:
+        return None
+    year_start, year_end = extract_year_range(query)
+    return asyncio.create_task(_speculative_search(_search_params(state, query, year_start, year_end)))
+
+
+async def _settle_speculative_search(task: asyncio.Task, result: dict, query: str) -> None:
+    """Wait for the speculative search when search_knowledge will reuse it; cancel it otherwise."""
+    reusable = result.get("intent") == "legal_search" and (
+        result.get("year_start"),
+        result.get("year_end"),
+    ) == extract_year_range(query)
+    if reusable:
+        await task
+    else:
+        task.cancel()
+
+
 async def analyze_intent(state: AgentState) -> AgentState:
     """
     Node 1: Analyze User Intent (Async)
     Fast path: skip LLM for obvious legal queries.
     Resolves ambiguous follow-ups via LLM (no hard-coded phrases).
     """
-    state["stage"] = "analyze"
-    query = state["query"]
+    query = incoming_query = state["query"]
     messages = state.get("messages") or []
 
     if len(query) > config.MAX_QUERY_LENGTH:
-        state["response"] = t("query_too_long", state.get("response_lang") or "fi", max=config.MAX_QUERY_LENGTH)
-        state["intent"] = "error"
-        return state
+        return {
+            "stage": "analyze",
+            "response": t("query_too_long", state.get("response_lang") or "fi", max=config.MAX_QUERY_LENGTH),
+            "intent": "error",
+        }
 
     if not state.get("original_query"):
-        state["original_query"] = query
-        state["search_attempts"] = 0
+        state = {**state, "original_query": query, "search_attempts": 0}
 
     # 0. Fast exit for greetings — never waste LLM calls or search on "hello"
-    if _is_greeting_or_thanks(query):
+    if _is_greeting_or_thanks(query) or _fast_intent(query) == "general_chat":
         logger.info("Intent: general_chat (greeting fast-path)")
         return {
             "intent": "general_chat",
@@ -276,35 +456,143 @@ async def analyze_intent(state: AgentState) -> AgentState:
     # 2. THEN: resolve ambiguous / follow-up queries with LLM context.
     #    Safe now: year-clarification case already handled above.
     if _query_may_be_follow_up(query, messages):
-        resolved = await _resolve_ambiguous_query_with_llm(query, messages)
-        if resolved != query:
-            state["query"] = resolved
-            query = resolved
+        query = await _resolve_ambiguous_query_with_llm(query, messages)
 
     # 3. Fast path for obvious legal queries
     obvious_result = await _handle_obvious_legal_query(state, query)
     if obvious_result:
-        return obvious_result
+        return _with_resolved_query(obvious_result, query, incoming_query)
 
-    # 4. LLM Intent Analysis (Fallback)
-    logger.info("Analyzing intent via LLM...")
+    # 4. LLM Intent Analysis (Fallback). Retrieval for the dominant legal_search
+    #    outcome runs meanwhile; only a query search_knowledge will see unchanged is speculated on.
+    prefetch = _start_speculative_search(state, query) if query == incoming_query else None
+    try:
+        result = await _classify_intent_with_llm(state, query)
+        if prefetch is not None:
+            await _settle_speculative_search(prefetch, result, query)
+    finally:
+        if prefetch is not None and not prefetch.done():
+            prefetch.cancel()
+    return _with_resolved_query(result, query, incoming_query)
 
-    system_prompt = """Classify the user's input into exactly one category:
+
+def _with_resolved_query(update: dict, query: str, incoming_query: str) -> dict:
+    """Add a follow-up rewritten by the resolver to analyze_intent's update, so search uses it."""
+    return {**update, "query": query} if query != incoming_query else update
+
+
+_INTENT_CATEGORIES_PROMPT = """Classify the user's input into exactly one category:
     1. 'legal_search': Questions about Finnish law, court cases, penalties, rights, or legal definitions. Include ANY query that mentions a legal topic (fraud, contract, theft, consequences, damages, etc.).
     2. 'general_chat': Greetings (Hi, Hello), thanks, or questions about you (Who are you?).
     3. 'clarification': ONLY when there is NO identifiable legal subject at all (e.g. "What is the penalty?" with no context, "Does it apply?").
 
     If the user mentions a legal topic (fraud, petos, contract, theft, consequences, etc.), ALWAYS use legal_search. Do NOT ask for clarification when a legal topic is clear.
-    Return ONLY the category name on a single line, nothing else.
+"""
+_INTENT_SYSTEM_PROMPT = (
+    _INTENT_CATEGORIES_PROMPT
+    + """    Return ONLY the category name on a single line, nothing else.
+    """
+)
+# Single-query variant answered with one token: the label is read from that token's log-probs.
+_INTENT_LETTER_PROMPT = (
+    _INTENT_CATEGORIES_PROMPT
+    + """    Return ONLY one letter: A for legal_search, B for general_chat, C for clarification.
     """
+)
+_INTENT_LETTERS = {"A": "legal_search", "B": "general_chat", "C": "clarification"}
+_INTENT_LETTER_KWARGS = {"max_tokens": 1, "logprobs": True, "top_logprobs": 5}
 
-    try:
-        response = await retry_async(
-            lambda: _llm_mini.ainvoke([SystemMessage(content=system_prompt), HumanMessage(content=query)])
+_INTENT_BATCH_INSTRUCTIONS = """
+
+    This request contains several numbered inputs, one per line. Classify each one independently.
+    Instead of a single line, return exactly one line per input, in the same order, formatted as "<number>. <category>".
+    """
+
+# System messages are immutable; build them once instead of per request.
+_INTENT_SYSTEM_MESSAGE = SystemMessage(content=_INTENT_SYSTEM_PROMPT)
+_INTENT_LETTER_SYSTEM_MESSAGE = SystemMessage(content=_INTENT_LETTER_PROMPT)
+_INTENT_BATCH_SYSTEM_MESSAGE = SystemMessage(content=_INTENT_SYSTEM_PROMPT + _INTENT_BATCH_INSTRUCTIONS)
+# "<number>. <answer>" line of a batched support-LLM reply
+_NUMBERED_LINE_RE = re.compile(r"^\s*(\d+)[.)]\s*(.+)$")
+
+
+def _intent_from_letter_logprobs(response: object) -> str | None:
+    """Most likely of A/B/C among the first token's top log-probs, or None if they are missing."""
+    logprobs = (getattr(response, "response_metadata", None) or {}).get("logprobs") or {}
+    tokens = logprobs.get("content") or []
+    if not tokens:
+        return None
+    scores = {cand["token"].strip().upper(): cand["logprob"] for cand in tokens[0].get("top_logprobs") or []}
+    ranked = [(scores[letter], intent) for letter, intent in _INTENT_LETTERS.items() if letter in scores]
+    return max(ranked)[1] if ranked else None
+
+
+async def _llm_intent_single(query: str) -> str:
+    """Classify one query with the support LLM."""
+    if config.INTENT_LOGPROBS:
+        messages = [_INTENT_LETTER_SYSTEM_MESSAGE, HumanMessage(content=query)]
+        llm_kwargs = _INTENT_LETTER_KWARGS
+    else:
+        messages = [_INTENT_SYSTEM_MESSAGE, HumanMessage(content=query)]
+        llm_kwargs = {}
+    if config.INTENT_HEDGE_MS > 0:
+        response = await asyncio.wait_for(
+            hedged(retry_async, _llm_mini.ainvoke, messages, delay=config.INTENT_HEDGE_MS / 1000, **llm_kwargs),
+            timeout=config.INTENT_LLM_TIMEOUT_SECONDS,
         )
-        raw_intent = response.content or ""
-        intent = _parse_intent_from_llm(raw_intent)
-        logger.info("LLM raw intent: %s → parsed: %s", raw_intent.strip()[:60], intent)
+    else:
+        response = await _ainvoke_capped(messages, config.INTENT_LLM_TIMEOUT_SECONDS, **llm_kwargs)
+    raw_intent = (response.content or "").strip()
+    intent = _intent_from_letter_logprobs(response) if config.INTENT_LOGPROBS else None
+    if intent is None:
+        intent = _INTENT_LETTERS.get(raw_intent.upper()) or _parse_intent_from_llm(raw_intent)
+    logger.info("LLM raw intent: %s → parsed: %s", raw_intent[:60], intent)
+    return intent
+
+
+async def _llm_intent_batch(queries: list[str]) -> list[str]:
+    """Classify several queries with one support-LLM call; raises if any numbered line is missing."""
+    numbered = "\n".join(f"{i}. {' '.join(q.split())}" for i, q in enumerate(queries, 1))
+    response = await _ainvoke_capped(
+        [_INTENT_BATCH_SYSTEM_MESSAGE, HumanMessage(content=numbered)], config.INTENT_LLM_TIMEOUT_SECONDS
+    )
+    by_number = {}
+    for line in (response.content or "").splitlines():
+        match = _NUMBERED_LINE_RE.match(line)
+        if match:
+            by_number[int(match.group(1))] = _parse_intent_from_llm(match.group(2))
+    return [by_number[i] for i in range(1, len(queries) + 1)]
+
+
+_intent_batcher = MicroBatcher(_llm_intent_single, _llm_intent_batch, wait_seconds=config.INTENT_BATCH_WINDOW_MS / 1000)
+
+
+def _intent_cache_key(query: str) -> bytes:
+    return blake2b(normalize_query_key(query).encode(), digest_size=16).digest()
+
+
+async def _llm_intent(query: str) -> str:
+    """Intent label from the support LLM, memoized per normalized query (intent depends on the text alone)."""
+    key = _intent_cache_key(query)
+    cached = _intent_cache.get(key)
+    if cached is not None:
+        logger.info("LLM intent → cache hit: %s", cached)
+        return cached
+
+    if config.INTENT_BATCH_WINDOW_MS > 0:
+        intent = await _intent_batcher.submit(query)
+    else:
+        intent = await _llm_intent_single(query)
+    _intent_cache.set(key, intent)
+    return intent
+
+
+async def _classify_intent_with_llm(state: AgentState, query: str) -> AgentState:
+    """LLM intent classification, then year scope for legal searches."""
+    logger.info("Analyzing intent via LLM...")
+
+    try:
+        intent = await _llm_intent(query)
         if intent == "clarification" and _has_legal_topic_keyword(query):
             intent = "legal_search"
 
@@ -337,18 +625,8 @@ async def analyze_intent(state: AgentState) -> AgentState:
         return {"intent": "legal_search", "stage": "analyze", "year_start": None, "year_end": None}
 
 
-async def reformulate_query(state: AgentState) -> AgentState:
-    """
-    Node: Reformulate Query (Async)
-    """
-    state["stage"] = "reformulate"
-    original = state.get("original_query", state["query"])
-    attempts = state.get("search_attempts", 0) + 1
-    state["search_attempts"] = attempts
-
-    logger.info("[REFORMULATE] Attempt %s: Rewriting query...", attempts)
-
-    system_prompt = """You are a Finnish legal search expert. The previous search found 0 results.
+_REFORMULATE_SYSTEM_MESSAGE = SystemMessage(
+    content="""You are a Finnish legal search expert. The previous search found 0 results.
     Rewrite the query to improve keyword matching in a Finnish case law database.
 
     Rules:
@@ -358,43 +636,121 @@ async def reformulate_query(state: AgentState) -> AgentState:
     - Remove only non-Finnish filler words (tell me about, what is, etc.).
     - Output ONLY the new search string in Finnish, comma-separated.
     """
+)
+
+
+_REFORMULATE_BATCH_SYSTEM_MESSAGE = SystemMessage(
+    content=_REFORMULATE_SYSTEM_MESSAGE.content
+    + """
+    This request contains several numbered queries, one per line. Rewrite each one independently.
+    Return exactly one line per query, in the same order, formatted as "<number>. <new search string>".
+    """
+)
+
+
+async def _llm_reformulate_single(query: str) -> str:
+    response = await _ainvoke_capped(
+        [_REFORMULATE_SYSTEM_MESSAGE, HumanMessage(content=query)], config.REFORMULATE_LLM_TIMEOUT_SECONDS
+    )
+    return response.content.strip()
+
+
+async def _llm_reformulate_batch(queries: list[str]) -> list[str]:
+    """Rewrite several queries with one support-LLM call; raises if any numbered line is missing."""
+    numbered = "\n".join(f"{i}. {' '.join(q.split())}" for i, q in enumerate(queries, 1))
+    response = await _ainvoke_capped(
+        [_REFORMULATE_BATCH_SYSTEM_MESSAGE, HumanMessage(content=numbered)], config.REFORMULATE_LLM_TIMEOUT_SECONDS
+    )
+    by_number = {}
+    for line in (response.content or "").splitlines():
+        match = _NUMBERED_LINE_RE.match(line)
+        if match:
+            by_number[int(match.group(1))] = match.group(2).strip()
+    return [by_number[i] for i in range(1, len(queries) + 1)]
+
+
+_reformulate_batcher = MicroBatcher(
+    _llm_reformulate_single, _llm_reformulate_batch, wait_seconds=config.REFORMULATE_BATCH_WINDOW_MS / 1000
+)
+
+
+async def _rewrite_query(query: str) -> str:
+    if config.REFORMULATE_BATCH_WINDOW_MS > 0:
+        return await _reformulate_batcher.submit(query)
+    return await _llm_reformulate_single(query)
+
+
+def _start_speculative_reformulate(state: AgentState) -> asyncio.Task | None:
+    """On the first search, start the zero-result rewrite in the background (if enabled and it could be used)."""
+    if not (config.SPECULATIVE_REFORMULATE and config.REFORMULATE_ENABLED) or state.get("search_attempts", 0):
+        return None
+    original = state.get("original_query") or state["query"]
+    if _is_literal_lookup(original):  # route_search_result never reformulates these
+        return None
+    if expand_legal_terms(original):  # the first retry will use the dictionary rewrite
+        return None
+    return asyncio.create_task(_rewrite_query(original))
+
+
+async def reformulate_query(state: AgentState) -> AgentState:
+    """
+    Node: Reformulate Query (Async)
+    """
+    original = state.get("original_query") or state["query"]
+    attempts = state.get("search_attempts", 0) + 1
+    update = {"stage": "reformulate", "search_attempts": attempts, "reformulate_task": None}
+
+    logger.info("[REFORMULATE] Attempt %s: Rewriting query...", attempts)
 
+    speculative = state.get("reformulate_task")
+    # First retry: known legal terms are expanded from the dictionary; the LLM handles the rest
+    # (and the second retry, which would otherwise repeat the same rule-based query).
+    rule_based = expand_legal_terms(original) if attempts == 1 else ""
     try:
-        response = await retry_async(
-            lambda: _llm_mini.ainvoke([SystemMessage(content=system_prompt), HumanMessage(content=original)])
-        )
-        new_query = response.content.strip()
-        state["query"] = new_query
+        if rule_based:
+            if speculative is not None:
+                speculative.cancel()
+            new_query = rule_based
+        elif speculative is not None:
+            new_query = await speculative
+        else:
+            new_query = await _rewrite_query(original)
+        update["query"] = new_query
         logger.info("[REFORMULATE] New query: %s", new_query)
 
     except Exception as e:
         logger.error("[REFORMULATE] Error: %s", e)
 
-    return state
+    return update
 
 
-def _clarification_prompt(lang: str) -> str:
-    prompts = {
+_CLARIFICATION_SYSTEM_MESSAGES = {
+    lang: SystemMessage(content=prompt)
+    for lang, prompt in {
         "en": "The user's legal question is too vague. Ask a polite follow-up question in English to clarify what they are looking for.",
         "sv": "Användarens rättsliga fråga är för vag. Ställ en artig uppföljningsfråga på svenska för att förtydliga vad de söker.",
         "fi": "Käyttäjän oikeudellinen kysymys on liian epämääräinen. Kysy kohtelias jatkokysymys suomeksi selvittääksesi mitä he etsivät.",
-    }
-    return prompts.get(lang, prompts["fi"])
+    }.items()
+}
+
+
+def _clarification_system_message(lang: str) -> SystemMessage:
+    return _CLARIFICATION_SYSTEM_MESSAGES.get(lang, _CLARIFICATION_SYSTEM_MESSAGES["fi"])
+
+
+_CLARIFICATION_FALLBACKS = {
+    "en": "Could you please clarify your question? I'm not sure what you're asking about.",
+    "sv": "Kan du förtydliga din fråga? Jag är inte säker på vad du menar.",
+    "fi": "Voisitko tarkentaa kysymystäsi? En ole varma mitä asiaa tarkoitat.",
+}
 
 
 def _clarification_fallback(lang: str) -> str:
-    fallbacks = {
-        "en": "Could you please clarify your question? I'm not sure what you're asking about.",
-        "sv": "Kan du förtydliga din fråga? Jag är inte säker på vad du menar.",
-        "fi": "Voisitko tarkentaa kysymystäsi? En ole varma mitä asiaa tarkoitat.",
-    }
-    return fallbacks.get(lang, fallbacks["fi"])
+    return _CLARIFICATION_FALLBACKS.get(lang, _CLARIFICATION_FALLBACKS["fi"])
 
 
 def _year_clarification_message(lang: str) -> str:
     """Return the year clarification question in the given language."""
-    from src.config.translations import t
-
     return t("year_clarification", lang)
 
 
@@ -402,23 +758,19 @@ async def ask_year_clarification(state: AgentState) -> AgentState:
     """
     Node: Ask which years' court decisions to search (when broad query, no year).
     """
-    state["stage"] = "clarify_year"
     lang = state.get("response_lang") or "fi"
-    state["response"] = _year_clarification_message(lang)
-    return state
+    return {"stage": "clarify_year", "response": _year_clarification_message(lang)}
 
 
 async def ask_clarification(state: AgentState) -> AgentState:
     """
     Node: Ask Clarification (Async)
     """
-    state["stage"] = "clarify"
     query = state["query"]
     lang = state.get("response_lang") or "fi"
 
     try:
-        prompt = _clarification_prompt(lang)
-        msgs = [SystemMessage(content=prompt)]
+        msgs = [_clarification_system_message(lang)]
         # Include recent conversation for context-aware clarification
         for m in (state.get("messages") or [])[-6:]:
             role = m.get("role", "")
@@ -428,43 +780,48 @@ async def ask_clarification(state: AgentState) -> AgentState:
             elif role == "assistant":
                 msgs.append(AIMessage(content=content))
         msgs.append(HumanMessage(content=query))
-        response = await retry_async(lambda: _llm_mini.ainvoke(msgs))
-        state["response"] = response.content
+        response = await _ainvoke_capped(msgs, config.CHAT_LLM_TIMEOUT_SECONDS)
+        text = response.content
     except Exception:
-        state["response"] = _clarification_fallback(lang)
+        text = _clarification_fallback(lang)
 
-    return state
+    return {"stage": "clarify", "response": text}
 
 
-def _general_chat_prompt(lang: str) -> str:
-    prompts = {
+_GENERAL_CHAT_SYSTEM_MESSAGES = {
+    lang: SystemMessage(content=prompt)
+    for lang, prompt in {
         "en": "You are a helpful Finnish Legal Assistant. The user is engaging in general chat (greetings/thanks). Respond politely in English. If they ask who you are, explain that you are an AI assistant specialized in Finnish legislation and case law (KKO/KHO).",
         "sv": "Du är en hjälpsam finsk juridisk assistent. Användaren har en allmän konversation (hälsningar/tack). Svara artigt på svenska. Om de frågar vem du är, förklara att du är en AI-assistent specialiserad på finsk lagstiftning och rättspraxis (KKO/KHO).",
         "fi": "Olet avulias suomalainen oikeudellinen avustaja. Käyttäjä keskustelee yleisesti (tervehdykset/kiitokset). Vastaa kohteliaasti suomeksi. Jos he kysyvät kuka olet, kerro että olet tekoälyavustaja, joka on erikoistunut Suomen lainsäädäntöön ja oikeuskäytäntöön (KKO/KHO).",
-    }
-    return prompts.get(lang, prompts["fi"])
+    }.items()
+}
+
+
+def _general_chat_system_message(lang: str) -> SystemMessage:
+    return _GENERAL_CHAT_SYSTEM_MESSAGES.get(lang, _GENERAL_CHAT_SYSTEM_MESSAGES["fi"])
+
+
+_GENERAL_CHAT_FALLBACKS = {
+    "en": "Hello! How can I help you with legal matters?",
+    "sv": "Hej! Hur kan jag hjälpa dig med rättsliga frågor?",
+    "fi": "Hei! Kuinka voin auttaa sinua oikeudellisissa asioissa?",
+}
 
 
 def _general_chat_fallback(lang: str) -> str:
-    fallbacks = {
-        "en": "Hello! How can I help you with legal matters?",
-        "sv": "Hej! Hur kan jag hjälpa dig med rättsliga frågor?",
-        "fi": "Hei! Kuinka voin auttaa sinua oikeudellisissa asioissa?",
-    }
-    return fallbacks.get(lang, fallbacks["fi"])
+    return _GENERAL_CHAT_FALLBACKS.get(lang, _GENERAL_CHAT_FALLBACKS["fi"])
 
 
 async def general_chat(state: AgentState) -> AgentState:
     """
     Node: General Chat (Async)
     """
-    state["stage"] = "chat"
     query = state["query"]
     lang = state.get("response_lang") or "fi"
 
     try:
-        system_prompt = _general_chat_prompt(lang)
-        msgs = [SystemMessage(content=system_prompt)]
+        msgs = [_general_chat_system_message(lang)]
         # Include recent conversation so the LLM can reference prior exchanges
         for m in (state.get("messages") or [])[-6:]:
             role = m.get("role", "")
@@ -474,57 +831,51 @@ async def general_chat(state: AgentState) -> AgentState:
             elif role == "assistant":
                 msgs.append(AIMessage(content=content))
         msgs.append(HumanMessage(content=query))
-        response = await retry_async(lambda: _llm_mini.ainvoke(msgs))
-        state["response"] = response.content
+        response = await _ainvoke_capped(msgs, config.CHAT_LLM_TIMEOUT_SECONDS)
+        text = response.content
     except Exception:
-        state["response"] = _general_chat_fallback(lang)
+        text = _general_chat_fallback(lang)
 
-    return state
+    return {"stage": "chat", "response": text}
 
 
 async def search_knowledge(state: AgentState) -> AgentState:
     """
     Node 2: Search knowledge base using hybrid retrieval (Async)
     """
-    state["stage"] = "search"
     start_time = time.time()
     logger.info("Hybrid search → fetching candidates...")
+    speculative = _start_speculative_reformulate(state)
+    update: dict = {"stage": "search"}
     try:
         query = state["query"]
-        response_lang = state.get("response_lang")
-        year_start = state.get("year_start")
-        year_end = state.get("year_end")
-        court_types = state.get("court_types")
-        legal_domains = state.get("legal_domains")
-        tenant_id = state.get("tenant_id")
-        results = await _retrieval.hybrid_search_with_rerank(
-            query,
-            initial_limit=config.SEARCH_CANDIDATES_FOR_RERANK,
-            final_limit=config.CHUNKS_TO_LLM,
-            response_lang=response_lang,
-            year_start=year_start,
-            year_end=year_end,
-            court_types=court_types,
-            legal_domains=legal_domains,
-            tenant_id=tenant_id,
-        )
+        results = await _cached_search(_search_params(state, query, state.get("year_start"), state.get("year_end")))
         elapsed = time.time() - start_time
         logger.info("Reranking done → %s chunks in %.1fs", len(results), elapsed)
 
-        state["search_results"] = results
-        state["rrf_results"] = results
-        state["retrieval_metadata"] = {
-            "total_results": len(results),
-            "query": query,
-            "method": "hybrid_rrf_rerank",
-            "search_time": elapsed,
-        }
+        update["search_results"] = results
+        logger.debug("hybrid search q=%s n=%d", query, len(results))
+        # Only consumed by debugging/monitoring: skip building it unless asked for.
+        if state.get("debug") or logger.isEnabledFor(logging.DEBUG):
+            update["rrf_results"] = results
+            update["retrieval_metadata"] = {
+                "total_results": len(results),
+                "query": query,
+                "method": "hybrid_rrf_rerank",
+                "search_time": elapsed,
+            }
+            logger.debug("retrieval_metadata=%s", orjson.dumps(update["retrieval_metadata"]).decode())
     except Exception as e:
-        logger.error("Search error: %s", e)
-        state["error"] = f"Search failed: {e!s}"
-        state["search_results"] = []
+        logger.exception("Search failed")
+        update["error"] = f"Search failed: {e!s}"
+        update["search_results"] = []
 
-    return state
+    if speculative is not None:
+        if update["search_results"]:
+            speculative.cancel()
+        else:
+            update["reformulate_task"] = speculative
+    return update
 
 
 def _is_search_failure_error(error_msg: str) -> bool:
@@ -572,59 +923,130 @@ def _search_error_fallback(lang: str, error_msg: str) -> str:
     return t("error_search_api", lang)
 
 
+_NO_RESULTS_FALLBACKS = {
+    "en": "Based on the provided documents, I cannot find information on this topic. There are no relevant documents in the database.",
+    "sv": "Baserat på de angivna dokumenten kan jag inte hitta information om detta ämne. Det finns inga relevanta dokument i databasen.",
+    "fi": "Annettujen asiakirjojen perusteella en löydä tietoa tästä aiheesta. Tietokannassa ei ole relevantteja asiakirjoja.",
+}
+
+
 def _no_results_fallback(lang: str) -> str:
     """Used ONLY when search succeeded but returned zero documents (no relevant docs in DB)."""
-    fallbacks = {
-        "en": "Based on the provided documents, I cannot find information on this topic. There are no relevant documents in the database.",
-        "sv": "Baserat på de angivna dokumenten kan jag inte hitta information om detta ämne. Det finns inga relevanta dokument i databasen.",
-        "fi": "Annettujen asiakirjojen perusteella en löydä tietoa tästä aiheesta. Tietokannassa ei ole relevantteja asiakirjoja.",
-    }
-    return fallbacks.get(lang, fallbacks["fi"])
+    return _NO_RESULTS_FALLBACKS.get(lang, _NO_RESULTS_FALLBACKS["fi"])
+
+
+_LLM_ERROR_FALLBACKS = {
+    "en": "Sorry, an error occurred while generating the response. Please try again.",
+    "sv": "Förlåt, ett fel uppstod vid generering av svaret. Försök igen.",
+    "fi": "Pahoittelut, vastauksen luomisessa tapahtui virhe. Yritä uudelleen.",
+}
 
 
 def _llm_error_fallback(lang: str) -> str:
-    fallbacks = {
-        "en": "Sorry, an error occurred while generating the response. Please try again.",
-        "sv": "Förlåt, ett fel uppstod vid generering av svaret. Försök igen.",
-        "fi": "Pahoittelut, vastauksen luomisessa tapahtui virhe. Yritä uudelleen.",
-    }
-    return fallbacks.get(lang, fallbacks["fi"])
+    return _LLM_ERROR_FALLBACKS.get(lang, _LLM_ERROR_FALLBACKS["fi"])
+
 
+_CLIENT_DOC_PHRASES = ("my document", "my case", "my contract", "analyze this", "compare my")
 
-def _detect_client_doc_analysis(state: AgentState, results: list) -> bool:
+
+def _detect_client_doc_analysis(query_text: str, results: list) -> bool:
     """True when results contain client documents and the query references them."""
-    query_text = state.get("original_query", state["query"])
-    has_client_docs = any(r.get("case_id", "").startswith("CLIENT:") for r in results)
-    mentions_own = any(
-        p in query_text.lower() for p in ["my document", "my case", "my contract", "analyze this", "compare my"]
-    )
-    if has_client_docs and mentions_own:
+    # Client documents are rare in results, so the query is only scanned when one is present.
+    if not any(r.get("case_id", "").startswith("CLIENT:") for r in results):
+        return False
+    lowered = query_text.lower()
+    if any(p in lowered for p in _CLIENT_DOC_PHRASES):
         logger.info("Detected CLIENT DOCUMENT ANALYSIS mode")
-    return has_client_docs and mentions_own
+        return True
+    return False
 
 
-async def _run_relevancy_check(state: AgentState, response: str) -> None:
-    """Run optional relevancy scoring and store results in state."""
-    is_error_response = response.startswith(("Pahoittelut", "Sorry", "Förlåt"))
-    if not config.RELEVANCY_CHECK_ENABLED or not response or is_error_response:
-        state["relevancy_score"] = None
-        state["relevancy_reason"] = None
-        return
+async def _score_relevancy(query: str, response: str) -> tuple[float | None, str | None]:
+    """Relevancy score and reason for *response*, or (None, None) if the check fails."""
     try:
-        rel = await check_relevancy(state["query"], response)
-        state["relevancy_score"] = float(rel["score"])
-        state["relevancy_reason"] = rel.get("reason") or ""
+        check = check_relevancy if config.RELEVANCY_USE_LLM else check_relevancy_with_reranker
+        async with _relevancy_slots:
+            rel = await check(query, response)
+        return float(rel["score"]), rel.get("reason") or ""
     except Exception as rel_err:
         logger.warning("Relevancy check failed: %s", rel_err)
-        state["relevancy_score"] = None
-        state["relevancy_reason"] = None
+        return None, None
+
+
+def _start_relevancy_check(query: str, response: str, is_error_response: bool = False) -> dict:
+    """Start optional relevancy scoring in the background; generate_response collects the result.
+
+    Returns the relevancy fields for reason_legal's state update. Error fallbacks are never scored.
+    """
+    update = {"relevancy_score": None, "relevancy_reason": None, "relevancy_task": None}
+    if config.RELEVANCY_CHECK_ENABLED and response and not is_error_response:
+        update["relevancy_task"] = asyncio.create_task(_score_relevancy(query, response))
+    return update
+
+
+# A bare case-ID query ("KKO:2024:76") answered straight from the case's top chunk
+# when the reranker is this confident it is the right document.
+_CITATION_ANSWER_MIN_RERANK = 0.9
+_CITATION_ANSWER_MAX_CHARS = 2000
+
+
+def _citation_answer(query: str, focus_case_ids: list[str], results: list[dict], lang: str) -> str | None:
+    """Templated answer for a query that is only a case ID, or None to use the LLM."""
+    if len(focus_case_ids) != 1 or _LITERAL_RE.sub("", query).strip(" ?!.,"):
+        return None
+    case_id = focus_case_ids[0]
+    for r in results:
+        meta = r.get("metadata") or {}
+        if (meta.get("case_id") or "").upper() != case_id:
+            continue
+        if (r.get("rerank_score") or 0) < _CITATION_ANSWER_MIN_RERANK:
+            return None
+        answer = f"{case_id}: {r.get('text', '')[:_CITATION_ANSWER_MAX_CHARS]}"
+        if meta.get("url"):
+            answer += f"\n\n{t('sources_heading', lang)}: {meta['url']}"
+        return answer
+    return None
+
+
+def _response_cache_key(state: AgentState, display_query: str) -> tuple | None:
+    """Answer-cache key, or None when the turn has conversation history (the answer depends on it)."""
+    if state.get("messages") or not _response_cache.enabled:
+        return None
+    return _search_cache_key(_search_params(state, display_query, state.get("year_start"), state.get("year_end")))
+
+
+async def _respond_without_llm(state: AgentState, response: str) -> dict:
+    """Finish reason_legal with a ready answer: stream it in one piece, skip relevancy scoring."""
+    stream_queue = state.get("stream_queue")
+    if stream_queue is not None:
+        stream_queue.put_nowait(response)
+        stream_queue.put_nowait(None)
+    # Empty response: clears the relevancy fields, nothing to score
+    return {"stage": "reason", "response": response, **_start_relevancy_check(state["query"], "")}
+
+
+async def _stream_generation(stream_queue: asyncio.Queue, lang: str, generation_kwargs: dict) -> str:
+    """Generate the answer token by token into *stream_queue* (ended with None); return the full text."""
+    response_parts: list[str] = []
+    try:
+        async for chunk in _generator.astream_response(**generation_kwargs):
+            response_parts.append(chunk)
+            stream_queue.put_nowait(chunk)
+    except Exception:
+        # The UI only shows streamed text once tokens have flowed, so the
+        # fallback must go through the queue too (after any partial answer).
+        separator = "\n\n" if response_parts else ""
+        stream_queue.put_nowait(separator + _llm_error_fallback(lang))
+        raise
+    finally:
+        stream_queue.put_nowait(None)
+    return "".join(response_parts)
 
 
 async def reason_legal(state: AgentState) -> AgentState:
     """
     Node 3: Legal reasoning with LLM (Async)
     """
-    state["stage"] = "reason"
     results = state.get("search_results", [])
     lang = state.get("response_lang") or "fi"
 
@@ -632,14 +1054,14 @@ async def reason_legal(state: AgentState) -> AgentState:
         search_error = state.get("error")
         if search_error and _is_search_failure_error(search_error):
             logger.warning("Search failed (connection/timeout/API): %s", search_error)
-            state["response"] = _search_error_fallback(lang, search_error)
+            response = _search_error_fallback(lang, search_error)
         else:
             logger.warning("No search results found (DB empty for query)")
-            state["response"] = _no_results_fallback(lang)
+            response = _no_results_fallback(lang)
         stream_queue = state.get("stream_queue")
         if stream_queue is not None:
-            await stream_queue.put(None)
-        return state
+            stream_queue.put_nowait(None)
+        return {"stage": "reason", "response": response}
 
     start_time = time.time()
     logger.info("Generating response from %s chunks...", len(results))
@@ -649,77 +1071,81 @@ async def reason_legal(state: AgentState) -> AgentState:
     if focus_case_ids:
         logger.info("Focus case(s) for answer: %s", focus_case_ids)
 
-    is_client_doc_analysis = _detect_client_doc_analysis(state, results)
-    court_types = state.get("court_types")
+    citation_answer = _citation_answer(display_query, focus_case_ids, results, lang)
+    if citation_answer is not None:
+        logger.info("Citation lookup for %s answered from the top chunk (no LLM call)", focus_case_ids[0])
+        return await _respond_without_llm(state, citation_answer)
+
+    response_key = _response_cache_key(state, display_query)
+    # A regenerate skips the lookup but still stores the new answer under the same key.
+    use_cached = response_key is not None and not state.get("bypass_response_cache")
+    cached_response = _response_cache.get(response_key) if use_cached else None
+    if cached_response is not None:
+        logger.info("Answer → cache hit (no LLM call)")
+        return await _respond_without_llm(state, cached_response)
+
+    generation_kwargs = {
+        "query": display_query,
+        "context_chunks": results,
+        "focus_case_ids": focus_case_ids or None,
+        "response_language": lang,
+        "conversation_history": state.get("messages") or None,
+        "is_client_doc_analysis": _detect_client_doc_analysis(display_query, results),
+        "court_types": state.get("court_types"),
+    }
 
     try:
         stream_queue = state.get("stream_queue")
-        if stream_queue is not None:
-            response_parts: list[str] = []
-            try:
-                async for chunk in _generator.astream_response(
-                    query=display_query,
-                    context_chunks=results,
-                    focus_case_ids=focus_case_ids or None,
-                    response_language=lang,
-                    conversation_history=state.get("messages") or None,
-                    is_client_doc_analysis=is_client_doc_analysis,
-                    court_types=court_types,
-                ):
-                    response_parts.append(chunk)
-                    await stream_queue.put(chunk)
-                response = "".join(response_parts)
-            finally:
-                await stream_queue.put(None)
-            state["response"] = response
-        else:
-            response = await _generator.agenerate_response(
-                query=display_query,
-                context_chunks=results,
-                focus_case_ids=focus_case_ids or None,
-                response_language=lang,
-                conversation_history=state.get("messages") or None,
-                is_client_doc_analysis=is_client_doc_analysis,
-                court_types=court_types,
-            )
-            state["response"] = response
+        async with _generation_slots:
+            if stream_queue is not None:
+                response = await _stream_generation(stream_queue, lang, generation_kwargs)
+            else:
+                response = await _generator.agenerate_response(**generation_kwargs)
         elapsed = time.time() - start_time
         logger.info("Response ready in %.1fs", elapsed)
-        await _run_relevancy_check(state, response)
+        if response_key is not None and response:
+            _response_cache.set(response_key, response)
+        return {"stage": "reason", "response": response, **_start_relevancy_check(state["query"], response)}
     except Exception as e:
         logger.error("LLM error: %s", e)
-        state["error"] = f"LLM generation failed: {e!s}"
-        state["response"] = _llm_error_fallback(lang)
-        state["relevancy_score"] = None
-        state["relevancy_reason"] = None
+        fallback = _llm_error_fallback(lang)
+        return {
+            "stage": "reason",
+            "error": f"LLM generation failed: {e!s}",
+            "response": fallback,
+            **_start_relevancy_check(state["query"], fallback, is_error_response=True),
+        }
+
 
-    return state
+_RESPOND_FALLBACKS = {
+    "en": "Sorry, the response could not be generated. Please try again.",
+    "sv": "Förlåt, svaret kunde inte genereras. Försök igen.",
+    "fi": "Pahoittelut, vastausta ei voitu luoda. Yritä uudelleen.",
+}
 
 
 def _respond_fallback(lang: str) -> str:
-    fallbacks = {
-        "en": "Sorry, the response could not be generated. Please try again.",
-        "sv": "Förlåt, svaret kunde inte genereras. Försök igen.",
-        "fi": "Pahoittelut, vastausta ei voitu luoda. Yritä uudelleen.",
-    }
-    return fallbacks.get(lang, fallbacks["fi"])
+    return _RESPOND_FALLBACKS.get(lang, _RESPOND_FALLBACKS["fi"])
 
 
 async def generate_response(state: AgentState) -> AgentState:
     """
     Node 4: Return final response (Async)
     """
-    state["stage"] = "respond"
-    lang = state.get("response_lang") or "fi"
-    if not state.get("response"):
-        state["response"] = _respond_fallback(lang)
-    return state
+    # The UI renders a non-streamed answer from this node's update, so response is always included.
+    update = {
+        "stage": "respond",
+        "response": state.get("response") or _respond_fallback(state.get("response_lang") or "fi"),
+    }
+    relevancy_task = state.get("relevancy_task")
+    if relevancy_task is not None:
+        update["relevancy_score"], update["relevancy_reason"] = await relevancy_task
+        update["relevancy_task"] = None
+    return update
 
 
 async def handle_error(state: AgentState) -> AgentState:
     """
     Error handler node (Async)
     """
-    state["stage"] = "error"
-    state["response"] = f"❌ Error: {state.get('error', 'Unknown error occurred')}"
-    return state
+    return {"stage": "error", "response": f"❌ Error: {state.get('error', 'Unknown error occurred')}"}
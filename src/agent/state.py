@@ -2,6 +2,7 @@
 Agent State Definition for LangGraph
 """
 
+from collections.abc import Sequence
 from typing import TypedDict
 
 
@@ -15,20 +16,21 @@ class AgentState(TypedDict):
     # User input
     query: str
 
-    # Conversation history
-    messages: list[dict]
+    # Conversation history (read-only: a tuple of the last chat messages)
+    messages: Sequence[dict]
 
     # Processing stages (for tracking)
     stage: str  # current stage: search, reason, respond
 
-    # Search results from hybrid retrieval (Vector + FTS + RRF)
-    vector_results: list[dict] | None  # Top 50 from vector similarity
-    fts_results: list[dict] | None  # Top 50 from full-text search
-    rrf_results: list[dict] | None  # Top 20-30 after RRF merge
+    # Search results from hybrid retrieval (Vector + FTS + RRF). Per-channel vector/FTS
+    # lists stay inside HybridRetrieval: they are merged there and never read by a node.
+    rrf_results: list[dict] | None  # Same list as search_results; only set in debug runs
     search_results: list[dict] | None  # Final ranked results
 
-    # Retrieval metadata (for debugging/monitoring)
+    # Retrieval metadata (for debugging/monitoring); only built when debug is set
+    # or the nodes logger is at DEBUG level.
     retrieval_metadata: dict | None
+    debug: bool
 
     # Intent routing
     intent: str  # 'legal_search', 'general', 'clarification'
@@ -36,6 +38,9 @@ class AgentState(TypedDict):
     # Self-correction
     original_query: str
     search_attempts: int  # To prevent infinite loops
+    # Rewrite of original_query started during the first search (SPECULATIVE_REFORMULATE);
+    # awaited by reformulate_query, cancelled when the search finds results
+    reformulate_task: object | None
 
     # Final response
     response: str
@@ -43,6 +48,8 @@ class AgentState(TypedDict):
     # Relevancy check (post-answer LLM; compact input to respect context)
     relevancy_score: float | None
     relevancy_reason: str | None
+    # Pending relevancy check started by reason_legal, awaited in generate_response
+    relevancy_task: object | None
 
     # Error handling
     error: str | None
@@ -66,3 +73,51 @@ class AgentState(TypedDict):
 
     # Multi-tenant: client document isolation
     tenant_id: str | None  # from LEXAI_TENANT_ID env var or session state
+
+    # True for a UI "Regenerate": skip the answer cache so a new answer is generated
+    bypass_response_cache: bool
+
+
+# Every AgentState key with its initial value, in one place: callers build a
+# complete initial state with new_agent_state() instead of listing defaults
+# themselves, and a key added to AgentState gets its default here.
+# Mutable values (lists) are not shared: new_agent_state() creates them per call.
+# LangGraph keeps one channel per key and merges each node's partial update into
+# it, so the schema stays a TypedDict.
+_STATE_TEMPLATE: dict = {
+    "query": "",
+    "messages": (),
+    "stage": "init",
+    "rrf_results": None,
+    "search_results": None,
+    "retrieval_metadata": None,
+    "debug": False,
+    "intent": "",
+    "original_query": "",
+    "search_attempts": 0,
+    "reformulate_task": None,
+    "response": "",
+    "relevancy_score": None,
+    "relevancy_reason": None,
+    "relevancy_task": None,
+    "error": None,
+    "response_lang": None,
+    "year_start": None,
+    "year_end": None,
+    "year_clarification_answered": False,
+    "stream_queue": None,
+    "court_types": None,
+    "legal_domains": None,
+    "tenant_id": None,
+    "bypass_response_cache": False,
+}
+
+
+def new_agent_state(**fields) -> AgentState:
+    """Return a fully populated AgentState: template defaults overridden by *fields*."""
+    state = _STATE_TEMPLATE.copy()
+    state.update(fields)
+    # A fresh list only when the caller left search_results unset.
+    if state["search_results"] is None:
+        state["search_results"] = []
+    return state
@@ -5,8 +5,15 @@ Streaming version of agent for Streamlit
 import asyncio
 import contextlib
 import queue
+import re
 import threading
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from functools import lru_cache
+
+try:
+    import uvloop
+except ImportError:  # installed with uvicorn[standard] everywhere except Windows
+    uvloop = None
 
 from src.config.logging_config import setup_logger
 from src.config.settings import config
@@ -14,22 +21,89 @@ from src.config.translations import t
 from src.utils.lang_detect import detect_query_language
 
 from .graph import agent_graph
-from .state import AgentState
+from .state import AgentState, new_agent_state
 
 logger = setup_logger(__name__)
 
+__all__ = ["stream_query_response", "stream_query_response_sync"]
+
+# One queue feeds the UI: answer chunks (str, None = end of answer) pushed by reason_legal,
+# and (node, update) tuples pushed by _run_graph. LangGraph's "messages" stream mode is not a
+# substitute: it carries the tokens of every LLM call (intent, rewrite, relevancy scoring) but
+# none of the answers reason_legal sends without an LLM (cache hits, citation lookups, fallbacks).
+StreamItem = str | tuple[str, dict] | None
+
+_RELEVANCY_PREFIXES = ("Relevanssi:", "Relevancy:")
+# Answer chunks already waiting in the queue are joined into one yield up to this size, so a
+# consumer that re-renders per chunk (st.write_stream) catches up instead of falling further behind.
+_COALESCE_MAX_CHARS = 256
+_NO_ITEM = object()
+# Python 3.12+: tasks run synchronously until their first await, skipping a scheduler round trip
+# for the many short-lived tasks a graph run creates. None on older runtimes (deploy is 3.10).
+_EAGER_TASK_FACTORY = getattr(asyncio, "eager_task_factory", None)
+# The sync wrapper owns its loop, so it can use uvloop's faster I/O and callback scheduling.
+_new_event_loop = uvloop.new_event_loop if uvloop is not None else asyncio.new_event_loop
+# Chunks buffered between the sync wrapper's loop thread and its consumer.
+_SYNC_QUEUE_MAXSIZE = 32
+# Trailing chat messages handed to the graph; nodes read at most the last few turns.
+_HISTORY_WINDOW = 12
+
+
+def _is_relevancy_line(line: str) -> bool:
+    return ("Relevanssi:" in line or "Relevancy:" in line) and "/5" in line
+
+
+# A whole line (with its newline) that satisfies _is_relevancy_line, in either order.
+_RELEVANCY_LINE_RE = re.compile(r"^(?=[^\n]*(?:Relevanssi|Relevancy):)(?=[^\n]*/5)[^\n]*\n?", re.MULTILINE)
+
 
 def _strip_relevancy_line(text: str) -> str:
     """Remove any trailing relevancy score line so it is never shown to the user."""
     if not text:
         return text
-    lines = text.split("\n")
-    out = []
-    for line in lines:
-        if ("Relevanssi:" in line or "Relevancy:" in line) and ("/5" in line or "5/5" in line):
-            continue
-        out.append(line)
-    return "\n".join(out).rstrip()
+    if "Relevanssi:" not in text and "Relevancy:" not in text:
+        return text.rstrip()
+    return _RELEVANCY_LINE_RE.sub("", text).rstrip()
+
+
+class _RelevancyLineFilter:
+    """Streaming counterpart of _strip_relevancy_line for token chunks.
+
+    Text is passed through as soon as it arrives; only a line that starts like a
+    relevancy score line is held back until its newline decides whether to drop it.
+    """
+
+    __slots__ = ("_held", "_line_open")
+
+    def __init__(self) -> None:
+        self._held = ""
+        self._line_open = False  # current line already (partly) emitted
+
+    def feed(self, chunk: str) -> str:
+        out: list[str] = []
+        text = self._held + chunk
+        self._held = ""
+        while text:
+            line, sep, rest = text.partition("\n")
+            if self._line_open:
+                out.append(line + sep)
+                self._line_open = not sep
+            elif not sep:
+                stripped = line.lstrip()
+                if any(p.startswith(stripped) or stripped.startswith(p) for p in _RELEVANCY_PREFIXES):
+                    self._held = line
+                else:
+                    out.append(line)
+                    self._line_open = True
+            elif not _is_relevancy_line(line):
+                out.append(line + sep)
+            text = rest
+        return "".join(out)
+
+    def flush(self) -> str:
+        held, self._held = self._held, ""
+        self._line_open = False
+        return "" if _is_relevancy_line(held) else held
 
 
 def _resolve_query_params(
@@ -58,7 +132,9 @@ def _update_metadata_sink(sink: dict | None, value: dict) -> None:
     if sink is None or not isinstance(value, dict):
         return
     if "search_results" in value:
-        sink["search_results"] = value["search_results"]
+        # The sink is kept in session state per message for the source cards, which only read
+        # metadata; keeping the chunk texts would pin every answer's context for the whole session.
+        sink["search_results"] = [{"metadata": r.get("metadata") or {}} for r in value["search_results"] or []]
     if value.get("relevancy_score") is not None:
         sink["relevancy_score"] = value["relevancy_score"]
     if value.get("relevancy_reason") is not None:
@@ -67,42 +143,94 @@ def _update_metadata_sink(sink: dict | None, value: dict) -> None:
         sink["retrieval_metadata"] = value["retrieval_metadata"]
 
 
+def _history_window(chat_history: Sequence[dict] | None) -> tuple[dict, ...]:
+    """The last _HISTORY_WINDOW messages as a tuple; slices only when the history is longer."""
+    if not chat_history:
+        return ()
+    if len(chat_history) > _HISTORY_WINDOW:
+        chat_history = chat_history[-_HISTORY_WINDOW:]
+    return tuple(chat_history)  # a tuple is returned as-is
+
+
 def _build_initial_state(
     effective_query: str,
     year_start: int | None,
     year_end: int | None,
     year_clarification_answered: bool,
-    chat_history: list[dict] | None,
-    stream_queue: asyncio.Queue[str | None],
+    chat_history: Sequence[dict] | None,
+    stream_queue: asyncio.Queue[StreamItem],
     response_lang: str,
     court_types: list[str] | None = None,
     legal_domains: list[str] | None = None,
     tenant_id: str | None = None,
+    bypass_response_cache: bool = False,
 ) -> AgentState:
     """Build initial agent state for the graph."""
+    return new_agent_state(
+        query=effective_query,
+        messages=_history_window(chat_history),
+        original_query=effective_query,
+        response_lang=response_lang,
+        year_start=year_start,
+        year_end=year_end,
+        year_clarification_answered=year_clarification_answered,
+        stream_queue=stream_queue,
+        court_types=court_types,
+        legal_domains=legal_domains,
+        tenant_id=tenant_id,
+        bypass_response_cache=bypass_response_cache,
+    )
+
+
+@lru_cache(maxsize=8)
+def _status_messages(lang: str) -> dict[str, str]:
+    """Progress lines shown for analyze/search events, translated once per language."""
     return {
-        "query": effective_query,
-        "messages": chat_history[-12:] if chat_history else [],
-        "stage": "init",
-        "search_attempts": 0,
-        "original_query": effective_query,
-        "intent": "",
-        "search_results": [],
-        "response": "",
-        "relevancy_score": None,
-        "relevancy_reason": None,
-        "error": None,
-        "response_lang": response_lang,
-        "year_start": year_start,
-        "year_end": year_end,
-        "year_clarification_answered": year_clarification_answered,
-        "stream_queue": stream_queue,
-        "court_types": court_types,
-        "legal_domains": legal_domains,
-        "tenant_id": tenant_id,
+        "analyze": f"\U0001f914 {t('stream_analyzing', lang)}\n\n",
+        "search": f"\U0001f50d {t('stream_searching', lang)}\n\n",
     }
 
 
+# Event handlers take (key, value, lang, streamed_response) and return (yield_value, should_break).
+EventHandler = Callable[[str, dict, str, bool], tuple[str | None, bool]]
+
+
+def _on_done(key: str, value: dict, lang: str, streamed_response: bool) -> tuple[str | None, bool]:
+    return None, True
+
+
+def _on_status(key: str, value: dict, lang: str, streamed_response: bool) -> tuple[str | None, bool]:
+    return _status_messages(lang)[key], False
+
+
+def _on_text(key: str, value: dict, lang: str, streamed_response: bool) -> tuple[str | None, bool]:
+    return _strip_relevancy_line(value.get("response", "")) or None, False
+
+
+def _on_respond(key: str, value: dict, lang: str, streamed_response: bool) -> tuple[str | None, bool]:
+    # A streamed answer has already been shown chunk by chunk.
+    if streamed_response:
+        return None, False
+    return _on_text(key, value, lang, streamed_response)
+
+
+def _on_error(key: str, value: dict, lang: str, streamed_response: bool) -> tuple[str | None, bool]:
+    return f"\u274c {t('stream_error', lang, error=value.get('error'))}", False
+
+
+# Graph events that produce UI output; any other node ("reformulate", ...) yields nothing.
+_EVENT_HANDLERS: dict[str, EventHandler] = {
+    "_done": _on_done,
+    "analyze": _on_status,
+    "search": _on_status,
+    "clarify": _on_text,
+    "clarify_year": _on_text,
+    "chat": _on_text,
+    "respond": _on_respond,
+    "error": _on_error,
+}
+
+
 def _yield_for_event(
     key: str,
     value: dict,
@@ -113,73 +241,62 @@ def _yield_for_event(
     Process a graph event and return (yield_value, should_break).
     yield_value is None if nothing to yield; should_break is True for _done.
     """
-    handlers: dict[str, tuple[str | None, bool]] = {
-        "_done": (None, True),
-        "analyze": (f"\U0001f914 {t('stream_analyzing', lang)}\n\n", False),
-        "search": (f"\U0001f50d {t('stream_searching', lang)}\n\n", False),
-        "reformulate": (None, False),
-    }
-    if key in handlers:
-        return handlers[key]
-    if key in {"clarify", "clarify_year", "chat"}:
-        resp = _strip_relevancy_line(value.get("response", ""))
-        return (resp if resp else None), False
-    if key == "respond" and not streamed_response:
-        resp = _strip_relevancy_line(value.get("response", ""))
-        return (resp if resp else None), False
-    if key == "error":
-        return f"\u274c {t('stream_error', lang, error=value.get('error'))}", False
-    return None, False
+    handler = _EVENT_HANDLERS.get(key)
+    if handler is None:
+        return None, False
+    return handler(key, value, lang, streamed_response)
 
 
 async def _stream_loop(
-    events_queue: asyncio.Queue[tuple[str, dict]],
-    stream_queue: asyncio.Queue[str | None],
+    stream_queue: asyncio.Queue[StreamItem],
     lang: str,
 ) -> AsyncIterator[str]:
-    """Main stream loop: wait for events or chunks, yield UI updates and response."""
+    """Main stream loop: yield UI updates and response text in the order they were queued.
+
+    Graph events ((key, value) tuples) and answer chunks (str; None ends an answer) share one
+    queue, so each item is a single ``get`` and chunks always precede the event of the node
+    that produced them.
+    """
     streamed_response = False
+    relevancy_filter = _RelevancyLineFilter()
+    held: object = _NO_ITEM  # non-text item taken off the queue while coalescing
     while True:
-        event_result: list[tuple[str, dict]] = []
-        queue_result: list[str | None] = []
-
-        async def get_event(ev_result: list = event_result) -> None:
-            key, val = await events_queue.get()
-            ev_result.append((key, val))
-
-        async def get_chunk(q_result: list = queue_result) -> None:
-            chunk = await stream_queue.get()
-            q_result.append(chunk)
-
-        get_event_task = asyncio.create_task(get_event())
-        get_chunk_task = asyncio.create_task(get_chunk())
-
-        done, _ = await asyncio.wait(
-            [get_event_task, get_chunk_task],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-
-        if get_chunk_task in done:
-            get_event_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await get_event_task
-            if event_result:
-                await events_queue.put(event_result[0])
-            chunk = queue_result[0]
-            if chunk is None:
-                continue
-            streamed_response = True
-            yield chunk
+        if held is _NO_ITEM:
+            item = await stream_queue.get()
         else:
-            get_chunk_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await get_chunk_task
-            key, value = event_result[0]
+            item, held = held, _NO_ITEM
+        if isinstance(item, tuple):
+            key, value = item
             yield_val, should_break = _yield_for_event(key, value, lang, streamed_response)
             if should_break:
                 break
             if yield_val:
                 yield yield_val
+        elif item is None:
+            tail = relevancy_filter.flush()
+            if tail:
+                yield tail
+        else:
+            streamed_response = True
+            # Only chunks that are already queued are joined: no added latency when the consumer keeps up.
+            while len(item) < _COALESCE_MAX_CHARS and not stream_queue.empty():
+                queued = stream_queue.get_nowait()
+                if not isinstance(queued, str):
+                    held = queued
+                    break
+                item += queued
+            visible = relevancy_filter.feed(item)
+            if visible:
+                yield visible
+
+
+def _rejection_message(user_query: str, lang: str) -> str | None:
+    """Message for a query answered without running the graph (too long or blank), else None."""
+    if len(user_query) > config.MAX_QUERY_LENGTH:
+        return f"\u26a0\ufe0f {t('query_too_long', lang, max=config.MAX_QUERY_LENGTH)}"
+    if not user_query.strip():
+        return t("query_empty", lang)
+    return None
 
 
 async def stream_query_response(
@@ -192,6 +309,7 @@ async def stream_query_response(
     legal_domains: list[str] | None = None,
     tenant_id: str | None = None,
     metadata_sink: dict | None = None,
+    bypass_response_cache: bool = False,
 ) -> AsyncIterator[str]:
     """
     Stream response from agent.
@@ -204,12 +322,14 @@ async def stream_query_response(
         court_types: Optional list of court type filters (e.g. ["KKO", "KHO"])
         legal_domains: Optional list of legal domain filters
         tenant_id: Optional tenant ID for multi-tenant document isolation
+        bypass_response_cache: Generate a fresh answer even if one is cached (UI "Regenerate")
 
     Yields:
         Response chunks as they're generated
     """
-    if len(user_query) > config.MAX_QUERY_LENGTH:
-        yield f"\u26a0\ufe0f {t('query_too_long', lang, max=config.MAX_QUERY_LENGTH)}"
+    rejection = _rejection_message(user_query, lang)
+    if rejection is not None:
+        yield rejection
         return
 
     effective_query, year_start, year_end, year_clarification_answered = _resolve_query_params(
@@ -218,7 +338,10 @@ async def stream_query_response(
 
     response_lang = _resolve_response_lang(user_query, lang, effective_query)
 
-    stream_queue: asyncio.Queue[str | None] = asyncio.Queue()
+    # Answer chunks from reason_legal and graph events from _run_graph, in arrival order.
+    # Unbounded, so producers use put_nowait (no coroutine per item). Not pooled across calls:
+    # an asyncio.Queue binds to the loop that first uses it, and the sync wrapper runs a new loop per call.
+    stream_queue: asyncio.Queue[StreamItem] = asyncio.Queue()
     initial_state = _build_initial_state(
         effective_query,
         year_start,
@@ -230,28 +353,35 @@ async def stream_query_response(
         court_types=court_types,
         legal_domains=legal_domains,
         tenant_id=tenant_id,
+        bypass_response_cache=bypass_response_cache,
     )
 
-    events_queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+    # Tasks nodes start in the background (relevancy scoring, speculative rewrite); cancelled with the graph.
+    background_tasks: list[asyncio.Task] = []
 
     async def _run_graph() -> None:
         try:
+            # stream_mode="updates" (no subgraphs) always yields {node_name: node_update}.
             async for event in agent_graph.astream(initial_state, stream_mode="updates"):
-                payload = event[-1] if isinstance(event, tuple) else event
-                if not isinstance(payload, dict):
-                    continue
-                for key, value in payload.items():
+                for key, value in event.items():
+                    if isinstance(value, dict):
+                        background_tasks.extend(
+                            task
+                            for task in (value.get("relevancy_task"), value.get("reformulate_task"))
+                            if isinstance(task, asyncio.Task)
+                        )
                     _update_metadata_sink(metadata_sink, value if isinstance(value, dict) else {})
-                    await events_queue.put((key, value))
-            await events_queue.put(("_done", {}))
+                    stream_queue.put_nowait((key, value))
         except Exception as e:
             logger.error("Graph error: %s", e)
-            await events_queue.put(("error", {"error": str(e)}))
+            stream_queue.put_nowait(("error", {"error": str(e)}))
+        # Also after an error: _stream_loop only stops on _done.
+        stream_queue.put_nowait(("_done", {}))
 
     graph_task = asyncio.create_task(_run_graph())
 
     try:
-        async for chunk in _stream_loop(events_queue, stream_queue, lang):
+        async for chunk in _stream_loop(stream_queue, lang):
             yield chunk
         await graph_task
     except Exception as e:
@@ -261,9 +391,10 @@ async def stream_query_response(
         try:
             if not graph_task.done():
                 graph_task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await graph_task
-            await asyncio.sleep(0.2)
+                # wait() returns once the task is done without re-raising its CancelledError.
+                await asyncio.wait((graph_task,))
+            for task in background_tasks:
+                task.cancel()
         except RuntimeError:
             pass
         logger.debug("Stream finished.")
@@ -279,6 +410,7 @@ def stream_query_response_sync(
     legal_domains: list[str] | None = None,
     tenant_id: str | None = None,
     metadata_sink: dict | None = None,
+    bypass_response_cache: bool = False,
 ) -> Iterator[str]:
     """
     Synchronous wrapper for stream_query_response so Streamlit can iterate
@@ -295,15 +427,42 @@ def stream_query_response_sync(
         legal_domains: Optional list of legal domain filters
         tenant_id: Multi-tenant ID for filtering documents
         metadata_sink: Dictionary to store metadata from response
+        bypass_response_cache: Generate a fresh answer even if one is cached (UI "Regenerate")
     """
-    chunk_queue: queue.Queue[str | None] = queue.Queue()
+    rejection = _rejection_message(user_query, lang)
+    if rejection is not None:
+        # Rejected before any thread or event loop is created.
+        yield rejection
+        return
 
-    def run() -> None:
-        loop = asyncio.new_event_loop()
+    # Bounded: a slow consumer (UI rendering) holds back the producer instead of buffering the answer.
+    chunk_queue: queue.Queue[str | None] = queue.Queue(maxsize=_SYNC_QUEUE_MAXSIZE)
+    consumer_gone = threading.Event()
+
+    def put_blocking(item: str | None) -> bool:
+        while not consumer_gone.is_set():
+            try:
+                chunk_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def forward(item: str | None) -> bool:
+        """Hand *item* to the consumer thread; False once the consumer has stopped reading."""
+        if consumer_gone.is_set():
+            return False
         try:
+            chunk_queue.put_nowait(item)
+            return True
+        except queue.Full:
+            # Wait for room off the loop so the graph keeps running meanwhile.
+            return await asyncio.to_thread(put_blocking, item)
 
-            async def consume() -> None:
-                async for chunk in stream_query_response(
+    async def consume() -> None:
+        try:
+            async with contextlib.aclosing(
+                stream_query_response(
                     user_query,
                     lang=lang,
                     original_query_for_year=original_query_for_year,
@@ -313,19 +472,33 @@ def stream_query_response_sync(
                     legal_domains=legal_domains,
                     tenant_id=tenant_id,
                     metadata_sink=metadata_sink,
-                ):
-                    chunk_queue.put(chunk)
-                chunk_queue.put(None)
+                    bypass_response_cache=bypass_response_cache,
+                )
+            ) as chunks:
+                async for chunk in chunks:
+                    if not await forward(chunk):
+                        break
+        finally:
+            # Also on errors, so the consumer below never waits forever.
+            await forward(None)
 
+    def run() -> None:
+        loop = _new_event_loop()
+        if _EAGER_TASK_FACTORY is not None:
+            loop.set_task_factory(_EAGER_TASK_FACTORY)
+        try:
             loop.run_until_complete(consume())
         finally:
             loop.close()
 
     thread = threading.Thread(target=run, daemon=True)
     thread.start()
-    while True:
-        chunk = chunk_queue.get()
-        if chunk is None:
-            break
-        yield chunk
+    try:
+        while True:
+            chunk = chunk_queue.get()
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        consumer_gone.set()
     thread.join(timeout=1.0)
@@ -1,5 +1,7 @@
+import asyncio
 import sys
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -51,6 +53,12 @@ class IngestResponse(BaseModel):
     results: list[dict[str, Any]]
 
 
+@lru_cache(maxsize=1)
+def _get_service() -> FinlexIngestionService:
+    """Shared ingestion service: one Supabase/OpenAI/HTTP client set for all requests."""
+    return FinlexIngestionService()
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -62,8 +70,7 @@ async def ingest_documents(request: IngestRequest):
     - **documents**: List of documents with individual URIs and status
     - **year**: Year to fetch if no documents provided
     """
-    # Initialize Service
-    service = FinlexIngestionService()
+    service = _get_service()
 
     # Get list of documents to process
     if not request.documents:
@@ -115,12 +122,11 @@ async def retry_failed_documents(request: RetryRequest):
 
     - **max_retries**: Maximum number of retries allowed (default: 3)
     """
-    # Initialize service
-    service = FinlexIngestionService()
+    service = _get_service()
 
     # Get failed docs with retry_count < max_retries
-    failed_docs_response = (
-        service.storage.client.table("failed_documents").select("*").lt("retry_count", request.max_retries).execute()
+    failed_docs_response = await asyncio.to_thread(
+        service.storage.client.table("failed_documents").select("*").lt("retry_count", request.max_retries).execute
     )
 
     if not failed_docs_response.data:
@@ -186,9 +192,12 @@ async def retry_failed_documents(request: RetryRequest):
             # FAILURE: Increment retry count manually if service blew up
             new_retry_count = doc.get("retry_count", 0) + 1
 
-            service.storage.client.table("failed_documents").update(
-                {"retry_count": new_retry_count, "last_retry_at": "now()", "error_message": error_msg}
-            ).eq("document_uri", document_uri).execute()
+            await asyncio.to_thread(
+                service.storage.client.table("failed_documents")
+                .update({"retry_count": new_retry_count, "last_retry_at": "now()", "error_message": error_msg})
+                .eq("document_uri", document_uri)
+                .execute
+            )
 
             results.append(
                 {
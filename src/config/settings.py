@@ -51,6 +51,9 @@ class Config:
         "1",
         "yes",
     )
+    # false: score relevancy with the Cohere reranker (~0.2s, no LLM call, topicality only) instead of
+    # the LLM judge, which also checks that cited sources are used correctly (~2-5s).
+    RELEVANCY_USE_LLM: bool = (os.getenv("RELEVANCY_USE_LLM", "true")).strip().lower() in ("true", "1", "yes")
 
     # Multi-query expansion: generate alternative queries via LLM to improve recall.
     # Set to "false" to disable (saves 1 LLM call + 2 hybrid searches; uses single hybrid search).
@@ -66,6 +69,13 @@ class Config:
     # Reformulate: when search returns 0 results, rewrite query and retry (up to 2 attempts).
     # Set to "false" to skip reformulation and go straight to "I couldn't find" apology.
     REFORMULATE_ENABLED: bool = (os.getenv("REFORMULATE_ENABLED", "true")).strip().lower() in ("true", "1", "yes")
+    # Start the rewrite LLM call alongside the first search, so a zero-result search goes
+    # straight to the retry. Costs one small support-LLM call on searches that do find results.
+    SPECULATIVE_REFORMULATE: bool = (os.getenv("SPECULATIVE_REFORMULATE", "false")).strip().lower() in (
+        "true",
+        "1",
+        "yes",
+    )
 
     # When true: ask for year range when user's legal query has no case ID and no year specified.
     # Set to "false" to skip and search all years.
@@ -83,6 +93,16 @@ class Config:
     LLM_MAX_TOKENS: int = int(os.getenv("LLM_MAX_TOKENS", "4000"))
     # Timeout for LLM requests (seconds).
     LLM_REQUEST_TIMEOUT: int = int(os.getenv("LLM_REQUEST_TIMEOUT", "90"))
+    # Wall-clock caps (retries included) for support-LLM calls on the request path. On timeout the
+    # node uses its fallback (legal_search intent, original query, canned reply) instead of stalling.
+    INTENT_LLM_TIMEOUT_SECONDS: float = float(os.getenv("INTENT_LLM_TIMEOUT_SECONDS", "2.5"))
+    REFORMULATE_LLM_TIMEOUT_SECONDS: float = float(os.getenv("REFORMULATE_LLM_TIMEOUT_SECONDS", "4"))
+    CHAT_LLM_TIMEOUT_SECONDS: float = float(os.getenv("CHAT_LLM_TIMEOUT_SECONDS", "8"))
+    # Max answer generations in flight per process (all sessions). Extra requests wait for a
+    # slot instead of bursting into OpenAI rate limits (429 -> backoff -> worse p99).
+    MAX_CONCURRENT_LLM_CALLS: int = int(os.getenv("MAX_CONCURRENT_LLM_CALLS", "16"))
+    # Max background relevancy checks in flight per process; they share the support model's rate limit.
+    MAX_CONCURRENT_RELEVANCY_CHECKS: int = int(os.getenv("MAX_CONCURRENT_RELEVANCY_CHECKS", "8"))
 
     # Ingestion pipeline (extraction/chunking). Default: GPT-4o for better extraction quality.
     EXTRACTION_MODEL: str = os.getenv("EXTRACTION_MODEL", "gpt-4o")
@@ -113,6 +133,34 @@ class Config:
     MAX_QUERY_LENGTH: int = int(os.getenv("MAX_QUERY_LENGTH", "2000"))
     # Per-channel timeout for hybrid search (vec, fts, meta, prefix). Increase if Supabase is slow.
     SEARCH_CHANNEL_TIMEOUT_SECONDS: float = float(os.getenv("SEARCH_CHANNEL_TIMEOUT_SECONDS", "45"))
+    # In-process cache of reranked search results per (normalized query, filters, tenant).
+    # Repeated questions skip DB + rerank round trips. Set TTL to 0 to disable.
+    RETRIEVAL_CACHE_TTL_SECONDS: float = float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "600"))
+    RETRIEVAL_CACHE_SIZE: int = int(os.getenv("RETRIEVAL_CACHE_SIZE", "256"))
+    # Cache of final answers for first-turn questions (same key as the retrieval cache).
+    # An identical question skips the generation call entirely. Set TTL to 0 to disable.
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "900"))
+    # Run retrieval alongside the intent LLM (result cache must be enabled). A query that turns
+    # out to be chat/clarification wastes one search; a legal one saves the intent LLM latency.
+    SPECULATIVE_SEARCH_ENABLED: bool = (os.getenv("SPECULATIVE_SEARCH_ENABLED", "true")).strip().lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+    # Window (ms) in which concurrent intent LLM calls on one event loop are merged into one
+    # request. 0 = off (Streamlit runs one question per loop, so batching only adds delay there).
+    INTENT_BATCH_WINDOW_MS: float = float(os.getenv("INTENT_BATCH_WINDOW_MS", "0"))
+    # Same for the zero-result query reformulation call.
+    REFORMULATE_BATCH_WINDOW_MS: float = float(os.getenv("REFORMULATE_BATCH_WINDOW_MS", "0"))
+    # Hedged intent calls: if the intent LLM has not answered after this many ms, send a second
+    # identical request and use whichever returns first. 0 = off (hedged calls cost extra tokens).
+    INTENT_HEDGE_MS: float = float(os.getenv("INTENT_HEDGE_MS", "0"))
+    # Classify a single query with a one-token A/B/C answer read from its log-probs. Set to false
+    # for support models without logprobs support; the full-label text answer is used instead.
+    INTENT_LOGPROBS: bool = (os.getenv("INTENT_LOGPROBS", "true")).strip().lower() in ("true", "1", "yes")
+    # Open retrieval clients (Cohere, OpenAI embeddings, Supabase in the CLI) at startup
+    # so the first question does not pay TLS handshakes. Costs one tiny embedding (+ rerank) call.
+    AGENT_WARMUP: bool = (os.getenv("AGENT_WARMUP", "false")).strip().lower() in ("true", "1", "yes")
 
     # Document Upload Limits (client document ingestion)
     MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
@@ -198,6 +246,9 @@ def _validate_numeric_ranges() -> list[str]:
         "CHUNKS_TO_LLM": config.CHUNKS_TO_LLM,
         "LLM_MAX_TOKENS": config.LLM_MAX_TOKENS,
         "LLM_REQUEST_TIMEOUT": config.LLM_REQUEST_TIMEOUT,
+        "INTENT_LLM_TIMEOUT_SECONDS": config.INTENT_LLM_TIMEOUT_SECONDS,
+        "REFORMULATE_LLM_TIMEOUT_SECONDS": config.REFORMULATE_LLM_TIMEOUT_SECONDS,
+        "CHAT_LLM_TIMEOUT_SECONDS": config.CHAT_LLM_TIMEOUT_SECONDS,
         "EMBEDDING_DIMENSIONS": config.EMBEDDING_DIMENSIONS,
         "MAX_QUERY_LENGTH": config.MAX_QUERY_LENGTH,
         "MAX_UPLOAD_SIZE_MB": config.MAX_UPLOAD_SIZE_MB,
@@ -208,6 +259,22 @@ def _validate_numeric_ranges() -> list[str]:
             errors.append(f"{name}={value} must be > 0.")
     if config.CHUNK_OVERLAP < 0:
         errors.append(f"CHUNK_OVERLAP={config.CHUNK_OVERLAP} must be >= 0.")
+    if config.RETRIEVAL_CACHE_TTL_SECONDS < 0:
+        errors.append(f"RETRIEVAL_CACHE_TTL_SECONDS={config.RETRIEVAL_CACHE_TTL_SECONDS} must be >= 0.")
+    if config.RESPONSE_CACHE_TTL_SECONDS < 0:
+        errors.append(f"RESPONSE_CACHE_TTL_SECONDS={config.RESPONSE_CACHE_TTL_SECONDS} must be >= 0.")
+    if config.RETRIEVAL_CACHE_SIZE < 0:
+        errors.append(f"RETRIEVAL_CACHE_SIZE={config.RETRIEVAL_CACHE_SIZE} must be >= 0.")
+    if config.MAX_CONCURRENT_LLM_CALLS < 1:
+        errors.append(f"MAX_CONCURRENT_LLM_CALLS={config.MAX_CONCURRENT_LLM_CALLS} must be >= 1.")
+    if config.MAX_CONCURRENT_RELEVANCY_CHECKS < 1:
+        errors.append(f"MAX_CONCURRENT_RELEVANCY_CHECKS={config.MAX_CONCURRENT_RELEVANCY_CHECKS} must be >= 1.")
+    if config.INTENT_BATCH_WINDOW_MS < 0:
+        errors.append(f"INTENT_BATCH_WINDOW_MS={config.INTENT_BATCH_WINDOW_MS} must be >= 0.")
+    if config.INTENT_HEDGE_MS < 0:
+        errors.append(f"INTENT_HEDGE_MS={config.INTENT_HEDGE_MS} must be >= 0.")
+    if config.REFORMULATE_BATCH_WINDOW_MS < 0:
+        errors.append(f"REFORMULATE_BATCH_WINDOW_MS={config.REFORMULATE_BATCH_WINDOW_MS} must be >= 0.")
     if config.CHUNK_MIN_SIZE >= config.CHUNK_SIZE:
         errors.append(f"CHUNK_MIN_SIZE={config.CHUNK_MIN_SIZE} must be < CHUNK_SIZE={config.CHUNK_SIZE}.")
     return errors
@@ -28,6 +28,7 @@ TRANSLATIONS = {
         "error_search_timeout": "Search timed out. The server may be busy. Please try again.",
         "error_search_api": "Search failed due to an external service error. Please try again later.",
         "query_too_long": "Query too long (max {max} characters). Please shorten your question.",
+        "query_empty": "Please enter a question.",
         "year_clarification": "Which years' court decisions would you like to search? Specify a range (e.g. 2010\u20132020) or say 'all' for no filter.",
         "templates_heading": "Example questions",
         "templates_hint": "Click to add to input field \u2014 edit, then press Enter to search.",
@@ -165,6 +166,7 @@ TRANSLATIONS = {
         "error_search_timeout": "Hakutimeutuksen aikakatkaisu. Palvelin voi olla kuormitettu. Yritä uudelleen.",
         "error_search_api": "Hakutiedustelu epäonnistui ulkoisen palvelun virheen vuoksi. Yritä myöhemmin uudelleen.",
         "query_too_long": "Kysymys on liian pitkä (max {max} merkkiä). Lyhennä kysymystäsi.",
+        "query_empty": "Kirjoita kysymys.",
         "year_clarification": "Miltä vuosiluvuilta etsit tuomioistuimen päätöksiä? Anna väli (esim. 2010–2020) tai sano 'kaikki' ilman rajoitusta.",
         "templates_heading": "Esimerkkikysymykset",
         "templates_hint": "Klikkaa lis\u00e4t\u00e4ksesi sy\u00f6tt\u00f6kentt\u00e4\u00e4n \u2014 muokkaa ja paina Enter.",
@@ -301,6 +303,7 @@ TRANSLATIONS = {
         "error_search_timeout": "Sökningen tog slut på tiden. Servern kan vara upptagen. Försök igen.",
         "error_search_api": "Sökningen misslyckades på grund av ett externt tjänstfel. Försök igen senare.",
         "query_too_long": "Frågan är för lång (max {max} tecken). Förkorta din fråga.",
+        "query_empty": "Skriv en fråga.",
         "year_clarification": "Vilka år vill du söka domstolsbeslut från? Ange ett intervall (t.ex. 2010–2020) eller säg 'allt' utan filter.",
         "templates_heading": "Exempelfrågor",
         "templates_hint": "Klicka för att lägga till i fältet — redigera och tryck Enter.",
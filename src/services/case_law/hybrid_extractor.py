@@ -3,9 +3,9 @@ Hybrid precedent extractor: regex first, LLM fallback (model from config.EXTRACT
 Ensures no empty sections and no missing chunks; returns CaseExtractionResult.
 """
 
-import json
 import os
 
+import orjson
 from openai import OpenAI
 
 from src.config.logging_config import setup_logger
@@ -146,7 +146,7 @@ def _call_llm_for_sections(full_text: str, case_id: str) -> list[CaseSection]:
         if raw.startswith("```"):
             raw = raw.split("\n", 1)[-1] if "\n" in raw else raw
             raw = raw.replace("```json", "").replace("```", "").strip()
-        arr = json.loads(raw)
+        arr = orjson.loads(raw)
         sections: list[CaseSection] = []
         for item in arr if isinstance(arr, list) else []:
             if not isinstance(item, dict):
@@ -159,7 +159,7 @@ def _call_llm_for_sections(full_text: str, case_id: str) -> list[CaseSection]:
             if content:
                 sections.append(CaseSection(type=sec_type, title=title, content=content))
         return sections
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning("%s | LLM invalid JSON: %s", case_id, e)
         return []
     except Exception as e:
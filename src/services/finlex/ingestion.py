@@ -1,9 +1,11 @@
 """
 Finlex Ingestion Service
 Centralizes logic for fetching, parsing, chunking, embedding, and storing Finlex documents.
-Used by both the REST API (ingest.py) and the Bulk Ingestion Script (bulk_ingest.py).
+Used by both the REST API (ingest.py) and bulk ingestion (bulk.py).
 """
 
+import asyncio
+import contextlib
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
@@ -18,6 +20,27 @@ from src.services.finlex.xml_parser import XMLParser
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses / PostgREST codes that mean the credentials or config are wrong:
+# every following document would fail the same way, so retrying is pointless.
+_FATAL_STATUS_CODES = frozenset({401, 403})
+_FATAL_POSTGREST_CODES = frozenset({"401", "403", "PGRST301", "PGRST302"})
+# Chunks per embedding request (DocumentEmbedder's own batch size); also the upsert unit.
+_EMBED_BATCH_SIZE = 100
+
+
+class FatalIngestionError(RuntimeError):
+    """Unrecoverable ingestion failure (auth expired, bad API key, misconfiguration)."""
+
+
+def _is_fatal_error(exc: Exception) -> bool:
+    """True for auth/config errors (OpenAI, httpx, PostgREST) that no retry can fix."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status in _FATAL_STATUS_CODES:
+        return True
+    return str(getattr(exc, "code", "") or "") in _FATAL_POSTGREST_CODES
+
 
 class FinlexIngestionService:
     def __init__(self):
@@ -85,16 +108,22 @@ class FinlexIngestionService:
     ) -> dict[str, Any]:
         """
         Process a single document through the complete ingestion pipeline.
+
+        Blocking work (Supabase calls, parsing, PDF downloads, embedding) runs via
+        asyncio.to_thread so concurrent documents (bulk workers, API requests) do
+        not block the event loop.
+        Transient failures are logged to failed_documents and reported as
+        success=False; auth/config failures raise FatalIngestionError.
         """
         try:
             # 0. Check existence / clear old data
             if not force_reingest:
-                exists = (
+                exists = await asyncio.to_thread(
                     self.storage.client.table("legal_chunks")
                     .select("id")
                     .eq("document_uri", document_uri)
                     .limit(1)
-                    .execute()
+                    .execute
                 )
                 if exists.data:
                     return {
@@ -104,7 +133,9 @@ class FinlexIngestionService:
                         "chunks_stored": 0,
                     }
             else:
-                self.storage.client.table("legal_chunks").delete().eq("document_uri", document_uri).execute()
+                await asyncio.to_thread(
+                    self.storage.client.table("legal_chunks").delete().eq("document_uri", document_uri).execute
+                )
 
             # 1. Fetch & resolve metadata
             xml = await self.api.fetch_document_xml(document_uri)
@@ -112,38 +143,25 @@ class FinlexIngestionService:
                 document_uri, language, document_type, document_category, document_year
             )
 
-            # 2. Parse XML + handle PDFs
-            parsed = self.parser.parse(xml, language=language, document_uri=document_uri)
-            if parsed.get("is_pdf_only", False):
-                self._handle_pdf_only(parsed, document_uri)
-            if parsed.get("pdf_links"):
-                self._handle_embedded_pdfs(parsed, document_uri)
-
-            # 3. Chunk, embed, store
-            chunks = self.chunker.chunk_document(
-                text=parsed["text"],
-                document_uri=document_uri,
-                document_title=parsed["title"],
-                document_year=document_year,
-                document_type=document_type,
-                document_category=document_category,
-                language=language,
-                document_number=document_number,
-                sections=parsed.get("sections", []),
-                attachments=parsed.get("attachments", []),
+            # 2. Parse XML + handle PDFs, chunk (blocking: parsing, PDF downloads; run off the loop)
+            parsed, chunks = await asyncio.to_thread(
+                self._parse_and_chunk,
+                xml,
+                document_uri,
+                language,
+                document_type,
+                document_category,
+                document_year,
+                document_number,
             )
-            self._enrich_chunks_with_pdf_metadata(chunks, parsed)
-            # Phase 1: Add structured legal intelligence to chunks
-            self._enrich_chunks_with_phase1_data(chunks, parsed)
-            embedded_chunks = self.embedder.embed_chunks(chunks)
-            stored_count = self.storage.store_chunks(embedded_chunks)
 
-            # 4. Update tracking & clean failed_documents
-            self._update_tracking(document_category, document_type, document_year)
-            import contextlib
+            # 3. Embed & store, overlapping one batch's upsert with the next batch's embedding
+            stored_count = await self._embed_and_store(chunks)
 
-            with contextlib.suppress(Exception):
-                self.storage.client.table("failed_documents").delete().eq("document_uri", document_uri).execute()
+            # 4. Update tracking & clean failed_documents (one RPC)
+            await asyncio.to_thread(
+                self._finish_document, document_uri, document_category, document_type, document_year
+            )
 
             return {
                 "document_uri": document_uri,
@@ -158,10 +176,13 @@ class FinlexIngestionService:
             }
 
         except Exception as e:
+            if _is_fatal_error(e):
+                raise FatalIngestionError(f"Fatal error while processing {document_uri}: {e}") from e
             error_msg = str(e)
             logger.error("Failed to process %s: %s", document_uri, error_msg)
             try:
-                self.storage.log_failed_document(
+                await asyncio.to_thread(
+                    self.storage.log_failed_document,
                     document_uri=document_uri,
                     error_message=error_msg,
                     error_type="ingestion_error",
@@ -179,6 +200,56 @@ class FinlexIngestionService:
                 "chunks_stored": 0,
             }
 
+    def _parse_and_chunk(
+        self, xml, document_uri, language, document_type, document_category, document_year, document_number
+    ):
+        """Parse the XML (plus any PDFs) and split it into enriched chunks. Returns (parsed, chunks)."""
+        parsed = self.parser.parse(xml, language=language, document_uri=document_uri)
+        if parsed.get("is_pdf_only", False):
+            self._handle_pdf_only(parsed, document_uri)
+        if parsed.get("pdf_links"):
+            self._handle_embedded_pdfs(parsed, document_uri)
+
+        chunks = self.chunker.chunk_document(
+            text=parsed["text"],
+            document_uri=document_uri,
+            document_title=parsed["title"],
+            document_year=document_year,
+            document_type=document_type,
+            document_category=document_category,
+            language=language,
+            document_number=document_number,
+            sections=parsed.get("sections", []),
+            attachments=parsed.get("attachments", []),
+        )
+        self._enrich_chunks_with_pdf_metadata(chunks, parsed)
+        # Phase 1: Add structured legal intelligence to chunks
+        self._enrich_chunks_with_phase1_data(chunks, parsed)
+        return parsed, chunks
+
+    async def _embed_and_store(self, chunks: list) -> int:
+        """Embed and upsert *chunks* batch by batch; batch N is stored while batch N+1 is embedded."""
+        stored = 0
+        store_task: asyncio.Future | None = None
+        try:
+            for start in range(0, len(chunks), _EMBED_BATCH_SIZE):
+                embedded = await asyncio.to_thread(
+                    self.embedder.embed_chunks, chunks[start : start + _EMBED_BATCH_SIZE]
+                )
+                if store_task is not None:
+                    stored += await store_task
+                store_task = asyncio.ensure_future(asyncio.to_thread(self.storage.store_chunks, embedded))
+            if store_task is not None:
+                stored += await store_task
+                store_task = None
+        finally:
+            if store_task is not None and not store_task.done():
+                # An embedding batch failed: let the in-flight upsert finish before reporting the error.
+                await asyncio.wait((store_task,))
+                if not store_task.cancelled():
+                    store_task.exception()  # mark a failed upsert as retrieved
+        return stored
+
     def _handle_pdf_only(self, parsed, document_uri):
         pdf_filename = parsed.get("pdf_ref", "main.pdf")
         pdf_url = f"{document_uri}/{pdf_filename}"
@@ -219,6 +290,29 @@ class FinlexIngestionService:
                         {"pdf_url": result["url"], "page_count": pdf_data["page_count"], "source_type": "embedded_pdf"}
                     )
 
+    def _finish_document(self, document_uri, document_category, document_type, document_year):
+        """Count the document in ingestion_tracking and clear its failed_documents row.
+
+        Uses the finish_document_ingestion SQL function (atomic_document_tracking.sql):
+        one round trip instead of three, with an atomic increment. Falls back to the
+        step-by-step writes for deployments that haven't run the migration yet.
+        """
+        try:
+            self.storage.client.rpc(
+                "finish_document_ingestion",
+                {
+                    "p_document_uri": document_uri,
+                    "p_document_category": document_category,
+                    "p_document_type": document_type,
+                    "p_year": document_year,
+                },
+            ).execute()
+        except Exception:
+            # Fallback for deployments that haven't run the migration yet
+            self._update_tracking(document_category, document_type, document_year)
+            with contextlib.suppress(Exception):
+                self.storage.client.table("failed_documents").delete().eq("document_uri", document_uri).execute()
+
     def _update_tracking(self, document_category, document_type, document_year):
         try:
             tracking_check = (
@@ -8,12 +8,16 @@ Uses LangChain ChatOpenAI for automatic LangSmith tracing
 import os
 import time
 from collections.abc import AsyncIterator
+from functools import lru_cache
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from src.config.logging_config import setup_logger
 from src.config.settings import config  # load_dotenv() runs here
+from src.utils.http_clients import openai_async_http_client
+from src.utils.query_context import get_recent_context_for_llm
+from src.utils.retry import retry_async, retry_sync
 
 logger = setup_logger(__name__)
 
@@ -62,6 +66,28 @@ def _build_system_prompt(
     return _build_system_prompt_standard(response_language, court_types=court_types)
 
 
+@lru_cache(maxsize=32)
+def _system_message(
+    response_language: str, is_client_doc_analysis: bool, court_types: tuple[str, ...] | None
+) -> SystemMessage:
+    """The (multi-kilobyte) system prompt as a message, built once per language/mode/court filter."""
+    return SystemMessage(
+        content=_build_system_prompt(
+            response_language,
+            is_client_doc_analysis=is_client_doc_analysis,
+            court_types=list(court_types) if court_types else None,
+        )
+    )
+
+
+def _prompt_cache_key(response_language: str, is_client_doc_analysis: bool) -> str:
+    """Routing hint for OpenAI prompt caching: calls that share a system-prompt prefix share a key.
+
+    The court block is appended at the end of the prompt, so court filters share a key too.
+    """
+    return f"lexai-answer-{response_language or 'fi'}-{'client' if is_client_doc_analysis else 'standard'}"
+
+
 def _build_system_prompt_client_doc_analysis(response_language: str) -> str:
     """PHASE 3: System prompt for analyzing CLIENT DOCUMENTS vs. case law.
 
@@ -554,6 +580,7 @@ class LLMGenerator:
             max_tokens=config.LLM_MAX_TOKENS,
             api_key=os.getenv("OPENAI_API_KEY"),
             request_timeout=90,
+            http_async_client=openai_async_http_client(),
         )
         self.model = model
 
@@ -575,24 +602,21 @@ class LLMGenerator:
         """
         context = self._build_context_with_document_markers(context_chunks)
         user_content = self._build_user_content(query, context, focus_case_ids, response_language)
-        system_prompt = _build_system_prompt(
-            response_language, is_client_doc_analysis=is_client_doc_analysis, court_types=court_types
-        )
-        messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
+        messages = [
+            _system_message(response_language, is_client_doc_analysis, tuple(court_types) if court_types else None),
+            HumanMessage(content=user_content),
+        ]
 
         logger.info("Calling LLM (client_doc_analysis=%s)...", is_client_doc_analysis)
         api_start = time.time()
-        response = self._invoke_with_retry_sync(messages)
+        response = retry_sync(
+            self.llm.invoke, messages, prompt_cache_key=_prompt_cache_key(response_language, is_client_doc_analysis)
+        )
         api_elapsed = time.time() - api_start
         logger.info("LLM done in %.1fs", api_elapsed)
 
         return response.content
 
-    def _invoke_with_retry_sync(self, messages):
-        from src.utils.retry import _sync_retry_impl
-
-        return _sync_retry_impl(lambda: self.llm.invoke(messages))
-
     async def agenerate_response(
         self,
         query: str,
@@ -610,23 +634,21 @@ class LLMGenerator:
         is_client_doc_analysis: True if analyzing client documents vs. case law (PHASE 3).
         court_types: Optional list of court codes (e.g. ["KKO"], ["KHO"]) for court-aware prompting.
         """
-        from src.utils.query_context import get_recent_context_for_llm
-
         conv_context = get_recent_context_for_llm(conversation_history or [], max_turns=3) or ""
         context = self._build_context_with_document_markers(context_chunks)
         user_content = self._build_user_content(
             query, context, focus_case_ids, response_language, conversation_context=conv_context
         )
-        system_prompt = _build_system_prompt(
-            response_language, is_client_doc_analysis=is_client_doc_analysis, court_types=court_types
-        )
-        messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
+        messages = [
+            _system_message(response_language, is_client_doc_analysis, tuple(court_types) if court_types else None),
+            HumanMessage(content=user_content),
+        ]
 
         logger.info("Calling LLM (client_doc_analysis=%s)...", is_client_doc_analysis)
         api_start = time.time()
-        from src.utils.retry import _async_retry_impl
-
-        response = await _async_retry_impl(lambda: self.llm.ainvoke(messages), retries=3)
+        response = await retry_async(
+            self.llm.ainvoke, messages, prompt_cache_key=_prompt_cache_key(response_language, is_client_doc_analysis)
+        )
         api_elapsed = time.time() - api_start
         logger.info("LLM done in %.1fs", api_elapsed)
 
@@ -646,19 +668,19 @@ class LLMGenerator:
         is_client_doc_analysis: True if analyzing client documents vs. case law (PHASE 3).
         court_types: Optional list of court codes (e.g. ["KKO"], ["KHO"]) for court-aware prompting.
         """
-        from src.utils.query_context import get_recent_context_for_llm
-
         conv_context = get_recent_context_for_llm(conversation_history or [], max_turns=3) or ""
         context = self._build_context_with_document_markers(context_chunks)
         user_content = self._build_user_content(
             query, context, focus_case_ids, response_language, conversation_context=conv_context
         )
-        system_prompt = _build_system_prompt(
-            response_language, is_client_doc_analysis=is_client_doc_analysis, court_types=court_types
-        )
-        messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
+        messages = [
+            _system_message(response_language, is_client_doc_analysis, tuple(court_types) if court_types else None),
+            HumanMessage(content=user_content),
+        ]
 
-        async for chunk in self.llm.astream(messages):
+        async for chunk in self.llm.astream(
+            messages, prompt_cache_key=_prompt_cache_key(response_language, is_client_doc_analysis)
+        ):
             if chunk.content:
                 yield chunk.content
 
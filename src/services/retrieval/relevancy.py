@@ -1,16 +1,21 @@
 """
 Relevancy check for generated answers.
 Uses a compact representation (truncated answer + cited sources) to stay within LLM context limits.
+With RELEVANCY_USE_LLM=false the Cohere reranker scores the same compact text instead of an LLM judge.
 """
 
-import json
+import asyncio
 import re
+from functools import lru_cache
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from src.config.logging_config import setup_logger
 from src.config.settings import config
+from src.services.retrieval.reranker import CohereReranker
+from src.utils.http_clients import openai_async_http_client
 from src.utils.retry import retry_async
 
 logger = setup_logger(__name__)
@@ -79,6 +84,44 @@ Example: {"score": 3, "reason": "Vastaus on aiheesta, mutta ennakkotapauksen kä
 """
 
 
+_RELEVANCY_SYSTEM_MESSAGE = SystemMessage(content=RELEVANCY_SYSTEM)
+
+
+@lru_cache(maxsize=1)
+def _get_relevancy_llm() -> ChatOpenAI:
+    """Lazily built and reused, so each check does not set up a new OpenAI client."""
+    return ChatOpenAI(
+        model=config.OPENAI_SUPPORT_MODEL,
+        temperature=0,
+        max_tokens=150,
+        http_async_client=openai_async_http_client(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_relevancy_reranker() -> CohereReranker:
+    return CohereReranker()
+
+
+async def check_relevancy_with_reranker(query: str, answer: str) -> dict:
+    """
+    Cheaper relevancy check: the reranker's query/answer relevance mapped onto the 1-5 scale.
+    Judges topicality only, not whether sources are applied correctly. Same return shape as check_relevancy.
+    """
+    compact = _compact_answer(answer)
+    if not compact:
+        return {"score": 0, "reason": "Tyhjä vastaus."}
+
+    try:
+        ranked = await asyncio.to_thread(_get_relevancy_reranker().rerank, query, [{"text": compact}], 1)
+        score = 1 + round(4 * float(ranked[0]["rerank_score"]))
+    except Exception as e:
+        logger.warning("Reranker relevancy check failed: %s", e)
+        return {"score": 0, "reason": "Relevanssin tarkistus epäonnistui."}
+    logger.info("Relevancy check (reranker): score=%s", score)
+    return {"score": score, "reason": "Arvioitu hakumallilla (aiheeseen osuvuus, ei lähteiden käyttöä)."}
+
+
 async def check_relevancy(query: str, answer: str) -> dict:
     """
     Check how relevant the generated answer is to the user query.
@@ -92,25 +135,23 @@ async def check_relevancy(query: str, answer: str) -> dict:
     if not compact:
         return {"score": 0, "reason": "Tyhjä vastaus."}
 
-    llm = ChatOpenAI(model=config.OPENAI_SUPPORT_MODEL, temperature=0, max_tokens=150)
+    llm = _get_relevancy_llm()
     user_content = f"KYSYMYS:\n{query}\n\nVASTAUKSEN TIivistelmä / ote:\n{compact}"
 
     try:
-        response = await retry_async(
-            lambda: llm.ainvoke([SystemMessage(content=RELEVANCY_SYSTEM), HumanMessage(content=user_content)])
-        )
+        response = await retry_async(llm.ainvoke, [_RELEVANCY_SYSTEM_MESSAGE, HumanMessage(content=user_content)])
         text = (response.content or "").strip()
         # Allow markdown code block
         if "```" in text:
             text = re.sub(r"^```(?:json)?\s*", "", text)
             text = re.sub(r"\s*```\s*$", "", text)
-        data = json.loads(text)
+        data = orjson.loads(text)
         score = int(data.get("score", 0))
         score = max(score, 1)
         score = min(score, 5)
         reason = str(data.get("reason", "")) or "—"
         logger.info("Relevancy check: score=%s, reason=%s", score, reason[:80])
         return {"score": score, "reason": reason}
-    except (json.JSONDecodeError, Exception) as e:
+    except (orjson.JSONDecodeError, Exception) as e:
         logger.warning("Relevancy check failed: %s", e)
         return {"score": 0, "reason": "Relevanssin tarkistus epäonnistui."}
@@ -7,7 +7,10 @@ multi-query expansion, and direct case-ID lookup.
 import asyncio
 import os
 import re
+import threading
 import time
+from functools import lru_cache
+from typing import NamedTuple
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
@@ -18,8 +21,10 @@ from src.config.logging_config import setup_logger
 from src.config.settings import config  # load_dotenv() runs here
 from src.services.common.embedder import DocumentEmbedder
 from src.services.protocols import EmbeddingService
+from src.utils.http_clients import openai_async_http_client
 from src.utils.legal_glossary import expand_query_with_glossary
 from src.utils.retry import retry_async
+from src.utils.ttl_cache import TTLCache
 
 from .reranker import CohereReranker
 
@@ -199,11 +204,14 @@ _CASE_ID_RE = re.compile(
     r"\b(KKO|KHO)\s*[:\-/\s]\s*(\d{4})\s*[:\-/\s]\s*(?:(?:II|I)\s*[:\-/\s]\s*)?(\d+)\b",
     re.IGNORECASE,
 )
+# Old format with Roman numeral volume: KKO:1983-II-124
+_OLD_CASE_ID_RE = re.compile(r"\b(KKO|KHO)\s*[:\s]\s*(\d{4})\s*-\s*(I{1,2})\s*-\s*(\d+)\b", re.IGNORECASE)
 
 # EU case ID patterns
 _EU_CASE_ID_RE = re.compile(r"\b([CT])-(\d+)/(\d{2,4})\b")
 _ECLI_EU_RE = re.compile(r"\b(ECLI:EU:[CT]:\d{4}:\d+)\b")
 _ECHR_APP_RE = re.compile(r"\bapplication\s+no\.?\s*(\d+/\d{2,4})\b", re.IGNORECASE)
+_DIGIT_RE = re.compile(r"\d")
 
 _SAFE_TENANT_ID_RE = re.compile(r"^[a-zA-Z0-9_\-]+$")
 _SAFE_CASE_ID_PATTERN_RE = re.compile(r"^[A-Za-z0-9:/ \-]+$")
@@ -211,6 +219,29 @@ _SAFE_CASE_ID_PATTERN_RE = re.compile(r"^[A-Za-z0-9:/ \-]+$")
 _expansion_llm_holder: list = []  # lazy singleton; list avoids global statement
 
 
+@lru_cache(maxsize=2048)
+def _extract_case_ids_cached(query: str) -> tuple[str, ...]:
+    """Case IDs in *query*, memoized: the same query is parsed by several nodes per turn."""
+    # Every supported ID contains a digit; most queries have none and skip the five scans.
+    if not _DIGIT_RE.search(query):
+        return ()
+    ids: list[str] = []
+    # Finnish: KKO:2024:76 or KKO 2024:76
+    for court, year, number in _CASE_ID_RE.findall(query):
+        ids.append(f"{court.upper()}:{year}:{number}")
+    # Finnish old format: KKO:1983-II-124
+    for court, year, vol, number in _OLD_CASE_ID_RE.findall(query):
+        ids.append(f"{court.upper()}:{year}-{vol.upper()}-{number}")
+    # EU ECLI: ECLI:EU:C:2024:123
+    ids.extend(_ECLI_EU_RE.findall(query))
+    # CJEU/GC case numbers: C-311/18, T-123/20
+    for prefix, num, yr in _EU_CASE_ID_RE.findall(query):
+        ids.append(f"{prefix.upper()}-{num}/{yr}")
+    # ECHR application numbers: application no. 12345/06
+    ids.extend(_ECHR_APP_RE.findall(query))
+    return tuple(dict.fromkeys(ids))  # deduplicate, preserve order
+
+
 def _validate_tenant_id(tenant_id: str) -> str:
     """Validate tenant_id for use in PostgREST filter strings.
 
@@ -237,12 +268,56 @@ def _sanitise_case_id_pattern(pattern: str) -> str:
     return cleaned
 
 
+class ChunkView(NamedTuple):
+    """Read-only view of a fetched case section with attribute access.
+
+    ``text_lower`` is computed once so keyword checks over many sections do not
+    re-lowercase the text per keyword.
+    """
+
+    text: str
+    text_lower: str
+    section_type: str
+    metadata: dict
+
+    @classmethod
+    def from_chunk(cls, chunk: dict) -> "ChunkView":
+        text = chunk["text"] or ""
+        metadata = chunk["metadata"]
+        return cls(text, text.lower(), metadata["type"] or "?", metadata)
+
+
 def _get_expansion_llm():
     if not _expansion_llm_holder:
-        _expansion_llm_holder.append(ChatOpenAI(model=config.OPENAI_SUPPORT_MODEL, temperature=0.4))
+        _expansion_llm_holder.append(
+            ChatOpenAI(model=config.OPENAI_SUPPORT_MODEL, temperature=0.4, http_async_client=openai_async_http_client())
+        )
     return _expansion_llm_holder[0]
 
 
+_EXPANSION_SYSTEM_MESSAGE = SystemMessage(
+    content="""Olet suomalaisen oikeuden hakuasiantuntija. Luo kaksi vaihtoehtoista hakukyselyä.
+
+KRIITTINEN SÄÄNTÖ: Vaihtoehtoisten kyselyjen TÄYTYY koskea SAMAA oikeudellista aihetta kuin alkuperäinen kysely. ÄLÄ vaihda aihealuetta.
+
+Luo:
+1. **Lakitekninen versio**: Käytä lakipykäliä, virallisia termejä (edellytykset, soveltamisala, tunnusmerkistö, vastuu)
+2. **Tapausperusteinen versio**: Mitä tosiasiallisia tilanteita tai kysymyksiä tämä koskee?
+
+Säännöt:
+- Pidä pykäläviittaukset (esim. RL 36:1, VahKorvL 5:1)
+- Molemmat versiot TÄYTYY liittyä alkuperäisen kyselyn oikeudelliseen aiheeseen
+- Jos kysymys on "milloin/missä tapauksessa", varmista että molemmat versiot etsivät EDELLYTYKSIÄ
+- Vastaa VAIN kahdella kyselyllä, yksi per rivi
+- Älä selitä
+
+Esimerkki:
+Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
+1. VahKorvL vahingonkorvausvastuu edellytykset tuottamus syy-yhteys KKO
+2. Missä tapauksissa vahingonkorvausvelvollisuus syntyy sopimusrikkomuksessa tai sopimuksenulkoisesti"""
+)
+
+
 class HybridRetrieval:
     """
     Hybrid search combining vector similarity and full-text search
@@ -254,6 +329,7 @@ class HybridRetrieval:
     - hybrid_search: Orchestrates all methods
     - expand_query: Multi-query expansion via LLM
     - fetch_case_chunks: Direct case-ID lookup (bypasses vector search)
+    - fetch_case_chunk_views: Same lookup as ChunkView tuples (inspection tools)
     """
 
     def __init__(
@@ -281,11 +357,12 @@ class HybridRetrieval:
         if not self.url or not self.key:
             raise ValueError("Supabase URL and KEY required")
 
-        import threading
-
         self._clients: dict[int, AsyncClient] = {}
         self._thread_lock = threading.Lock()
         self.embedder: EmbeddingService = embedder or DocumentEmbedder()
+        # Query text -> embedding. Same text is embedded once across filter changes,
+        # pipeline retries and repeated questions (embedding is a network call).
+        self._embedding_cache = TTLCache(maxsize=256, ttl=config.RETRIEVAL_CACHE_TTL_SECONDS)
         self.reranker: CohereReranker | None = reranker
         self.tenant_id: str | None = tenant_id
 
@@ -315,6 +392,23 @@ class HybridRetrieval:
             self._clients[loop_id] = await create_async_client(self.url, self.key)
         return self._clients[loop_id]
 
+    async def warmup(self, connect: bool = False) -> None:
+        """Open outbound connections ahead of the first query.
+
+        Embeds a short probe (warms the shared OpenAI HTTP pool, which is not tied
+        to an event loop) and, when reranking is enabled, sends a one-document
+        rerank so the Cohere client exists and holds an open connection. Both
+        probes run concurrently in worker threads. With *connect*, also creates
+        the Supabase client for the running loop; only do that when the loop will
+        serve later queries (e.g. the CLI), since clients are kept per loop.
+        """
+        probes = [self._embed_query("warmup")]
+        if config.RERANK_ENABLED:
+            probes.append(asyncio.to_thread(lambda: self._get_reranker().rerank("warmup", [{"text": "warmup"}], 1)))
+        await asyncio.gather(*probes)
+        if connect:
+            await self._get_client()
+
     def _get_reranker(self) -> CohereReranker:
         """Lazy load reranker (only when needed)"""
         if self.reranker is None:
@@ -327,33 +421,13 @@ class HybridRetrieval:
     @staticmethod
     async def expand_query(query: str) -> list[str]:
         """Generate 2 targeted legal query variants for better recall."""
-        system_prompt = """Olet suomalaisen oikeuden hakuasiantuntija. Luo kaksi vaihtoehtoista hakukyselyä.
-
-KRIITTINEN SÄÄNTÖ: Vaihtoehtoisten kyselyjen TÄYTYY koskea SAMAA oikeudellista aihetta kuin alkuperäinen kysely. ÄLÄ vaihda aihealuetta.
-
-Luo:
-1. **Lakitekninen versio**: Käytä lakipykäliä, virallisia termejä (edellytykset, soveltamisala, tunnusmerkistö, vastuu)
-2. **Tapausperusteinen versio**: Mitä tosiasiallisia tilanteita tai kysymyksiä tämä koskee?
-
-Säännöt:
-- Pidä pykäläviittaukset (esim. RL 36:1, VahKorvL 5:1)
-- Molemmat versiot TÄYTYY liittyä alkuperäisen kyselyn oikeudelliseen aiheeseen
-- Jos kysymys on "milloin/missä tapauksessa", varmista että molemmat versiot etsivät EDELLYTYKSIÄ
-- Vastaa VAIN kahdella kyselyllä, yksi per rivi
-- Älä selitä
-
-Esimerkki:
-Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
-1. VahKorvL vahingonkorvausvastuu edellytykset tuottamus syy-yhteys KKO
-2. Missä tapauksissa vahingonkorvausvelvollisuus syntyy sopimusrikkomuksessa tai sopimuksenulkoisesti"""
         try:
             response = await retry_async(
-                lambda: _get_expansion_llm().ainvoke(
-                    [
-                        SystemMessage(content=system_prompt),
-                        HumanMessage(content=f"Alkuperäinen: {query}"),
-                    ]
-                )
+                _get_expansion_llm().ainvoke,
+                [
+                    _EXPANSION_SYSTEM_MESSAGE,
+                    HumanMessage(content=f"Alkuperäinen: {query}"),
+                ],
             )
             lines = [ln.strip().lstrip("0123456789.-) ") for ln in response.content.strip().splitlines() if ln.strip()]
             alternatives = [ln for ln in lines if ln and not _is_expansion_refusal(ln)][:2]
@@ -579,29 +653,35 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
         """
         if query is None or not isinstance(query, str):
             return []
-        ids: list[str] = []
-        # Finnish: KKO:2024:76 or KKO 2024:76
-        for court, year, number in _CASE_ID_RE.findall(query):
-            ids.append(f"{court.upper()}:{year}:{number}")
-        # Finnish old format: KKO:1983-II-124
-        old_fmt = re.findall(r"\b(KKO|KHO)\s*[:\s]\s*(\d{4})\s*-\s*(I{1,2})\s*-\s*(\d+)\b", query, re.IGNORECASE)
-        for court, year, vol, number in old_fmt:
-            ids.append(f"{court.upper()}:{year}-{vol.upper()}-{number}")
-        # EU ECLI: ECLI:EU:C:2024:123
-        for ecli in _ECLI_EU_RE.findall(query):
-            ids.append(ecli)
-        # CJEU/GC case numbers: C-311/18, T-123/20
-        for prefix, num, yr in _EU_CASE_ID_RE.findall(query):
-            ids.append(f"{prefix.upper()}-{num}/{yr}")
-        # ECHR application numbers: application no. 12345/06
-        for app_no in _ECHR_APP_RE.findall(query):
-            ids.append(app_no)
-        return list(dict.fromkeys(ids))  # deduplicate, preserve order
-
-    async def fetch_case_chunks(self, case_id: str, tenant_id: str | None = None) -> list[dict]:
+        return list(_extract_case_ids_cached(query))
+
+    @staticmethod
+    def _build_keyword_tsquery(keywords: list[str]) -> str:
+        """Build a ``websearch_to_tsquery`` OR-query from literal keywords.
+
+        Multi-word keywords are quoted so they match as phrases; empty
+        entries are dropped.  Returns an empty string when nothing remains.
+        """
+        terms: list[str] = []
+        for kw in keywords:
+            cleaned = re.sub(r"[\"'()|&!:*]", " ", kw or "")
+            cleaned = re.sub(r"\s+", " ", cleaned).strip()
+            if not cleaned:
+                continue
+            terms.append(f'"{cleaned}"' if " " in cleaned else cleaned)
+        return " OR ".join(terms)
+
+    async def fetch_case_chunks(
+        self, case_id: str, tenant_id: str | None = None, keywords: list[str] | None = None
+    ) -> list[dict]:
         """Fetch ALL chunks for a specific case_id directly from Supabase.
         This bypasses vector search entirely — guarantees we have the
-        document's content when the user references it by ID."""
+        document's content when the user references it by ID.
+
+        When *keywords* is given, only sections matching any of them are
+        returned.  The filter runs server-side against the GIN-indexed
+        ``fts_vector`` (Finnish stemming), so non-matching sections never
+        leave the database."""
         try:
             effective_tenant = tenant_id or self.tenant_id
             client = await self._get_client()
@@ -622,12 +702,18 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
                     return []
 
             case_law_id = case_law_resp.data[0]["id"]
-            response = (
-                await client.table("case_law_sections")
+            sections_query = (
+                client.table("case_law_sections")
                 .select("id, content, section_type, section_title, case_law_id")
                 .eq("case_law_id", case_law_id)
-                .execute()
             )
+            if keywords:
+                keyword_query = self._build_keyword_tsquery(keywords)
+                if keyword_query:
+                    sections_query = sections_query.text_search(
+                        "fts_vector", keyword_query, options={"config": "finnish", "type": "web_search"}
+                    )
+            response = await sections_query.order("section_number").execute()
 
             # Also get case metadata for the normalized format
             case_meta = (
@@ -678,6 +764,16 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
             logger.warning("Direct case lookup failed for %s: %s", case_id, e)
             return []
 
+    async def fetch_case_chunk_views(
+        self, case_id: str, tenant_id: str | None = None, keywords: list[str] | None = None
+    ) -> list[ChunkView]:
+        """Like fetch_case_chunks, but returns ChunkView tuples instead of dicts.
+
+        The search pipeline keeps the dict form (results are merged and
+        reranked with other channels); this is for tools that only read them."""
+        chunks = await self.fetch_case_chunks(case_id, tenant_id=tenant_id, keywords=keywords)
+        return [ChunkView.from_chunk(chunk) for chunk in chunks]
+
     # ------------------------------------------------------------------
     # Core search methods
     # ------------------------------------------------------------------
@@ -1456,6 +1552,16 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
             logger.warning("Prefix content search failed (non-critical): %s", exc)
             return []
 
+    async def _embed_query(self, query_text: str) -> list[float]:
+        """Embed *query_text* in the default executor, reusing a cached vector for identical text."""
+        cached = self._embedding_cache.get(query_text)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        embedding = await loop.run_in_executor(None, self.embedder.embed_query, query_text)
+        self._embedding_cache.set(query_text, embedding)
+        return embedding
+
     async def hybrid_search(self, query_text: str, limit: int = 20, tenant_id: str | None = None) -> list[dict]:
         """
         Hybrid Search on case_law_sections: 7 channels merged via RRF.
@@ -1500,10 +1606,9 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
                     return await _timed(coro_factory, label, timeout, retried=True)
                 raise
 
-        # Generate embedding in thread pool (non-blocking)
+        # Generate embedding in thread pool (non-blocking), reusing a cached vector for repeated text
         async def _get_embedding():
-            loop = asyncio.get_event_loop()
-            emb = await loop.run_in_executor(None, self.embedder.embed_query, query_text)
+            emb = await self._embed_query(query_text)
             logger.info("  embed: %.1fs", time.time() - t0)
             return emb
 
@@ -1562,7 +1667,14 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
         ]
 
         # Phase 2: Wait for embedding, then launch vector search (HNSW).
-        query_embedding = await embedding_task
+        # If embedding fails, cancel the text channels instead of leaving them orphaned.
+        text_tasks = [fts_task, and_fts_task, meta_task, prefix_title_task, prefix_content_task, *fallback_tasks]
+        try:
+            query_embedding = await embedding_task
+        except BaseException:
+            for task in text_tasks:
+                task.cancel()
+            raise
         vec_task = asyncio.create_task(
             _timed(
                 lambda: self.vector_search(
@@ -1572,7 +1684,7 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
             )
         )
 
-        # Wait for all parallel searches
+        # Wait for all parallel searches (channels + case-ID fallbacks in one gather)
         (
             vec_results,
             fts_results,
@@ -1580,14 +1692,9 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
             meta_results,
             prefix_title_results,
             prefix_content_results,
-        ) = await asyncio.gather(vec_task, fts_task, and_fts_task, meta_task, prefix_title_task, prefix_content_task)
-
-        # Collect case-ID fallback results
-        fallback_results: list[dict] = []
-        if fallback_tasks:
-            fallback_lists = await asyncio.gather(*fallback_tasks)
-            for fl in fallback_lists:
-                fallback_results.extend(fl)
+            *fallback_lists,
+        ) = await asyncio.gather(vec_task, *text_tasks)
+        fallback_results: list[dict] = [chunk for fl in fallback_lists for chunk in fl]
 
         t_search = time.time()
         logger.info(
@@ -1869,6 +1976,14 @@ Alkuperäinen: "KKO:n ennakkopäätökset vahingonkorvauksesta"
         # --- Step 3e: Optional legal domain filter ---
         combined = self._filter_by_legal_domain(combined, legal_domains)
 
+        # Filters removed every candidate: nothing to rerank. The agent will reformulate
+        # and search again, so skip the rerank step (and reranker client setup) entirely.
+        if not combined:
+            logger.info(
+                "No candidates left after filters (direct=%s, search=%s)", len(direct_chunks), len(search_results)
+            )
+            return []
+
         # Log retrieved candidates before rerank (for debugging relevancy)
         logger.info(
             "Retrieved %s candidates (direct=%s, search=%s):", len(combined), len(direct_chunks), len(search_results)
@@ -29,10 +29,13 @@ except Exception:
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+import asyncio
 import secrets
+import threading
 import uuid
 from datetime import datetime as _dt
 
+from src.agent.nodes import warmup
 from src.agent.stream import stream_query_response
 from src.config.logging_config import setup_logger
 from src.config.prompt_templates import get_templates_for_lang, get_workflow_categories
@@ -1133,7 +1136,7 @@ def _find_original_legal_question(chat_history: list[dict]) -> str | None:
     return None
 
 
-def _process_prompt(prompt: str) -> None:
+def _process_prompt(prompt: str, regenerate: bool = False) -> None:
     lang = _get_lang()
     chat_history = get_chat_history()
     original_query = None
@@ -1181,7 +1184,7 @@ def _process_prompt(prompt: str) -> None:
             original_query = prompt
 
     add_message("user", prompt)
-    msg_idx = len(get_chat_history())  # index for the upcoming assistant message
+    msg_idx = len(chat_history) + 1  # index for the upcoming assistant message (no second history copy)
 
     with st.chat_message("user", avatar=USER_AVATAR):
         st.write(prompt)
@@ -1212,6 +1215,7 @@ def _process_prompt(prompt: str) -> None:
                     legal_domains=legal_domains,
                     tenant_id=tenant_id,
                     metadata_sink=metadata_sink,
+                    bypass_response_cache=regenerate,
                 )
             )
         else:
@@ -1224,6 +1228,7 @@ def _process_prompt(prompt: str) -> None:
                     legal_domains=legal_domains,
                     tenant_id=tenant_id,
                     metadata_sink=metadata_sink,
+                    bypass_response_cache=regenerate,
                 )
             )
     add_message("assistant", response)
@@ -1316,8 +1321,17 @@ def _handle_drive_oauth_code() -> None:
     st.rerun()
 
 
+@st.cache_resource(show_spinner=False)
+def _warmup_agent() -> bool:
+    """Warm retrieval clients once per server process (not per session), off the render path."""
+    threading.Thread(target=lambda: asyncio.run(warmup()), name="agent-warmup", daemon=True).start()
+    return True
+
+
 def main():
     validate_env_for_app()
+    if config.AGENT_WARMUP:
+        _warmup_agent()
 
     if "lang" not in st.session_state:
         st.session_state.lang = "fi"
@@ -1400,7 +1414,7 @@ def main():
     # Handle regeneration trigger
     if st.session_state.get("regenerate_query"):
         regen_query = st.session_state.pop("regenerate_query")
-        _process_prompt(regen_query)
+        _process_prompt(regen_query, regenerate=True)
         st.session_state.scroll_to_bottom = True
         st.rerun()
 
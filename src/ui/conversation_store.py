@@ -6,9 +6,9 @@ Auto-saves after each message exchange, supports load/delete from sidebar.
 All operations are scoped to the current session user via user_id.
 """
 
-import json
 from datetime import datetime, timezone
 
+import orjson
 import streamlit as st
 
 from src.config.logging_config import setup_logger
@@ -40,7 +40,7 @@ def save_conversation(messages: list[dict], lang: str, conversation_id: str | No
             client.table("conversations").update(
                 {
                     "title": title,
-                    "messages_json": json.dumps(messages, ensure_ascii=False),
+                    "messages_json": orjson.dumps(messages).decode(),
                     "lang": lang,
                     "updated_at": datetime.now(timezone.utc).isoformat(),
                 }
@@ -51,7 +51,7 @@ def save_conversation(messages: list[dict], lang: str, conversation_id: str | No
             .insert(
                 {
                     "title": title,
-                    "messages_json": json.dumps(messages, ensure_ascii=False),
+                    "messages_json": orjson.dumps(messages).decode(),
                     "lang": lang,
                     "user_id": user_id,
                 }
@@ -104,7 +104,7 @@ def load_conversation(conversation_id: str) -> list[dict] | None:
         if result.data:
             raw = result.data[0]["messages_json"]
             if isinstance(raw, str):
-                return json.loads(raw)
+                return orjson.loads(raw)
             return raw
     except Exception as exc:
         logger.warning("Failed to load conversation %s: %s", conversation_id, exc)
@@ -7,27 +7,35 @@ last assistant response. Only generated for the most recent message
 """
 
 import os
+from functools import lru_cache
 
 import streamlit as st
 
 from src.config.translations import t
 
 
+@lru_cache(maxsize=1)
+def _get_suggestions_llm():
+    """Built once per process: a new ChatOpenAI per rerun would also open a new HTTP connection pool."""
+    from langchain_openai import ChatOpenAI
+
+    from src.config.settings import config
+
+    return ChatOpenAI(
+        model=config.OPENAI_SUPPORT_MODEL,
+        temperature=0.7,
+        max_tokens=200,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        request_timeout=config.LLM_REQUEST_TIMEOUT,
+    )
+
+
 def _generate_suggestions(query: str, response: str, lang: str) -> list[str]:
     """Call GPT-4o-mini to generate 3 follow-up questions."""
     try:
         from langchain_core.messages import HumanMessage, SystemMessage
-        from langchain_openai import ChatOpenAI
-
-        from src.config.settings import config
 
-        llm = ChatOpenAI(
-            model=config.OPENAI_SUPPORT_MODEL,
-            temperature=0.7,
-            max_tokens=200,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            request_timeout=config.LLM_REQUEST_TIMEOUT,
-        )
+        llm = _get_suggestions_llm()
 
         lang_instruction = {
             "en": "Generate exactly 3 short follow-up questions in English.",
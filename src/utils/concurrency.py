@@ -0,0 +1,68 @@
+"""
+Concurrency helpers for the query path.
+
+CrossLoopSemaphore is a process-wide concurrency limit usable from any event
+loop. asyncio.Semaphore binds to the first loop that waits on it, but Streamlit
+runs each session on its own thread and loop. This wraps a threading semaphore:
+the fast path is a non-blocking acquire, and only when the limit is reached
+does a worker thread wait for a permit.
+
+hedged() trims tail latency of short, idempotent calls by racing a second
+attempt against a slow first one.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class CrossLoopSemaphore:
+    """``async with`` limit on concurrent holders, shared across threads and event loops."""
+
+    def __init__(self, limit: int) -> None:
+        self._sem = threading.BoundedSemaphore(limit)
+
+    async def __aenter__(self) -> None:
+        if self._sem.acquire(blocking=False):
+            return
+        waiter = asyncio.ensure_future(asyncio.to_thread(self._sem.acquire))
+        try:
+            await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The thread still gets the permit eventually: hand it straight back.
+            waiter.add_done_callback(lambda _: self._sem.release())
+            raise
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._sem.release()
+
+
+async def hedged(coro_fn: Callable[..., Awaitable[T]], *args: object, delay: float, **kwargs: object) -> T:
+    """Await ``coro_fn(*args, **kwargs)``; if it is still running after *delay* seconds, start a second
+    identical call and return whichever succeeds first (the other is cancelled).
+
+    A first attempt that fails within *delay* is raised as is, without a hedge (a fast
+    failure is not a latency problem; retrying is the caller's job). Once both attempts
+    are running, a failure is only raised if the other one fails too.
+    """
+    first = asyncio.ensure_future(coro_fn(*args, **kwargs))
+    pending: set[asyncio.Future] = {first}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+        pending.add(asyncio.ensure_future(coro_fn(*args, **kwargs)))
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+    finally:
+        for attempt in pending:
+            attempt.cancel()
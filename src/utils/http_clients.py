@@ -0,0 +1,29 @@
+"""
+Shared, tuned HTTP client for LangChain ChatOpenAI instances.
+
+One pool for all support/generation LLM calls: a longer keep-alive (httpx
+default: 5 s) keeps connections open across the gaps between graph nodes, so
+later calls in a question skip the TCP + TLS handshake.
+
+HTTP/1.1 only: Streamlit sessions (and the sync stream wrapper) run on their own
+event loops, and an HTTP/2 connection multiplexes every caller over one socket
+whose locks and frame reader belong to the loop that opened it.
+"""
+
+from functools import lru_cache
+
+import httpx
+import openai
+
+from src.config.settings import config
+
+_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=30.0)
+
+
+@lru_cache(maxsize=1)
+def openai_async_http_client() -> httpx.AsyncClient:
+    """Process-wide async client for ``ChatOpenAI(http_async_client=...)``."""
+    return openai.DefaultAsyncHttpxClient(
+        limits=_LIMITS,
+        timeout=httpx.Timeout(config.LLM_REQUEST_TIMEOUT, connect=10.0),
+    )
@@ -5,7 +5,12 @@ Maps langdetect ISO 639-1 codes to our supported response languages (en, fi, sv)
 Falls back to Finnish when detection fails or returns an unsupported language.
 """
 
-from langdetect import LangDetectException, detect
+from functools import lru_cache
+
+from langdetect import DetectorFactory, LangDetectException, detect
+
+# langdetect samples randomly; a fixed seed makes the result (and so its cache) deterministic.
+DetectorFactory.seed = 0
 
 # Map langdetect codes to our response_lang codes
 _DETECT_TO_LANG = {
@@ -25,10 +30,17 @@ def detect_query_language(query: str) -> str:
     Returns one of: "en", "fi", "sv".
     Falls back to "fi" when detection fails or language is unsupported.
     """
-    if not query or len(query.strip()) < 3:
+    query = (query or "").strip()
+    if len(query) < 3:
         return "fi"
+    return _detect_cached(query)
+
+
+@lru_cache(maxsize=1024)
+def _detect_cached(query: str) -> str:
+    # Streamlit reruns and repeated questions detect the same text again; langdetect
+    # builds n-gram profiles and runs several random trials per call.
     try:
-        code = detect(query.strip())
-        return _DETECT_TO_LANG.get(code, "fi")
+        return _DETECT_TO_LANG.get(detect(query), "fi")
     except LangDetectException:
         return "fi"
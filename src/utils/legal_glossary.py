@@ -6,11 +6,12 @@ cross-lingual retrieval when users query in English or Swedish
 against mostly Finnish case-law content.
 """
 
-import json
 import re
 from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 # Path to glossary relative to project root
 _GLOSSARY_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "legal_glossary.json"
 
@@ -23,9 +24,8 @@ def _load_glossary() -> dict[str, dict[str, str]]:
         return index
 
     try:
-        with open(_GLOSSARY_PATH, encoding="utf-8") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, OSError):
+        data = orjson.loads(_GLOSSARY_PATH.read_bytes())
+    except (orjson.JSONDecodeError, OSError):
         return index
 
     terms = data.get("terms") or []
@@ -5,6 +5,9 @@ Single source of truth — imported by both nodes.py and query_context.py
 to ensure consistent legal-topic detection across the agent pipeline.
 """
 
+import re
+from collections.abc import Iterable
+
 # Tuple of lowercase substrings that signal a legal topic in any of the
 # three supported languages: English, Finnish, Swedish.
 LEGAL_TOPIC_KEYWORDS: tuple[str, ...] = (
@@ -81,3 +84,46 @@ LEGAL_TOPIC_KEYWORDS: tuple[str, ...] = (
     "invandring",
     "miljö",
 )
+
+# English does not form closed compounds, so English markers must start a word
+# ("case" should not fire on "showcase", "tax" on "syntax"). Finnish and Swedish
+# markers stay plain substrings so compounds like "työsopimus" still hit "sopimus".
+# Includes the English EU-law markers the agent adds in nodes.py.
+WORD_START_KEYWORDS: frozenset[str] = frozenset(
+    {
+        "fraud",
+        "theft",
+        "embezzlement",
+        "consequences",
+        "damages",
+        "liability",
+        "case",
+        "contract",
+        "penalty",
+        "administrative",
+        "tax",
+        "employment",
+        "civil",
+        "criminal",
+        "insurance",
+        "immigration",
+        "environment",
+        "cjeu",
+        "echr",
+        "eu law",
+        "preliminary ruling",
+        "directive",
+        "regulation",
+        "human rights",
+        "charter",
+    }
+)
+
+
+def compile_legal_topic_re(keywords: Iterable[str]) -> re.Pattern[str]:
+    """One case-insensitive alternation over *keywords*, word-start anchored where the language needs it."""
+    alternation = "|".join((r"\b" if kw in WORD_START_KEYWORDS else "") + re.escape(kw) for kw in keywords)
+    return re.compile(alternation, re.IGNORECASE)
+
+
+LEGAL_TOPIC_RE = compile_legal_topic_re(LEGAL_TOPIC_KEYWORDS)
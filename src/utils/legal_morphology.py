@@ -0,0 +1,107 @@
+"""
+Rule-based Finnish morphological expansion for zero-result query rewrites.
+
+When a search finds nothing, the agent rewrites the query by keeping its legal
+terms and adding their base forms. For common legal terms a dictionary does
+that without an LLM round trip: each query token is matched by stem (so
+inflected forms such as "osamaksukaupasta" hit "osamaksukaup") and the term's
+base form and common inflections are appended. Queries with no known term still go to the LLM.
+"""
+
+import re
+
+# Stem (lowercase prefix of every inflected form) -> base form + genitive + partitive.
+# Variants are inflections of the same term only, never a related concept: the
+# rewrite must not widen the search. Stems are long enough not to prefix unrelated
+# words ("takaus"/"takauks", not "takau", which also matches "takautuva").
+LEGAL_VARIANTS: dict[str, tuple[str, ...]] = {
+    "osamaksukaup": ("osamaksukauppa", "osamaksukaupan", "osamaksukauppaa"),
+    "vahingonkorvau": ("vahingonkorvaus", "vahingonkorvauksen", "vahingonkorvausta"),
+    "petok": ("petos", "petoksen", "petosta"),
+    "petos": ("petos", "petoksen", "petosta"),
+    "varkau": ("varkaus", "varkauden", "varkautta"),
+    "kavallu": ("kavallus", "kavalluksen", "kavallusta"),
+    "pahoinpitel": ("pahoinpitely", "pahoinpitelyn", "pahoinpitelyä"),
+    "työsopimu": ("työsopimus", "työsopimuksen", "työsopimusta"),
+    "irtisano": ("irtisanominen", "irtisanomisen", "irtisanomista"),
+    "purkami": ("purkaminen", "purkamisen", "purkamista"),
+    "vuokrasopimu": ("vuokrasopimus", "vuokrasopimuksen", "vuokrasopimusta"),
+    "kauppasopimu": ("kauppasopimus", "kauppasopimuksen", "kauppasopimusta"),
+    "takaus": ("takaus", "takauksen", "takausta"),
+    "takauks": ("takaus", "takauksen", "takausta"),
+    "panttau": ("panttaus", "panttauksen", "panttausta"),
+    "perinnö": ("perintö", "perinnön", "perintöä"),
+    "perintö": ("perintö", "perinnön", "perintöä"),
+    "testamen": ("testamentti", "testamentin", "testamenttia"),
+    "avioero": ("avioero", "avioeron", "avioeroa"),
+    "ositu": ("ositus", "osituksen", "ositusta"),
+    "elatu": ("elatus", "elatuksen", "elatusta"),
+    "huoltaju": ("huoltajuus", "huoltajuuden", "huoltajuutta"),
+    "konkurssi": ("konkurssi", "konkurssin", "konkurssia"),
+    "yrityssaneerau": ("yrityssaneeraus", "yrityssaneerauksen", "yrityssaneerausta"),
+    "vanhentumi": ("vanhentuminen", "vanhentumisen", "vanhentumista"),
+    "tuottamu": ("tuottamus", "tuottamuksen", "tuottamusta"),
+    "tahallisuu": ("tahallisuus", "tahallisuuden", "tahallisuutta"),
+    "hätävarjel": ("hätävarjelu", "hätävarjelun", "hätävarjelua"),
+    "rangaistu": ("rangaistus", "rangaistuksen", "rangaistusta"),
+    "sakko": ("sakko", "sakon", "sakkoa"),
+    "vankeu": ("vankeus", "vankeuden", "vankeutta"),
+    "rikoksenteki": ("rikoksentekijä", "rikoksentekijän", "rikoksentekijää"),
+    "kunnianlouk": ("kunnianloukkaus", "kunnianloukkauksen", "kunnianloukkausta"),
+    "verotu": ("verotus", "verotuksen", "verotusta"),
+    "veropeto": ("veropetos", "veropetoksen", "veropetosta"),
+    "kilpailukiel": ("kilpailukielto", "kilpailukiellon", "kilpailukieltoa"),
+    "tekijänoikeu": ("tekijänoikeus", "tekijänoikeuden", "tekijänoikeutta"),
+    "immateriaalioikeu": ("immateriaalioikeus", "immateriaalioikeuden", "immateriaalioikeutta"),
+    "tavaramer": ("tavaramerkki", "tavaramerkin", "tavaramerkkiä"),
+    "kuluttajansuoj": ("kuluttajansuoja", "kuluttajansuojan", "kuluttajansuojaa"),
+    "viivästy": ("viivästys", "viivästyksen", "viivästystä"),
+    "korvausvastuu": ("korvausvastuu", "korvausvastuun", "korvausvastuuta"),
+    "isännänvastuu": ("isännänvastuu", "isännänvastuun", "isännänvastuuta"),
+    "liikennevahin": ("liikennevahinko", "liikennevahingon", "liikennevahinkoa"),
+    "vakuutu": ("vakuutus", "vakuutuksen", "vakuutusta"),
+    "oikeudenkäyntikul": ("oikeudenkäyntikulut", "oikeudenkäyntikulujen", "oikeudenkäyntikuluja"),
+    "muutoksenha": ("muutoksenhaku", "muutoksenhaun", "muutoksenhakua"),
+    "valituslu": ("valituslupa", "valitusluvan", "valituslupaa"),
+    "ennakkopää": ("ennakkopäätös", "ennakkopäätöksen", "ennakkopäätöstä"),
+}
+
+# Words the LLM rewrite would drop as filler (question words, auxiliaries, English glue).
+_FILLER_WORDS = frozenset(
+    {
+        "mitä",
+        "mikä",
+        "mitkä",
+        "miten",
+        "milloin",
+        "onko",
+        "ovatko",
+        "voiko",
+        "kerro",
+        "minulle",
+        "koskien",
+        "liittyen",
+        "what",
+        "when",
+        "does",
+        "tell",
+        "about",
+        "with",
+    }
+)
+_TOKEN_RE = re.compile(r"[\wäöå§-]+", re.IGNORECASE)
+# Longest stems first, so "vahingonkorvau" wins over a shorter overlapping stem.
+_STEMS = sorted(LEGAL_VARIANTS, key=len, reverse=True)
+
+
+def expand_legal_terms(query: str) -> str:
+    """Comma-separated rewrite of *query* with variants of its known legal terms, or "" if none are known."""
+    tokens = [tok for tok in _TOKEN_RE.findall((query or "").lower()) if len(tok) > 2 and tok not in _FILLER_WORDS]
+    variants: list[str] = []
+    for token in tokens:
+        stem = next((s for s in _STEMS if token.startswith(s)), None)
+        if stem is not None:
+            variants.extend(LEGAL_VARIANTS[stem])
+    if not variants:
+        return ""
+    return ", ".join(dict.fromkeys([*tokens, *variants]))
@@ -8,7 +8,7 @@ Conversation boundary: only use recent messages to avoid stale context
 when the user has moved to a new topic.
 """
 
-from src.utils.legal_keywords import LEGAL_TOPIC_KEYWORDS
+from src.utils.legal_keywords import LEGAL_TOPIC_RE
 from src.utils.year_filter import extract_year_range
 
 # Max messages to consider when resolving context (prevents stale merge)
@@ -17,16 +17,12 @@ MAX_CONTEXT_MESSAGES = 6
 # For Case 2 (topic + year merge): only look at last N messages
 MAX_MESSAGES_FOR_YEAR_MERGE = 4
 
-# Single source: imported from src.utils.legal_keywords — covers EN, FI, SV.
-_LEGAL_TOPIC_WORDS = LEGAL_TOPIC_KEYWORDS
-
 
 def _has_legal_topic(text: str) -> bool:
     """True if text contains a legal topic keyword."""
     if not text or len(text.strip()) < 2:
         return False
-    t = text.strip().lower()
-    return any(w in t for w in _LEGAL_TOPIC_WORDS)
+    return LEGAL_TOPIC_RE.search(text) is not None
 
 
 def _is_mainly_year_range(text: str) -> bool:
@@ -5,6 +5,7 @@ Handles transient failures: rate limits, timeouts, connection errors.
 
 import asyncio
 import functools
+import random
 import time
 
 from src.config.logging_config import setup_logger
@@ -28,6 +29,11 @@ RETRYABLE_COHERE = (
 )
 
 
+def _jittered(delay: float) -> float:
+    """Sleep somewhere in [delay/2, delay] so concurrent retries after a 429 don't fire in lockstep."""
+    return delay * random.uniform(0.5, 1.0)
+
+
 def _is_retryable(exc: BaseException) -> bool:
     """Check if exception is retryable (rate limit, timeout, connection)."""
     name = type(exc).__name__
@@ -56,7 +62,7 @@ def _sync_retry_impl(
             last_exc = e
             if attempt < retries and _is_retryable(e):
                 logger.warning("Retry %s/%s after %s: %s", attempt + 1, retries, type(e).__name__, e)
-                time.sleep(delay)
+                time.sleep(_jittered(delay))
                 delay = min(delay * backoff, max_delay)
             else:
                 raise
@@ -82,7 +88,7 @@ async def _async_retry_impl(
             last_exc = e
             if attempt < retries and _is_retryable(e):
                 logger.warning("Retry %s/%s after %s: %s", attempt + 1, retries, type(e).__name__, e)
-                await asyncio.sleep(delay)
+                await asyncio.sleep(_jittered(delay))
                 delay = min(delay * backoff, max_delay)
             else:
                 raise
@@ -109,11 +115,20 @@ def with_retry(
     return decorator
 
 
-async def retry_async(coro_fn):
+def retry_sync(fn, *args, **kwargs):
+    """
+    Retry a sync call. Usage: retry_sync(client.invoke, messages)
+    (the same argument objects are reused by every attempt).
+    """
+    return _sync_retry_impl(fn, *args, **kwargs)
+
+
+async def retry_async(coro_fn, *args, **kwargs):
     """
-    Retry an async call. Usage: await retry_async(lambda: client.ainvoke(...))
+    Retry an async call. Usage: await retry_async(client.ainvoke, messages)
+    (arguments are passed through, so call sites need no lambda).
     """
-    return await _async_retry_impl(coro_fn)
+    return await _async_retry_impl(coro_fn, *args, **kwargs)
 
 
 def with_async_retry(
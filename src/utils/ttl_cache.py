@@ -0,0 +1,66 @@
+"""
+Small in-process LRU cache with per-entry expiry.
+
+Used for memoizing expensive, repeatable lookups (e.g. retrieval for a query
+that was just asked). Not shared across processes; each worker keeps its own.
+Thread-safe: Streamlit sessions run on separate threads sharing module singletons.
+"""
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+def normalize_query_key(query: str) -> str:
+    """Normalize a query for cache keys: NFC, case-folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFC", query or "").casefold().split())
+
+
+class TTLCache:
+    """LRU cache whose entries expire *ttl* seconds after being stored.
+
+    A *ttl* or *maxsize* of 0 disables the cache (get always misses, set is a no-op).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for *key*, or *default* if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store *value* under *key*, evicting the least recently used entry when full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -10,12 +10,18 @@ from langchain_openai import ChatOpenAI
 
 from src.config.logging_config import setup_logger
 from src.config.settings import config
-from src.utils.retry import retry_async, with_retry
+from src.utils.http_clients import openai_async_http_client
+from src.utils.retry import retry_async, retry_sync
 from src.utils.year_filter import extract_year_range
 
 logger = setup_logger(__name__)
 
-_llm_mini = ChatOpenAI(model=config.OPENAI_SUPPORT_MODEL, temperature=0, request_timeout=config.LLM_REQUEST_TIMEOUT)
+_llm_mini = ChatOpenAI(
+    model=config.OPENAI_SUPPORT_MODEL,
+    temperature=0,
+    request_timeout=config.LLM_REQUEST_TIMEOUT,
+    http_async_client=openai_async_http_client(),
+)
 
 # Year scope: "ask" = clarify, "all" = no filter, "specific" = use extracted range
 _YEAR_SCOPE_SYSTEM = """You interpret the user's intent regarding which years of court decisions to search.
@@ -45,6 +51,10 @@ Interpret their reply. The user may answer in English, Finnish, or Swedish. Resp
 If "specific", add a second line with the year or range as YEAR or YEAR1-YEAR2."""
 
 
+_YEAR_SCOPE_MESSAGE = SystemMessage(content=_YEAR_SCOPE_SYSTEM)
+_YEAR_REPLY_MESSAGE = SystemMessage(content=_YEAR_REPLY_SYSTEM)
+
+
 def _parse_year_from_llm_line(line: str) -> tuple[int | None, int | None]:
     """Parse YEAR or YEAR1-YEAR2 from LLM output line. Falls back to extract_year_range."""
     line = (line or "").strip()
@@ -66,7 +76,6 @@ def _parse_year_from_llm_line(line: str) -> tuple[int | None, int | None]:
     return extract_year_range(line)
 
 
-@with_retry(retries=2)
 def interpret_year_reply_sync(reply: str) -> tuple[int | None, int | None] | None:
     """
     Interpret user's reply to year clarification using LLM (sync).
@@ -77,7 +86,8 @@ def interpret_year_reply_sync(reply: str) -> tuple[int | None, int | None] | Non
     if not reply or not reply.strip():
         return None
     try:
-        response = _llm_mini.invoke([SystemMessage(content=_YEAR_REPLY_SYSTEM), HumanMessage(content=reply.strip())])
+        # Retry the call itself: a failure inside this try is turned into the regex fallback below.
+        response = retry_sync(_llm_mini.invoke, [_YEAR_REPLY_MESSAGE, HumanMessage(content=reply.strip())])
         text = (response.content or "").strip().lower()
         lines = [ln.strip().lower() for ln in text.splitlines() if ln.strip()]
         first = lines[0] if lines else ""
@@ -112,9 +122,7 @@ async def interpret_year_scope_from_query_async(query: str) -> tuple[str, int |
     if not query or not query.strip():
         return ("ask", None, None)
     try:
-        response = await retry_async(
-            lambda: _llm_mini.ainvoke([SystemMessage(content=_YEAR_SCOPE_SYSTEM), HumanMessage(content=query.strip())])
-        )
+        response = await retry_async(_llm_mini.ainvoke, [_YEAR_SCOPE_MESSAGE, HumanMessage(content=query.strip())])
         text = (response.content or "").strip().lower()
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
         first = (lines[0] if lines else "").strip().lower()
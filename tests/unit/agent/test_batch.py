@@ -0,0 +1,31 @@
+"""
+Unit tests for src/agent/batch.py: Batch API request lines and output parsing.
+
+All tests are pure-logic — no LLM calls, no network.
+"""
+
+import orjson
+
+from src.agent.batch import _intent_batch_line, _parse_batch_output
+
+
+def _output_line(custom_id: str, content: str, status_code: int = 200) -> str:
+    body = {"choices": [{"message": {"content": content}}]}
+    return orjson.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}}).decode()
+
+
+class TestIntentBatchLine:
+    def test_targets_chat_completions_with_query(self) -> None:
+        line = _intent_batch_line("7", "Mikä on petos?")
+        assert line["custom_id"] == "7"
+        assert line["url"] == "/v1/chat/completions"
+        assert line["body"]["messages"][-1] == {"role": "user", "content": "Mikä on petos?"}
+
+
+class TestParseBatchOutput:
+    def test_maps_ids_to_parsed_intents(self) -> None:
+        text = "\n".join([_output_line("0", "legal_search"), _output_line("1", "'general_chat'"), ""])
+        assert _parse_batch_output(text) == {"0": "legal_search", "1": "general_chat"}
+
+    def test_failed_requests_are_omitted(self) -> None:
+        assert _parse_batch_output(_output_line("0", "legal_search", status_code=500)) == {}
@@ -0,0 +1,79 @@
+"""
+Unit tests for src/agent/micro_batcher.py: coalescing concurrent support-LLM calls.
+
+All tests are pure-logic — no LLM calls, no network.
+"""
+
+import asyncio
+
+import pytest
+
+from src.agent.micro_batcher import MicroBatcher
+
+
+class _FakeClassifier:
+    def __init__(self, fail_batch: bool = False) -> None:
+        self.single: list[str] = []
+        self.batches: list[list[str]] = []
+        self.fail_batch = fail_batch
+
+    async def one(self, query: str) -> str:
+        self.single.append(query)
+        return f"label:{query}"
+
+    async def many(self, queries: list[str]) -> list[str]:
+        self.batches.append(queries)
+        if self.fail_batch:
+            raise RuntimeError("boom")
+        return [f"label:{q}" for q in queries]
+
+
+def _classify_all(batcher: MicroBatcher, queries: list[str]) -> list[str]:
+    async def run() -> list[str]:
+        return await asyncio.gather(*(batcher.submit(q) for q in queries))
+
+    return asyncio.run(run())
+
+
+class TestMicroBatcher:
+    def test_concurrent_queries_share_one_call(self) -> None:
+        fake = _FakeClassifier()
+        batcher = MicroBatcher(fake.one, fake.many, wait_seconds=0.01)
+        assert _classify_all(batcher, ["a", "b", "c"]) == ["label:a", "label:b", "label:c"]
+        assert fake.batches == [["a", "b", "c"]]
+        assert fake.single == []
+
+    def test_single_query_uses_single_call(self) -> None:
+        fake = _FakeClassifier()
+        batcher = MicroBatcher(fake.one, fake.many, wait_seconds=0.01)
+        assert _classify_all(batcher, ["a"]) == ["label:a"]
+        assert fake.batches == []
+
+    def test_max_batch_splits_calls(self) -> None:
+        fake = _FakeClassifier()
+        batcher = MicroBatcher(fake.one, fake.many, max_batch=2, wait_seconds=0.01)
+        _classify_all(batcher, ["a", "b", "c", "d"])
+        assert fake.batches == [["a", "b"], ["c", "d"]]
+
+    def test_failed_batch_falls_back_to_single_calls(self) -> None:
+        fake = _FakeClassifier(fail_batch=True)
+        batcher = MicroBatcher(fake.one, fake.many, wait_seconds=0.01)
+        assert _classify_all(batcher, ["a", "b"]) == ["label:a", "label:b"]
+        assert sorted(fake.single) == ["a", "b"]
+
+    def test_queue_is_released_after_loop_drains(self) -> None:
+        fake = _FakeClassifier()
+        batcher = MicroBatcher(fake.one, fake.many, wait_seconds=0.01)
+        _classify_all(batcher, ["a", "b"])
+        assert batcher._queues == {}
+
+    @pytest.mark.skipif(not hasattr(asyncio, "eager_task_factory"), reason="eager tasks need Python 3.12+")
+    def test_submit_completes_under_eager_task_factory(self) -> None:
+        fake = _FakeClassifier()
+        batcher = MicroBatcher(fake.one, fake.many, wait_seconds=0.01)
+
+        async def run() -> list[str]:
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+            return await asyncio.wait_for(asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=2)
+
+        assert asyncio.run(run()) == ["label:a", "label:b"]
@@ -6,8 +6,16 @@ All tests are pure-logic — no LLM calls, no network.
 Env vars (e.g. REFORMULATE_ENABLED) are set in conftest.py.
 """
 
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agent import nodes
 from src.agent.graph import route_intent, route_search_result
-from src.agent.nodes import _is_obvious_legal_query
+from src.agent.nodes import _fast_intent, _is_obvious_legal_query, _settle_speculative_search
+from src.agent.state import new_agent_state
+from src.utils.ttl_cache import TTLCache
 
 
 # ---------------------------------------------------------------------------
@@ -74,6 +82,12 @@ class TestRouteSearchResult:
         state = {"search_results": None, "search_attempts": 1}
         assert route_search_result(state) == "reformulate"
 
+    def test_literal_lookup_skips_reformulate(self) -> None:
+        """Case IDs, quoted phrases and § references are not rewritten by the LLM."""
+        for query in ("KKO:2019:42", 'mitä "osamaksukauppa" tarkoittaa', "RL 36 § 1"):
+            state = {"search_results": [], "search_attempts": 1, "original_query": query}
+            assert route_search_result(state) == "reason", query
+
     def test_search_attempts_non_numeric_falls_back_to_one(self) -> None:
         """When search_attempts is non-numeric, treat as 1 (reformulate on first attempt)."""
         state = {"search_results": [], "search_attempts": "invalid"}
@@ -114,3 +128,323 @@ class TestIsObviousLegalQuery:
 
     def test_none_query_returns_false(self) -> None:
         assert _is_obvious_legal_query(None) is False
+
+    def test_statute_number_is_legal(self) -> None:
+        assert _is_obvious_legal_query("HE 39/2019") is True
+
+    def test_english_marker_needs_word_start(self) -> None:
+        assert _is_obvious_legal_query("syntax") is False
+        assert _is_obvious_legal_query("tax law") is True
+
+    def test_finnish_compound_matches_inner_marker(self) -> None:
+        assert _is_obvious_legal_query("työsopimus") is True
+
+
+# ---------------------------------------------------------------------------
+# _fast_intent
+# ---------------------------------------------------------------------------
+class TestFastIntent:
+    """Test regex fast paths that skip the intent LLM."""
+
+    def test_thanks_with_courtesy_tail_is_chat(self) -> None:
+        assert _fast_intent("Kiitos paljon!") == "general_chat"
+
+    def test_section_sign_is_legal(self) -> None:
+        assert _fast_intent("mitä 3 § sanoo") == "legal_search"
+
+    def test_plain_question_falls_through(self) -> None:
+        assert _fast_intent("mitä tarkoitat?") is None
+
+
+# ---------------------------------------------------------------------------
+# _settle_speculative_search
+# ---------------------------------------------------------------------------
+class TestSettleSpeculativeSearch:
+    """Test that speculative retrieval is awaited only when search_knowledge can reuse it."""
+
+    @staticmethod
+    def _settle(result: dict, query: str) -> asyncio.Task:
+        async def run() -> asyncio.Task:
+            task = asyncio.create_task(asyncio.sleep(0.01))
+            await _settle_speculative_search(task, result, query)
+            await asyncio.sleep(0)
+            return task
+
+        return asyncio.run(run())
+
+    def test_legal_search_with_same_years_is_awaited(self) -> None:
+        task = self._settle({"intent": "legal_search", "year_start": None, "year_end": None}, "petos")
+        assert task.done() and not task.cancelled()
+
+    def test_chat_intent_cancels(self) -> None:
+        task = self._settle({"intent": "general_chat"}, "petos")
+        assert task.cancelled()
+
+    def test_different_year_scope_cancels(self) -> None:
+        task = self._settle({"intent": "legal_search", "year_start": 2010, "year_end": 2020}, "petos")
+        assert task.cancelled()
+
+
+# ---------------------------------------------------------------------------
+# _llm_intent cache
+# ---------------------------------------------------------------------------
+class TestLlmIntentCache:
+    """Test that the intent LLM runs once per normalized query."""
+
+    def test_repeat_query_skips_llm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: list[str] = []
+
+        class FakeLLM:
+            async def ainvoke(self, messages: list, **kwargs) -> SimpleNamespace:
+                calls.append(messages[-1].content)
+                return SimpleNamespace(content="legal_search")
+
+        monkeypatch.setattr(nodes, "_llm_mini", FakeLLM())
+        monkeypatch.setattr(nodes, "_intent_cache", nodes.TTLCache(maxsize=8, ttl=60))
+
+        async def run() -> list[str]:
+            return [await nodes._llm_intent("Mikä on petos?"), await nodes._llm_intent("  mikä ON petos? ")]
+
+        assert asyncio.run(run()) == ["legal_search", "legal_search"]
+        assert len(calls) == 1
+
+
+# ---------------------------------------------------------------------------
+# One-token intent answers scored by log-probs
+# ---------------------------------------------------------------------------
+class TestIntentFromLetterLogprobs:
+    @staticmethod
+    def _response(top: dict[str, float]) -> SimpleNamespace:
+        candidates = [{"token": token, "logprob": lp} for token, lp in top.items()]
+        return SimpleNamespace(content="A", response_metadata={"logprobs": {"content": [{"top_logprobs": candidates}]}})
+
+    def test_highest_letter_wins(self) -> None:
+        response = self._response({"A": -1.2, "C": -0.4, "B": -3.0})
+        assert nodes._intent_from_letter_logprobs(response) == "clarification"
+
+    def test_non_letter_tokens_are_ignored(self) -> None:
+        response = self._response({"legal": -0.1, " B": -0.9})
+        assert nodes._intent_from_letter_logprobs(response) == "general_chat"
+
+    def test_missing_logprobs_return_none(self) -> None:
+        assert nodes._intent_from_letter_logprobs(SimpleNamespace(content="A")) is None
+
+
+# ---------------------------------------------------------------------------
+# Batched reformulation
+# ---------------------------------------------------------------------------
+class TestReformulateBatch:
+    @staticmethod
+    def _fake_llm(content: str) -> object:
+        class FakeLLM:
+            async def ainvoke(self, messages: list) -> SimpleNamespace:
+                return SimpleNamespace(content=content)
+
+        return FakeLLM()
+
+    def test_numbered_lines_map_back_to_queries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(nodes, "_llm_mini", self._fake_llm("2. varkaus, varastaa\n1. petos, petollinen"))
+        result = asyncio.run(nodes._llm_reformulate_batch(["petos", "varkaus"]))
+        assert result == ["petos, petollinen", "varkaus, varastaa"]
+
+    def test_missing_line_raises_for_single_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(nodes, "_llm_mini", self._fake_llm("1. petos"))
+        with pytest.raises(KeyError):
+            asyncio.run(nodes._llm_reformulate_batch(["petos", "varkaus"]))
+
+
+# ---------------------------------------------------------------------------
+# Batched intent classification
+# ---------------------------------------------------------------------------
+class TestIntentBatch:
+    _fake_llm = staticmethod(TestReformulateBatch._fake_llm)
+
+    def test_numbered_lines_map_back_to_queries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(nodes, "_llm_mini", self._fake_llm("Here you go:\n2. general_chat\n1. legal_search"))
+        result = asyncio.run(nodes._llm_intent_batch(["Mikä on petos?", "Hei!"]))
+        assert result == ["legal_search", "general_chat"]
+
+    def test_missing_line_raises_for_single_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(nodes, "_llm_mini", self._fake_llm("1. legal_search\n3. general_chat"))
+        with pytest.raises(KeyError):
+            asyncio.run(nodes._llm_intent_batch(["Mikä on petos?", "Hei!"]))
+
+
+# ---------------------------------------------------------------------------
+# generate_response collects the background relevancy check
+# ---------------------------------------------------------------------------
+class TestGenerateResponseRelevancy:
+    def test_awaits_pending_relevancy_task(self) -> None:
+        async def run() -> dict:
+            async def score() -> tuple[float, str]:
+                return 4.0, "ok"
+
+            state = new_agent_state(response="Vastaus.", relevancy_task=asyncio.create_task(score()))
+            return await nodes.generate_response(state)
+
+        state = asyncio.run(run())
+        assert (state["relevancy_score"], state["relevancy_reason"]) == (4.0, "ok")
+        assert state["relevancy_task"] is None
+
+
+# ---------------------------------------------------------------------------
+# Relevancy scoring is gated on an explicit error flag, not on answer wording
+# ---------------------------------------------------------------------------
+class TestStartRelevancyCheck:
+    def _start(self, monkeypatch: pytest.MonkeyPatch, response: str, is_error: bool) -> object:
+        monkeypatch.setattr(nodes.config, "RELEVANCY_CHECK_ENABLED", True)
+
+        async def fake_score(query: str, response: str) -> tuple[float, str]:
+            return 5.0, "ok"
+
+        monkeypatch.setattr(nodes, "_score_relevancy", fake_score)
+
+        async def run() -> object:
+            task = nodes._start_relevancy_check("kysymys", response, is_error_response=is_error)["relevancy_task"]
+            if task is not None:
+                await task
+            return task
+
+        return asyncio.run(run())
+
+    def test_answer_that_starts_like_an_apology_is_scored(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert self._start(monkeypatch, "Sorry to say, the contract is void.", is_error=False) is not None
+
+    def test_error_fallback_is_not_scored(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert self._start(monkeypatch, nodes._llm_error_fallback("en"), is_error=True) is None
+
+
+# ---------------------------------------------------------------------------
+# Bare case-ID queries answered from the top chunk
+# ---------------------------------------------------------------------------
+class TestCitationAnswer:
+    @staticmethod
+    def _chunk(case_id: str, score: float) -> dict:
+        return {"text": "Ratkaisu.", "rerank_score": score, "metadata": {"case_id": case_id, "url": "https://x"}}
+
+    def test_confident_match_is_templated(self) -> None:
+        answer = nodes._citation_answer("KKO:2024:76", ["KKO:2024:76"], [self._chunk("KKO:2024:76", 0.95)], "fi")
+        assert answer is not None
+        assert answer.startswith("KKO:2024:76: Ratkaisu.")
+        assert answer.endswith("https://x")
+
+    def test_low_score_falls_through(self) -> None:
+        assert nodes._citation_answer("KKO:2024:76", ["KKO:2024:76"], [self._chunk("KKO:2024:76", 0.5)], "fi") is None
+
+    def test_question_about_case_uses_llm(self) -> None:
+        query = "Mitä KKO:2024:76 sanoo vahingonkorvauksesta?"
+        assert nodes._citation_answer(query, ["KKO:2024:76"], [self._chunk("KKO:2024:76", 0.99)], "fi") is None
+
+
+# ---------------------------------------------------------------------------
+# reason_legal answer cache
+# ---------------------------------------------------------------------------
+class TestResponseCache:
+    def test_cached_first_turn_answer_skips_generation(self, monkeypatch) -> None:
+        monkeypatch.setattr(nodes, "_response_cache", TTLCache(maxsize=4, ttl=60))
+        state = new_agent_state(query="petoksen rangaistus", search_results=[{"text": "x", "metadata": {}}])
+        nodes._response_cache.set(nodes._response_cache_key(state, "petoksen rangaistus"), "Välimuistista.")
+
+        state = asyncio.run(nodes.reason_legal(state))
+        assert state["response"] == "Välimuistista."
+
+    def test_regenerate_bypasses_cached_answer(self, monkeypatch) -> None:
+        class FreshGenerator:
+            async def agenerate_response(self, **kwargs) -> str:
+                return "Uusi vastaus."
+
+        monkeypatch.setattr(nodes, "_response_cache", TTLCache(maxsize=4, ttl=60))
+        monkeypatch.setattr(nodes, "_generator", FreshGenerator())
+        monkeypatch.setattr(nodes.config, "RELEVANCY_CHECK_ENABLED", False)
+        state = new_agent_state(
+            query="petoksen rangaistus", search_results=[{"text": "x", "metadata": {}}], bypass_response_cache=True
+        )
+        key = nodes._response_cache_key(state, "petoksen rangaistus")
+        nodes._response_cache.set(key, "Välimuistista.")
+
+        update = asyncio.run(nodes.reason_legal(state))
+        assert update["response"] == "Uusi vastaus."
+        assert nodes._response_cache.get(key) == "Uusi vastaus."
+
+    def test_follow_up_turn_is_not_cached(self, monkeypatch) -> None:
+        monkeypatch.setattr(nodes, "_response_cache", TTLCache(maxsize=4, ttl=60))
+        state = new_agent_state(query="entä sitten?", messages=[{"role": "user", "content": "petos"}])
+        assert nodes._response_cache_key(state, "entä sitten?") is None
+
+
+# ---------------------------------------------------------------------------
+# Speculative reformulation during the first search
+# ---------------------------------------------------------------------------
+class TestSpeculativeReformulate:
+    def _run_search(self, monkeypatch: pytest.MonkeyPatch, results: list[dict]) -> dict:
+        monkeypatch.setattr(nodes.config, "SPECULATIVE_REFORMULATE", True)
+        monkeypatch.setattr(nodes.config, "REFORMULATE_ENABLED", True)
+
+        async def fake_search(params: dict) -> list[dict]:
+            return results
+
+        async def fake_rewrite(query: str) -> str:
+            return f"{query}, variantti"
+
+        monkeypatch.setattr(nodes, "_cached_search", fake_search)
+        monkeypatch.setattr(nodes, "_rewrite_query", fake_rewrite)
+
+        async def run() -> dict:
+            # Nodes return partial updates; merge them the way the graph does.
+            state = new_agent_state(query="yhtiökokous", original_query="yhtiökokous")
+            state |= await nodes.search_knowledge(state)
+            if not results:
+                state |= await nodes.reformulate_query(state)
+            return state
+
+        return asyncio.run(run())
+
+    def test_zero_results_reuse_speculative_rewrite(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        state = self._run_search(monkeypatch, [])
+        assert state["query"] == "yhtiökokous, variantti"
+        assert state["reformulate_task"] is None
+
+    def test_results_cancel_speculative_rewrite(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        state = self._run_search(monkeypatch, [{"text": "x"}])
+        assert state["reformulate_task"] is None
+
+
+# ---------------------------------------------------------------------------
+# Streaming generation failures reach the UI
+# ---------------------------------------------------------------------------
+class TestStreamGenerationFailure:
+    def test_fallback_follows_partial_answer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        class FailingGenerator:
+            async def astream_response(self, **kwargs):
+                yield "Osittainen"
+                raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(nodes, "_generator", FailingGenerator())
+
+        async def run() -> tuple[dict, list]:
+            queue: asyncio.Queue = asyncio.Queue()
+            state = new_agent_state(
+                query="petoksen rangaistus", search_results=[{"text": "x", "metadata": {}}], stream_queue=queue
+            )
+            state = await nodes.reason_legal(state)
+            return state, [queue.get_nowait() for _ in range(queue.qsize())]
+
+        state, chunks = asyncio.run(run())
+        assert chunks == ["Osittainen", "\n\n" + nodes._llm_error_fallback("fi"), None]
+        assert state["error"].startswith("LLM generation failed")
+
+
+# ---------------------------------------------------------------------------
+# Support-LLM calls are capped in wall-clock time
+# ---------------------------------------------------------------------------
+class TestSupportLlmTimeout:
+    def test_stalled_chat_call_uses_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        class StalledLLM:
+            async def ainvoke(self, messages: list) -> SimpleNamespace:
+                await asyncio.sleep(10)
+                return SimpleNamespace(content="liian myöhään")
+
+        monkeypatch.setattr(nodes, "_llm_mini", StalledLLM())
+        monkeypatch.setattr(nodes.config, "CHAT_LLM_TIMEOUT_SECONDS", 0.01)
+        update = asyncio.run(nodes.general_chat(new_agent_state(query="Hei!", response_lang="fi")))
+        assert update["response"] == nodes._general_chat_fallback("fi")
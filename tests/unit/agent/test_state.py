@@ -0,0 +1,27 @@
+"""
+Unit tests for src/agent/state.py: the pre-allocated initial state template.
+
+All tests are pure-logic — no LLM calls, no network.
+"""
+
+from src.agent.state import AgentState, new_agent_state
+
+
+class TestNewAgentState:
+    def test_populates_every_declared_key(self) -> None:
+        assert set(new_agent_state()) == set(AgentState.__annotations__)
+
+    def test_overrides_defaults(self) -> None:
+        state = new_agent_state(query="petos", response_lang="fi")
+        assert state["query"] == "petos"
+        assert state["response_lang"] == "fi"
+        assert state["stage"] == "init"
+
+    def test_mutable_defaults_are_not_shared(self) -> None:
+        first = new_agent_state()
+        first["search_results"].append({"id": "x"})
+        assert new_agent_state()["search_results"] == []
+
+    def test_keeps_caller_lists(self) -> None:
+        history = [{"role": "user", "content": "petos"}]
+        assert new_agent_state(messages=history)["messages"] is history
@@ -0,0 +1,227 @@
+"""
+Unit tests for src/agent/stream.py: relevancy-line stripping for complete
+responses and for streamed token chunks, the single-queue stream loop, the
+history window, the metadata sink, graph-error shutdown, and the sync wrapper
+(early rejection of too-long and blank queries, shutdown on errors and early
+close).
+
+All tests are pure-logic — no network calls, no database, no LLM.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.agent import stream
+from src.agent.stream import (
+    _build_initial_state,
+    _history_window,
+    _RelevancyLineFilter,
+    _status_messages,
+    _stream_loop,
+    _strip_relevancy_line,
+    _update_metadata_sink,
+    stream_query_response_sync,
+)
+from src.config.settings import config
+from src.config.translations import t
+
+
+def _feed_all(chunks: list[str]) -> str:
+    relevancy_filter = _RelevancyLineFilter()
+    return "".join(relevancy_filter.feed(c) for c in chunks) + relevancy_filter.flush()
+
+
+# ---------------------------------------------------------------------------
+# _strip_relevancy_line
+# ---------------------------------------------------------------------------
+class TestStripRelevancyLine:
+    def test_removes_score_line(self):
+        assert _strip_relevancy_line("Vastaus.\nRelevanssi: 4/5. Hyvä.") == "Vastaus."
+
+    def test_keeps_text_without_score(self):
+        assert _strip_relevancy_line("Relevancy: high") == "Relevancy: high"
+
+    def test_removes_score_line_in_the_middle(self):
+        text = "Alku.\nRelevancy: 3/5. Osittain.\nLoppu.\n"
+        assert _strip_relevancy_line(text) == "Alku.\nLoppu."
+
+    def test_score_before_label_is_still_a_score_line(self):
+        assert _strip_relevancy_line("Vastaus.\n5/5 Relevanssi: erinomainen") == "Vastaus."
+
+
+# ---------------------------------------------------------------------------
+# _RelevancyLineFilter
+# ---------------------------------------------------------------------------
+class TestRelevancyLineFilter:
+    def test_plain_text_passes_through_immediately(self):
+        relevancy_filter = _RelevancyLineFilter()
+        assert relevancy_filter.feed("Korkein ") == "Korkein "
+        assert relevancy_filter.feed("oikeus") == "oikeus"
+
+    def test_drops_score_line_split_across_chunks(self):
+        assert _feed_all(["Vastaus.\nRele", "vanssi: 4", "/5. Hyvä.\nLoppu"]) == "Vastaus.\nLoppu"
+
+    def test_drops_trailing_score_line_without_newline(self):
+        assert _feed_all(["Vastaus.\n", "Relevancy: 5/5."]) == "Vastaus.\n"
+
+    def test_releases_held_prefix_that_is_not_a_score(self):
+        assert _feed_all(["Rel", "evant facts\n"]) == "Relevant facts\n"
+
+
+# ---------------------------------------------------------------------------
+# _stream_loop
+# ---------------------------------------------------------------------------
+class TestStreamLoop:
+    @staticmethod
+    def _collect(items: list) -> list[str]:
+        async def run() -> list[str]:
+            stream_queue: asyncio.Queue = asyncio.Queue()
+            for item in items:
+                stream_queue.put_nowait(item)
+            return [chunk async for chunk in _stream_loop(stream_queue, "fi")]
+
+        return asyncio.run(run())
+
+    def test_streamed_answer_is_not_repeated_by_respond_event(self):
+        out = self._collect(
+            [("reason", {}), "Vastaus", " on tämä.", None, ("respond", {"response": "Vastaus on tämä."}), ("_done", {})]
+        )
+        assert out == ["Vastaus on tämä."]
+
+    def test_non_streamed_answer_comes_from_respond_event(self):
+        out = self._collect([("respond", {"response": "Valmis vastaus."}), ("_done", {})])
+        assert out == ["Valmis vastaus."]
+
+    def test_queued_chunks_are_coalesced(self):
+        out = self._collect(["Kor", "kein ", "oikeus", None, ("_done", {})])
+        assert out == ["Korkein oikeus"]
+
+
+# ---------------------------------------------------------------------------
+# _history_window
+# ---------------------------------------------------------------------------
+class TestHistoryWindow:
+    def test_keeps_last_messages(self):
+        history = [{"role": "user", "content": str(i)} for i in range(20)]
+        window = _history_window(history)
+        assert window == tuple(history[-12:])
+
+    def test_short_tuple_is_reused(self):
+        history = ({"role": "user", "content": "petos"},)
+        assert _history_window(history) is history
+
+    def test_empty_history(self):
+        assert _history_window(None) == ()
+
+
+class TestBuildInitialState:
+    @staticmethod
+    def _state(**kwargs) -> dict:
+        return _build_initial_state("petos", None, None, False, None, asyncio.Queue(), "fi", **kwargs)
+
+    def test_answer_cache_is_used_by_default(self):
+        assert self._state()["bypass_response_cache"] is False
+
+    def test_regenerate_flag_reaches_the_graph_state(self):
+        assert self._state(bypass_response_cache=True)["bypass_response_cache"] is True
+
+
+# ---------------------------------------------------------------------------
+# _update_metadata_sink
+# ---------------------------------------------------------------------------
+class TestUpdateMetadataSink:
+    def test_keeps_only_result_metadata(self):
+        sink: dict = {}
+        results = [{"text": "pitkä teksti", "metadata": {"case_id": "KKO:2020:1"}}, {"text": "x"}]
+        _update_metadata_sink(sink, {"search_results": results, "relevancy_score": 4})
+        assert sink == {
+            "search_results": [{"metadata": {"case_id": "KKO:2020:1"}}, {"metadata": {}}],
+            "relevancy_score": 4,
+        }
+
+
+# ---------------------------------------------------------------------------
+# stream_query_response
+# ---------------------------------------------------------------------------
+class TestStreamQueryResponse:
+    def test_graph_error_ends_the_stream(self, monkeypatch):
+        class FailingGraph:
+            async def astream(self, state, stream_mode):
+                yield {"analyze": {"stage": "analyze"}}
+                raise RuntimeError("boom")
+
+        monkeypatch.setattr(stream, "agent_graph", FailingGraph())
+
+        async def collect() -> list[str]:
+            return [chunk async for chunk in stream.stream_query_response("petos", lang="en")]
+
+        chunks = asyncio.run(asyncio.wait_for(collect(), timeout=2))
+        assert chunks == [_status_messages("en")["analyze"], f"\u274c {t('stream_error', 'en', error='boom')}"]
+
+
+# ---------------------------------------------------------------------------
+# stream_query_response_sync
+# ---------------------------------------------------------------------------
+class TestStreamQueryResponseSync:
+    def test_too_long_query_is_rejected_without_a_worker_thread(self, monkeypatch):
+        def no_thread(*args, **kwargs):
+            raise AssertionError("no worker thread expected")
+
+        monkeypatch.setattr(threading, "Thread", no_thread)
+        chunks = list(stream_query_response_sync("x" * (config.MAX_QUERY_LENGTH + 1), lang="en"))
+        assert len(chunks) == 1
+        assert chunks[0].startswith("\u26a0")
+
+    def test_blank_query_is_rejected_without_a_worker_thread(self, monkeypatch):
+        def no_thread(*args, **kwargs):
+            raise AssertionError("no worker thread expected")
+
+        monkeypatch.setattr(threading, "Thread", no_thread)
+        assert list(stream_query_response_sync("   ", lang="en")) == [t("query_empty", "en")]
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_stream_error_still_ends_iteration(self, monkeypatch):
+        async def failing_stream(*args, **kwargs):
+            yield "Osittainen"
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(stream, "stream_query_response", failing_stream)
+        assert list(stream_query_response_sync("petos", lang="fi")) == ["Osittainen"]
+
+    def test_closing_early_stops_a_blocked_producer(self, monkeypatch):
+        closed = threading.Event()
+
+        async def long_stream(*args, **kwargs):
+            try:
+                for i in range(10 * stream._SYNC_QUEUE_MAXSIZE):
+                    yield str(i)
+            finally:
+                closed.set()
+
+        monkeypatch.setattr(stream, "stream_query_response", long_stream)
+        chunks = stream_query_response_sync("petos", lang="fi")
+        assert next(chunks) == "0"
+        chunks.close()
+        assert closed.wait(timeout=2)
+
+    def test_closing_early_stops_a_producer_with_queue_room(self, monkeypatch):
+        closed = threading.Event()
+        produced: list[int] = []
+
+        async def slow_stream(*args, **kwargs):
+            try:
+                for i in range(stream._SYNC_QUEUE_MAXSIZE // 2):
+                    produced.append(i)
+                    yield str(i)
+                    await asyncio.sleep(0.02)
+            finally:
+                closed.set()
+
+        monkeypatch.setattr(stream, "stream_query_response", slow_stream)
+        chunks = stream_query_response_sync("petos", lang="fi")
+        assert next(chunks) == "0"
+        chunks.close()
+        assert closed.wait(timeout=2)
+        assert len(produced) < stream._SYNC_QUEUE_MAXSIZE // 2
@@ -0,0 +1,68 @@
+"""
+Unit tests for src/services/finlex/bulk.py: page execution with
+fail-fast cancellation, and fatal-error classification in the ingestion service.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.finlex.bulk import _run_page
+from src.services.finlex.ingestion import FatalIngestionError, _is_fatal_error
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+# ---------------------------------------------------------------------------
+# _run_page
+# ---------------------------------------------------------------------------
+class TestRunPage:
+    def test_returns_results_in_order(self):
+        async def doc(ok: bool, delay: float) -> bool:
+            await asyncio.sleep(delay)
+            return ok
+
+        results = asyncio.run(_run_page([doc(True, 0.02), doc(False, 0), doc(True, 0.01)]))
+        assert results == [True, False, True]
+
+    def test_fatal_error_cancels_peers(self):
+        cancelled = []
+
+        async def slow() -> bool:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return True
+
+        async def fatal() -> bool:
+            raise FatalIngestionError("auth expired")
+
+        with pytest.raises(FatalIngestionError):
+            asyncio.run(_run_page([slow(), fatal(), slow()]))
+        assert cancelled == [True, True]
+
+
+# ---------------------------------------------------------------------------
+# _is_fatal_error
+# ---------------------------------------------------------------------------
+class TestIsFatalError:
+    def test_auth_status_is_fatal(self):
+        assert _is_fatal_error(_StatusError(401))
+        assert _is_fatal_error(_StatusError(403))
+
+    def test_server_error_is_transient(self):
+        assert not _is_fatal_error(_StatusError(503))
+        assert not _is_fatal_error(TimeoutError("read timeout"))
+
+    def test_expired_jwt_code_is_fatal(self):
+        err = Exception("JWT expired")
+        err.code = "PGRST301"
+        assert _is_fatal_error(err)
@@ -0,0 +1,62 @@
+"""
+Unit tests for src/services/finlex/ingestion.py: batched embed/store overlap.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.finlex import ingestion
+from src.services.finlex.ingestion import FinlexIngestionService
+
+
+class _FakeEmbedder:
+    def __init__(self, fail_on_batch: int | None = None):
+        self.batches: list[list] = []
+        self.fail_on_batch = fail_on_batch
+
+    def embed_chunks(self, chunks: list) -> list:
+        self.batches.append(chunks)
+        if len(self.batches) == self.fail_on_batch:
+            raise RuntimeError("embedding failed")
+        return [f"emb:{c}" for c in chunks]
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.stored: list[list] = []
+
+    def store_chunks(self, embedded: list) -> int:
+        self.stored.append(embedded)
+        return len(embedded)
+
+
+def _service(embedder: _FakeEmbedder, storage: _FakeStorage) -> FinlexIngestionService:
+    service = FinlexIngestionService.__new__(FinlexIngestionService)
+    service.embedder = embedder
+    service.storage = storage
+    return service
+
+
+class TestEmbedAndStore:
+    def test_stores_every_batch_in_order(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "_EMBED_BATCH_SIZE", 2)
+        embedder, storage = _FakeEmbedder(), _FakeStorage()
+        stored = asyncio.run(_service(embedder, storage)._embed_and_store(["a", "b", "c", "d", "e"]))
+        assert stored == 5
+        assert embedder.batches == [["a", "b"], ["c", "d"], ["e"]]
+        assert storage.stored == [["emb:a", "emb:b"], ["emb:c", "emb:d"], ["emb:e"]]
+
+    def test_no_chunks_stores_nothing(self):
+        storage = _FakeStorage()
+        assert asyncio.run(_service(_FakeEmbedder(), storage)._embed_and_store([])) == 0
+        assert storage.stored == []
+
+    def test_embedding_error_waits_for_in_flight_upsert(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "_EMBED_BATCH_SIZE", 1)
+        storage = _FakeStorage()
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            asyncio.run(_service(_FakeEmbedder(fail_on_batch=2), storage)._embed_and_store(["a", "b", "c"]))
+        assert storage.stored == [["emb:a"]]
@@ -0,0 +1,34 @@
+"""
+Unit tests for src/services/retrieval/relevancy.py: the reranker-based
+relevancy check maps scores onto the 1-5 scale and fails soft.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.services.retrieval import relevancy
+
+
+# ---------------------------------------------------------------------------
+# check_relevancy_with_reranker
+# ---------------------------------------------------------------------------
+class TestCheckRelevancyWithReranker:
+    def _use_reranker(self, monkeypatch, rerank) -> None:
+        monkeypatch.setattr(relevancy, "_get_relevancy_reranker", lambda: SimpleNamespace(rerank=rerank))
+
+    def test_maps_rerank_score_to_scale(self, monkeypatch) -> None:
+        self._use_reranker(monkeypatch, lambda query, docs, top_k: [{**docs[0], "rerank_score": 0.8}])
+        result = asyncio.run(relevancy.check_relevancy_with_reranker("petos", "Petoksesta tuomitaan..."))
+        assert result["score"] == 4
+
+    def test_empty_answer_is_not_scored(self) -> None:
+        assert asyncio.run(relevancy.check_relevancy_with_reranker("petos", "  "))["score"] == 0
+
+    def test_reranker_error_returns_zero(self, monkeypatch) -> None:
+        def fail(query, docs, top_k):
+            raise RuntimeError("cohere down")
+
+        self._use_reranker(monkeypatch, fail)
+        assert asyncio.run(relevancy.check_relevancy_with_reranker("petos", "Vastaus."))["score"] == 0
@@ -5,9 +5,11 @@ exact-match boost, query classification, and RRF blend scores.
 All tests are pure-logic — no network calls, no database, no LLM.
 """
 
+import asyncio
+
 import pytest
 
-from src.services.retrieval.search import HybridRetrieval
+from src.services.retrieval.search import ChunkView, HybridRetrieval
 from tests.helpers import make_search_chunk
 
 
@@ -150,6 +152,79 @@ class TestBuildPrefixTsquery:
         assert retrieval._build_prefix_tsquery(None) == ""
 
 
+# ---------------------------------------------------------------------------
+# _build_keyword_tsquery (server-side keyword pre-filter for fetch_case_chunks)
+# ---------------------------------------------------------------------------
+class TestBuildKeywordTsquery:
+    """Test keyword OR-query builder used to filter case sections in Postgres."""
+
+    def test_joins_single_words_with_or(self, retrieval: HybridRetrieval) -> None:
+        assert retrieval._build_keyword_tsquery(["petos", "kavallus"]) == "petos OR kavallus"
+
+    def test_multi_word_keywords_become_phrases(self, retrieval: HybridRetrieval) -> None:
+        result = retrieval._build_keyword_tsquery(["missä tapauksessa", "rangaistus"])
+        assert result == '"missä tapauksessa" OR rangaistus'
+
+    def test_strips_tsquery_operators(self, retrieval: HybridRetrieval) -> None:
+        assert retrieval._build_keyword_tsquery(["a|b", "(c)"]) == '"a b" OR c'
+
+    def test_empty_keywords_return_empty(self, retrieval: HybridRetrieval) -> None:
+        assert retrieval._build_keyword_tsquery(["", "  ", "&"]) == ""
+
+
+# ---------------------------------------------------------------------------
+# ChunkView (attribute view over fetch_case_chunks results)
+# ---------------------------------------------------------------------------
+class TestChunkView:
+    """Test conversion of fetched case sections into ChunkView tuples."""
+
+    def test_precomputes_lowercase_text(self) -> None:
+        view = ChunkView.from_chunk({"text": "Petos ja KAVALLUS", "metadata": {"type": "reasoning"}})
+        assert view.text == "Petos ja KAVALLUS"
+        assert view.text_lower == "petos ja kavallus"
+        assert view.section_type == "reasoning"
+
+    def test_missing_text_and_type_have_defaults(self) -> None:
+        view = ChunkView.from_chunk({"text": None, "metadata": {"type": None}})
+        assert view.text == ""
+        assert view.section_type == "?"
+
+
+# ---------------------------------------------------------------------------
+# Query embedding cache
+# ---------------------------------------------------------------------------
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        return [float(len(text))]
+
+
+class TestEmbedQueryCache:
+    """Test that identical query text is embedded only once."""
+
+    def test_same_text_reuses_embedding(self) -> None:
+        embedder = _CountingEmbedder()
+        retrieval = HybridRetrieval(url="http://localhost:54321", key="test-key", embedder=embedder)
+
+        async def run() -> tuple[list[float], list[float]]:
+            return await retrieval._embed_query("petos"), await retrieval._embed_query("petos")
+
+        first, second = asyncio.run(run())
+        assert first == second == [5.0]
+        assert embedder.calls == 1
+
+    def test_warmup_embeds_probe_without_connecting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("src.services.retrieval.search.config.RERANK_ENABLED", False)
+        embedder = _CountingEmbedder()
+        retrieval = HybridRetrieval(url="http://localhost:54321", key="test-key", embedder=embedder)
+        asyncio.run(retrieval.warmup())
+        assert embedder.calls == 1
+        assert retrieval._clients == {}
+
+
 # ---------------------------------------------------------------------------
 # Edge cases: None / empty inputs (FTS and AND-FTS)
 # ---------------------------------------------------------------------------
@@ -199,6 +274,14 @@ class TestExtractCaseIds:
     def test_empty_string_returns_empty(self) -> None:
         assert HybridRetrieval.extract_case_ids("") == []
 
+    def test_old_format_with_volume(self) -> None:
+        assert "KKO:1983-II-124" in HybridRetrieval.extract_case_ids("KKO:1983-II-124")
+
+    def test_cached_result_is_not_shared(self) -> None:
+        first = HybridRetrieval.extract_case_ids("KKO:2024:76")
+        first.append("mutated")
+        assert HybridRetrieval.extract_case_ids("KKO:2024:76") == ["KKO:2024:76"]
+
 
 # ---------------------------------------------------------------------------
 # _smart_diversity_cap
@@ -0,0 +1,121 @@
+"""
+Unit tests for src/utils/concurrency.py: the cross-loop semaphore caps
+concurrent holders, works from several event loops, and does not leak
+permits when a waiter is cancelled; hedged calls race a second attempt
+only when the first is slow.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.concurrency import CrossLoopSemaphore, hedged
+
+
+# ---------------------------------------------------------------------------
+# CrossLoopSemaphore
+# ---------------------------------------------------------------------------
+class TestCrossLoopSemaphore:
+    def test_caps_concurrent_holders(self):
+        slots = CrossLoopSemaphore(2)
+        active = 0
+        peak = 0
+
+        async def hold():
+            nonlocal active, peak
+            async with slots:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def run():
+            await asyncio.gather(*(hold() for _ in range(5)))
+
+        asyncio.run(run())
+        assert peak == 2
+
+    def test_shared_across_event_loops(self):
+        slots = CrossLoopSemaphore(1)
+        held = threading.Event()
+        release = threading.Event()
+        order: list[str] = []
+
+        async def first():
+            async with slots:
+                held.set()
+                await asyncio.to_thread(release.wait)
+                order.append("first")
+
+        async def second():
+            async with slots:
+                order.append("second")
+
+        thread = threading.Thread(target=asyncio.run, args=(first(),))
+        thread.start()
+        held.wait()
+        threading.Timer(0.05, release.set).start()
+        asyncio.run(second())
+        thread.join()
+        assert order == ["first", "second"]
+
+    def test_cancelled_waiter_returns_its_permit(self):
+        slots = CrossLoopSemaphore(1)
+
+        async def run():
+            async with slots:
+                waiter = asyncio.create_task(slots.__aenter__())
+                await asyncio.sleep(0.01)
+                waiter.cancel()
+                await asyncio.gather(waiter, return_exceptions=True)
+            await asyncio.sleep(0.05)  # let the worker thread acquire and hand back
+            async with slots:
+                return True
+
+        assert asyncio.run(asyncio.wait_for(run(), 2))
+
+
+# ---------------------------------------------------------------------------
+# hedged
+# ---------------------------------------------------------------------------
+class TestHedged:
+    def test_fast_call_is_not_hedged(self):
+        calls = []
+
+        async def call(x):
+            calls.append(x)
+            return x * 2
+
+        assert asyncio.run(hedged(call, 21, delay=0.05)) == 42
+        assert calls == [21]
+
+    def test_slow_first_call_loses_to_hedge(self):
+        delays = [1.0, 0.0]
+
+        async def call():
+            await asyncio.sleep(delays.pop(0))
+            return "ok"
+
+        assert asyncio.run(asyncio.wait_for(hedged(call, delay=0.01), 0.5)) == "ok"
+
+    def test_raises_only_when_both_attempts_fail(self):
+        async def call():
+            await asyncio.sleep(0.02)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(hedged(call, delay=0.01))
+
+    def test_early_failure_is_raised_without_a_hedge(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(hedged(call, delay=0.05))
+        assert calls == [1]
@@ -0,0 +1,21 @@
+"""
+Unit tests for src/utils/lang_detect.py: supported-language mapping and the detection cache.
+
+All tests are pure-logic — no network calls.
+"""
+
+from src.utils.lang_detect import _detect_cached, detect_query_language
+
+
+class TestDetectQueryLanguage:
+    def test_short_query_falls_back_to_finnish(self):
+        assert detect_query_language(" a ") == "fi"
+
+    def test_detects_english(self):
+        assert detect_query_language("What is the punishment for fraud in Finland?") == "en"
+
+    def test_repeated_query_is_served_from_cache(self):
+        _detect_cached.cache_clear()
+        detect_query_language("Mikä on petoksen rangaistus?")
+        detect_query_language("  Mikä on petoksen rangaistus?  ")
+        assert _detect_cached.cache_info().hits == 1
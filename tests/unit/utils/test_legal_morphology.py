@@ -0,0 +1,35 @@
+"""
+Unit tests for src/utils/legal_morphology.py: dictionary-based rewrite of
+zero-result queries.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+from src.utils.legal_morphology import expand_legal_terms
+
+
+# ---------------------------------------------------------------------------
+# expand_legal_terms
+# ---------------------------------------------------------------------------
+class TestExpandLegalTerms:
+    def test_inflected_term_gets_variants(self):
+        rewrite = expand_legal_terms("Mitä osamaksukaupasta?")
+        assert rewrite.split(", ") == ["osamaksukaupasta", "osamaksukauppa", "osamaksukaupan", "osamaksukauppaa"]
+
+    def test_variants_are_inflections_of_the_same_term(self):
+        assert expand_legal_terms("varkaus").split(", ") == ["varkaus", "varkauden", "varkautta"]
+
+    def test_filler_words_are_dropped(self):
+        assert "mitä" not in expand_legal_terms("mitä petos tarkoittaa").split(", ")
+
+    def test_unknown_terms_return_empty(self):
+        assert expand_legal_terms("yhtiökokouksen koollekutsuminen") == ""
+
+    def test_unrelated_words_sharing_a_prefix_are_not_expanded(self):
+        for query in ("virheellinen tuomio", "takautuva verovelka", "ehdollinen kauppa", "purkki"):
+            assert expand_legal_terms(query) == "", query
+
+    def test_unrelated_prefix_does_not_add_sale_of_goods_terms(self):
+        rewrite = expand_legal_terms("virheellinen tuomio vahingonkorvauksesta")
+        assert "virhevastuu" not in rewrite
+        assert "hinnanalennus" not in rewrite
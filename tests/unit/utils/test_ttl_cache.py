@@ -0,0 +1,55 @@
+"""
+Unit tests for src/utils/ttl_cache.py: LRU eviction, expiry, disabling,
+and query-key normalization.
+
+All tests are pure-logic — no network calls, no database.
+"""
+
+from src.utils import ttl_cache
+from src.utils.ttl_cache import TTLCache, normalize_query_key
+
+
+# ---------------------------------------------------------------------------
+# TTLCache
+# ---------------------------------------------------------------------------
+class TestTTLCache:
+    def test_get_returns_stored_value(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_expired_entries_miss(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        now[0] += 11
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_zero_ttl_disables(self):
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+# ---------------------------------------------------------------------------
+# normalize_query_key
+# ---------------------------------------------------------------------------
+class TestNormalizeQueryKey:
+    def test_case_and_whitespace_collapse(self):
+        assert normalize_query_key("  Mitä   KKO sanoo ") == normalize_query_key("mitä kko sanoo")
+
+    def test_none_is_empty(self):
+        assert normalize_query_key(None) == ""